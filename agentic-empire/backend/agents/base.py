@@ -12,4 +12,4 @@ class BaseAgent(ABC):
         pass
 
     async def generate_response(self, prompt: str):
-        return await tiered_generate(prompt)
\ No newline at end of file
+        return await tiered_generate(prompt, caller=type(self).__name__)
\ No newline at end of file
@@ -1,7 +1,9 @@
 """Base trading agent template for all trading specialists."""
+import asyncio
 from abc import abstractmethod
 from agents.base import BaseAgent
 from typing import Dict, List, Optional
+import numpy as np
 
 class TradingAgent(BaseAgent):
     """Base class for all trading agents with shared trading logic."""
@@ -22,6 +24,43 @@ class TradingAgent(BaseAgent):
         """Generate buy/sell signals based on strategy."""
         pass
     
+    async def generate_signals_batch(self, symbols: List[str],
+                                     frame: Dict[str, np.ndarray]) -> Dict[str, List[Dict]]:
+        """Generate signals for a whole universe from one columnar frame.
+
+        ``frame`` maps each field to an array with one column per symbol, either a
+        snapshot shaped (symbols,) or a history shaped (bars, symbols). Subclasses
+        override this with vectorized math; the default awaits ``generate_signals``
+        once per symbol concurrently.
+        """
+        results = await asyncio.gather(*(self.generate_signals(symbol) for symbol in symbols))
+        return dict(zip(symbols, results))
+    
+    def _field(self, frame: Dict[str, np.ndarray], name: str, default: float, count: int) -> np.ndarray:
+        """Latest value of a frame field per symbol, or ``default`` when absent."""
+        if name not in frame:
+            return np.full(count, default, dtype=np.float64)
+        values = np.asarray(frame[name], dtype=np.float64)
+        return values[-1] if values.ndim == 2 else values
+    
+    def _batch_signals(self, symbols: List[str], actions: np.ndarray, fields: Dict,
+                       key: str = "symbol") -> Dict[str, List[Dict]]:
+        """Build per-symbol signal lists from vectorized action labels ('' for none).
+
+        Array-valued ``fields`` are taken per symbol; anything else is copied as-is.
+        """
+        signals = {symbol: [] for symbol in symbols}
+        for i in np.flatnonzero(actions != ""):
+            signal = {"action": str(actions[i]), key: symbols[i]}
+            for name, value in fields.items():
+                signal[name] = value[i].item() if isinstance(value, np.ndarray) else value
+            signals[symbols[i]].append(signal)
+        return signals
+    
+    def on_tick(self, symbol: str, price: float):
+        """Update incremental per-symbol indicator state with a new price."""
+        pass
+    
     async def perform_task(self, task: str) -> Dict:
         """Execute trading task."""
         return {"status": "completed", "agent": self.role, "task": task}
@@ -16,6 +16,13 @@ class CompanyAgent:
         result = await tiered_generate(task)
         return result
 
+    async def execute_tasks(self, tasks):
+        # One DLP pass for the whole batch before any generation
+        blocked = [i for i, ok in enumerate(dlp.scan_batch(tasks)) if not ok]
+        if blocked:
+            raise ValueError(f"DLP violation - PII detected in tasks {blocked}")
+        return [await tiered_generate(task) for task in tasks]
+
 # 20-25 person company (autonomous, compliant)
 agents = [
     CompanyAgent("CEO", "Strategic decisions, oversight", "Experienced leader", "executive"),
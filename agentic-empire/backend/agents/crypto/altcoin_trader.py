@@ -1,6 +1,7 @@
 """Altcoin trading specialist for DeFi and small cap tokens."""
 from agents.base_trading_agent import TradingAgent
 from typing import Dict, List
+import numpy as np
 
 class AltcoinTrader(TradingAgent):
     """Specialized agent for altcoin and DeFi token trading."""
@@ -37,11 +38,21 @@ class AltcoinTrader(TradingAgent):
         
         return signals
     
+    async def generate_signals_batch(self, symbols: List[str],
+                                     frame: Dict[str, np.ndarray]) -> Dict[str, List[Dict]]:
+        """Vectorized ``generate_signals`` over ``tvl``, ``liquidity`` and ``market_cap`` columns."""
+        n = len(symbols)
+        score = self._calculate_defi_score(self._field(frame, "tvl", 5000000, n),
+                                           self._field(frame, "liquidity", 100000, n),
+                                           self._field(frame, "market_cap", 10000000, n))
+        return self._batch_signals(symbols, np.where(score > 70, "buy", ""),
+                                   {"confidence": 0.70, "risk_level": "high"})
+    
     def _calculate_defi_score(self, tvl: float, liquidity: float, mcap: float) -> float:
-        """Calculate DeFi project score."""
-        tvl_score = min(tvl / 10000000 * 40, 40)
-        liq_score = min(liquidity / 1000000 * 30, 30)
-        mcap_score = min(mcap / 50000000 * 30, 30)
+        """Calculate DeFi project score; also accepts NumPy arrays."""
+        tvl_score = np.minimum(tvl / 10000000 * 40, 40)
+        liq_score = np.minimum(liquidity / 1000000 * 30, 30)
+        mcap_score = np.minimum(mcap / 50000000 * 30, 30)
         return tvl_score + liq_score + mcap_score
 
 # Global instance
@@ -0,0 +1,159 @@
+"""Live exchange rate graph with incremental negative-cycle detection.
+
+Nodes are (exchange, asset) pairs and each edge converts one into another at
+``rate * (1 - fee)``, weighted ``-log`` of that, so a profitable conversion
+loop is a negative cycle. Feasible node potentials are maintained so every
+edge's reduced cost ``weight + potential[src] - potential[dst]`` stays
+non-negative. A quote that keeps its edge's reduced cost non-negative costs
+O(1); one that makes it negative runs Dijkstra from the edge's head, bounded by
+how negative it went, which either closes a negative cycle through the edge or
+repairs the potentials of just the nodes it reached.
+"""
+import math
+from heapq import heappop, heappush
+from typing import Dict, List, Optional, Tuple
+
+EPSILON = 1e-12
+Node = Tuple[str, str]
+
+class Edge:
+    """One directed conversion with its fee-adjusted rate and depth in source units."""
+    __slots__ = ("src", "dst", "rate", "fee", "depth", "weight")
+
+    def __init__(self, src: Node, dst: Node, rate: float, fee: float, depth: float):
+        self.src, self.dst = src, dst
+        self.set(rate, fee, depth)
+
+    def set(self, rate: float, fee: float, depth: float):
+        self.rate, self.fee, self.depth = rate, fee, depth
+        self.weight = -math.log(rate * (1.0 - fee)) if rate > 0 else math.inf
+
+class ArbitrageGraph:
+    """Rate graph over exchanges and assets that reports profitable cycles as quotes arrive.
+
+    Edges whose reduced cost cannot be repaired lie on a negative cycle and are
+    kept in ``violated`` with that cycle; they are rechecked after every update,
+    so the graph holds an arbitrage exactly when ``violated`` is non-empty.
+    """
+
+    def __init__(self, fees: Optional[Dict[str, float]] = None, default_fee: float = 0.001,
+                 transfer_fee: float = 0.001):
+        self.fees = fees or {}
+        self.default_fee, self.transfer_fee = default_fee, transfer_fee
+        self.edges: Dict[Node, Dict[Node, Edge]] = {}
+        self.potential: Dict[Node, float] = {}
+        self.assets: Dict[str, List[str]] = {}
+        self.violated: Dict[Tuple[Node, Node], Dict] = {}
+        self.updates = 0
+
+    def _add_node(self, node: Node):
+        if node in self.potential:
+            return
+        self.potential[node] = 0.0
+        self.edges[node] = {}
+        exchange, asset = node
+        venues = self.assets.setdefault(asset, [])
+        for other in venues:
+            # Transfers between venues of the same asset, checked below like any new edge.
+            self.edges[node][(other, asset)] = Edge(node, (other, asset), 1.0, self.transfer_fee, math.inf)
+            self.edges[(other, asset)][node] = Edge((other, asset), node, 1.0, self.transfer_fee, math.inf)
+        venues.append(exchange)
+        for edge in list(self.edges[node].values()):
+            self._check(edge)
+            self._check(self.edges[edge.dst][node])
+
+    def update_rate(self, exchange: str, src: str, dst: str, rate: float,
+                    depth: float = math.inf) -> List[Dict]:
+        """Set the rate for converting ``src`` into ``dst`` on one exchange.
+
+        Returns the profitable cycles found by this update.
+        """
+        return self._apply([self._set_edge(exchange, src, dst, rate, depth)])
+
+    def update_quote(self, exchange: str, base: str, quote: str, bid: float, ask: float,
+                     bid_size: float = math.inf, ask_size: float = math.inf) -> List[Dict]:
+        """Apply a top-of-book quote: sell ``base`` at the bid, buy it at the ask.
+
+        Both sides change before any check, so a new bid is never compared
+        against the previous ask.
+        """
+        return self._apply([self._set_edge(exchange, base, quote, bid, bid_size),
+                            self._set_edge(exchange, quote, base, 1.0 / ask if ask > 0 else 0.0,
+                                           ask_size * ask)])
+
+    def _set_edge(self, exchange: str, src: str, dst: str, rate: float, depth: float) -> Edge:
+        u, v = (exchange, src), (exchange, dst)
+        self._add_node(u)
+        self._add_node(v)
+        fee = self.fees.get(exchange, self.default_fee)
+        edge = self.edges[u].get(v)
+        if edge is None:
+            edge = self.edges[u][v] = Edge(u, v, rate, fee, depth)
+        else:
+            edge.set(rate, fee, depth)
+        return edge
+
+    def _apply(self, edges: List[Edge]) -> List[Dict]:
+        """Check the changed edges, then recheck every edge still on a cycle."""
+        self.updates += 1
+        found = [cycle for cycle in map(self._check, edges) if cycle]
+        changed = {(edge.src, edge.dst) for edge in edges}
+        for src, dst in list(self.violated):
+            if (src, dst) not in changed:
+                self._check(self.edges[src][dst])
+        return found
+
+    def opportunities(self, min_profit: float = 0.0) -> List[Dict]:
+        """Every currently open cycle, most profitable first."""
+        cycles = [c for c in self.violated.values() if c["profit_pct"] > min_profit]
+        return sorted(cycles, key=lambda c: -c["profit_pct"])
+
+    def _reduced(self, edge: Edge) -> float:
+        return edge.weight + self.potential[edge.src] - self.potential[edge.dst]
+
+    def _check(self, edge: Edge) -> Optional[Dict]:
+        """Restore feasible potentials around ``edge`` or return the negative cycle through it."""
+        key = (edge.src, edge.dst)
+        delta = self._reduced(edge)
+        if delta >= -EPSILON:
+            self.violated.pop(key, None)
+            return None
+        bound = -delta
+        dist, parent, settled = {edge.dst: 0.0}, {edge.dst: None}, {}
+        heap = [(0.0, edge.dst)]
+        while heap:
+            d, node = heappop(heap)
+            if node in settled:
+                continue
+            if d >= bound - EPSILON:
+                break
+            if node == edge.src:
+                cycle = self._cycle(edge, parent)
+                self.violated[key] = cycle
+                return cycle
+            settled[node] = d
+            base = self.potential[node]
+            for nxt, out in self.edges[node].items():
+                if (node, nxt) in self.violated or nxt in settled:
+                    continue
+                nd = d + out.weight + base - self.potential[nxt]
+                if nd < dist.get(nxt, math.inf):
+                    dist[nxt], parent[nxt] = nd, node
+                    heappush(heap, (nd, nxt))
+        for node, d in settled.items():
+            self.potential[node] += delta + d
+        self.violated.pop(key, None)
+        return None
+
+    def _cycle(self, edge: Edge, parent: Dict[Node, Optional[Node]]) -> Dict:
+        """Describe the loop ``edge.src -> edge.dst -> ... -> edge.src`` found by the search."""
+        chain = [edge.src]
+        while parent[chain[-1]] is not None:
+            chain.append(parent[chain[-1]])
+        path = [edge.src] + chain[::-1]
+        legs = [self.edges[a][b] for a, b in zip(path, path[1:])]
+        growth, size = 1.0, math.inf
+        for leg in legs:
+            size = min(size, leg.depth / growth)
+            growth *= leg.rate * (1.0 - leg.fee)
+        return {"path": path, "profit_pct": growth - 1.0, "max_size": size, "asset": path[0][1]}
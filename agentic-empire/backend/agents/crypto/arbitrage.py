@@ -1,6 +1,8 @@
 """Arbitrage specialist for cross-exchange opportunities."""
 from agents.base_trading_agent import TradingAgent
+from agents.crypto.arb_graph import ArbitrageGraph
 from typing import Dict, List
+import numpy as np
 
 class ArbitrageAgent(TradingAgent):
     """Specialized agent for crypto arbitrage across exchanges."""
@@ -11,12 +13,21 @@ class ArbitrageAgent(TradingAgent):
             backstory="Expert in cross-exchange arbitrage", strategy_type="arbitrage")
         self.exchanges = ["binance", "coinbase", "kraken", "uniswap"]
         self.min_profit_threshold = 0.005
+        self.graph = ArbitrageGraph()
+    
+    def on_quote(self, exchange: str, base: str, quote: str, bid: float, ask: float,
+                 bid_size: float = float("inf"), ask_size: float = float("inf")) -> List[Dict]:
+        """Feed one exchange quote into the rate graph; returns cycles it opened."""
+        return self.graph.update_quote(exchange, base, quote, bid, ask, bid_size, ask_size)
     
     async def analyze_market(self, symbol: str, data: Dict) -> Dict:
         """Identify arbitrage opportunities."""
         prices = data.get("prices", {"binance": 100.0, "coinbase": 101.0, "kraken": 99.5})
         opportunity = self._find_best_arbitrage(prices)
-        return {"symbol": symbol, "prices": prices, "opportunity": opportunity}
+        base = symbol.split("/")[0]
+        cycles = [c for c in self.graph.opportunities(self.min_profit_threshold)
+                  if any(asset == base for _, asset in c["path"])]
+        return {"symbol": symbol, "prices": prices, "opportunity": opportunity, "cycles": cycles}
     
     async def generate_signals(self, symbol: str) -> List[Dict]:
         """Generate arbitrage trading signals."""
@@ -27,13 +38,35 @@ class ArbitrageAgent(TradingAgent):
             signals.append({"action": "arbitrage", "symbol": symbol, 
                 "buy_exchange": opp["buy_exchange"], "sell_exchange": opp["sell_exchange"],
                 "profit_pct": opp["profit_pct"], "confidence": 0.95})
+        for cycle in analysis["cycles"]:
+            signals.append({"action": "arbitrage_cycle", "symbol": symbol, "path": cycle["path"],
+                            "profit_pct": cycle["profit_pct"], "max_size": cycle["max_size"],
+                            "confidence": 0.95})
         return signals
     
+    async def generate_signals_batch(self, symbols: List[str],
+                                     frame: Dict[str, np.ndarray]) -> Dict[str, List[Dict]]:
+        """Vectorized arbitrage scan over ``exchange_prices`` shaped (exchanges, symbols).
+
+        Rows follow ``self.exchanges``; without that field this falls back to the
+        per-symbol path.
+        """
+        if "exchange_prices" not in frame:
+            return await super().generate_signals_batch(symbols, frame)
+        prices = np.asarray(frame["exchange_prices"], dtype=np.float64)
+        low, high = np.nanargmin(prices, axis=0), np.nanargmax(prices, axis=0)
+        columns = np.arange(prices.shape[1])
+        profit_pct = (prices[high, columns] - prices[low, columns]) / prices[low, columns]
+        names = np.array(self.exchanges[:len(prices)])
+        actions = np.where(profit_pct > self.min_profit_threshold, "arbitrage", "")
+        return self._batch_signals(symbols, actions, {"buy_exchange": names[low], "sell_exchange": names[high],
+                                                      "profit_pct": profit_pct, "confidence": 0.95})
+    
     def _find_best_arbitrage(self, prices: Dict[str, float]) -> Dict:
         """Find best arbitrage opportunity."""
-        min_price = min(prices.values())
-        max_price = max(prices.values())
-        profit_pct = (max_price - min_price) / min_price
-        return {"buy_exchange": "binance", "sell_exchange": "coinbase", "profit_pct": profit_pct}
+        buy_exchange = min(prices, key=prices.get)
+        sell_exchange = max(prices, key=prices.get)
+        profit_pct = (prices[sell_exchange] - prices[buy_exchange]) / prices[buy_exchange]
+        return {"buy_exchange": buy_exchange, "sell_exchange": sell_exchange, "profit_pct": profit_pct}
 
 arbitrage_agent = ArbitrageAgent()
@@ -1,6 +1,7 @@
 """Bitcoin and Ethereum specialist trading agent."""
 from agents.base_trading_agent import TradingAgent
 from typing import Dict, List
+import numpy as np
 
 class BtcEthTrader(TradingAgent):
     """Specialized agent for major cryptocurrency pairs."""
@@ -37,6 +38,14 @@ class BtcEthTrader(TradingAgent):
         
         return signals
     
+    async def generate_signals_batch(self, symbols: List[str],
+                                     frame: Dict[str, np.ndarray]) -> Dict[str, List[Dict]]:
+        """Vectorized ``generate_signals`` over ``hash_rate`` and ``volume_24h`` columns."""
+        n = len(symbols)
+        bullish = ((self._field(frame, "hash_rate", 100, n) > 80) &
+                   (self._field(frame, "volume_24h", 1000000000, n) > 500000000))
+        return self._batch_signals(symbols, np.where(bullish, "buy", "sell"), {"confidence": 0.85})
+    
     def _analyze_on_chain(self, hash_rate: float, volume: float) -> str:
         """Analyze on-chain metrics for sentiment."""
         return "bullish" if hash_rate > 80 and volume > 500000000 else "bearish"
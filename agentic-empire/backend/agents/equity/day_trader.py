@@ -1,6 +1,9 @@
 """Day trading agent for scalping and momentum strategies."""
 from agents.base_trading_agent import TradingAgent
+from indicators.streaming import RSI
+from indicators.vectorized import rsi as rsi_series
 from typing import Dict, List
+import numpy as np
 
 class DayTrader(TradingAgent):
     """Specialized agent for intraday trading with momentum strategies."""
@@ -14,16 +17,24 @@ class DayTrader(TradingAgent):
         )
         self.timeframe = "1m"
         self.indicators = ["RSI", "MACD", "Volume"]
+        self._rsi: Dict[str, RSI] = {}
     
     async def analyze_market(self, symbol: str, data: Dict) -> Dict:
         """Analyze intraday price action and volume."""
         price = data.get("price", 100.0)
         volume = data.get("volume", 1000)
-        rsi = self._calculate_rsi(data.get("prices", [price]))
+        if "prices" not in data and symbol in self._rsi:
+            rsi = self._rsi[symbol].value
+        else:
+            rsi = self._calculate_rsi(data.get("prices", [price]))
         
         trend = "bullish" if rsi < 30 else "bearish" if rsi > 70 else "neutral"
         return {"symbol": symbol, "trend": trend, "rsi": rsi, "volume": volume}
     
+    def on_tick(self, symbol: str, price: float):
+        """Advance the symbol's streaming RSI by one price."""
+        self._rsi.setdefault(symbol, RSI()).update(price)
+    
     async def generate_signals(self, symbol: str) -> List[Dict]:
         """Generate buy/sell signals for day trading."""
         signals = []
@@ -36,9 +47,26 @@ class DayTrader(TradingAgent):
         
         return signals
     
+    async def generate_signals_batch(self, symbols: List[str],
+                                     frame: Dict[str, np.ndarray]) -> Dict[str, List[Dict]]:
+        """Vectorized ``generate_signals`` using RSI over the ``close`` history."""
+        if np.ndim(frame.get("close")) == 2:
+            rsi = rsi_series(frame["close"])[-1]
+        else:
+            rsi = np.array([self._rsi[s].value if s in self._rsi else 50.0 for s in symbols])
+        actions = np.where(rsi < 30, "buy", np.where(rsi > 70, "sell", ""))
+        return self._batch_signals(symbols, actions, {"confidence": 0.8})
+    
+    def generate_signals_vectorized(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Buy (1) when RSI drops into oversold, sell (-1) when it rises into overbought."""
+        rsi = rsi_series(columns["close"] if "close" in columns else columns["price"])
+        zone = (rsi < 30).astype(np.int8) - (rsi > 70).astype(np.int8)
+        entered = np.diff(zone, axis=0, prepend=np.zeros_like(zone[:1])) != 0
+        return np.where(entered, zone, 0)
+    
     def _calculate_rsi(self, prices: List[float], period: int = 14) -> float:
         """Calculate Relative Strength Index."""
-        return 50.0  # Simplified calculation
+        return float(rsi_series(prices, period)[-1])
 
 # Global instance
 day_trader = DayTrader()
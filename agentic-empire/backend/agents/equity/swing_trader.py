@@ -1,6 +1,9 @@
 """Swing trading agent for multi-day position holding."""
 from agents.base_trading_agent import TradingAgent
-from typing import Dict, List
+from indicators.streaming import EMA
+from indicators.vectorized import ema
+from typing import Dict, List, Tuple
+import numpy as np
 
 class SwingTrader(TradingAgent):
     """Specialized agent for swing trading with technical patterns."""
@@ -14,11 +17,17 @@ class SwingTrader(TradingAgent):
         )
         self.timeframe = "4h"
         self.patterns = ["head_shoulders", "double_bottom", "triangle"]
+        self.fast_period, self.slow_period = 12, 26
+        self._emas: Dict[str, Tuple[EMA, EMA]] = {}
     
     async def analyze_market(self, symbol: str, data: Dict) -> Dict:
         """Identify swing trading opportunities."""
         price = data.get("price", 100.0)
-        trend = self._detect_trend(data.get("prices", [price]))
+        if "prices" not in data and symbol in self._emas:
+            fast, slow = self._emas[symbol]
+            trend = "uptrend" if fast.value > slow.value else "downtrend"
+        else:
+            trend = self._detect_trend(data.get("prices", [price]))
         support = price * 0.95
         resistance = price * 1.05
         
@@ -36,11 +45,43 @@ class SwingTrader(TradingAgent):
         
         return signals
     
+    def on_tick(self, symbol: str, price: float):
+        """Advance the symbol's fast and slow streaming EMAs by one price."""
+        fast, slow = self._emas.setdefault(symbol, (EMA(self.fast_period), EMA(self.slow_period)))
+        fast.update(price)
+        slow.update(price)
+    
+    async def generate_signals_batch(self, symbols: List[str],
+                                     frame: Dict[str, np.ndarray]) -> Dict[str, List[Dict]]:
+        """Vectorized ``generate_signals`` from fast/slow EMAs of the ``close`` history.
+
+        Without a 2-D history the streaming EMAs fed by ``on_tick`` decide the
+        trend, and a 1-D ``close`` gives each symbol's latest price.
+        """
+        close = frame.get("close")
+        if np.ndim(close) == 2:
+            close = np.asarray(close, dtype=np.float64)
+            price = close[-1]
+            uptrend = (ema(close, self.fast_period)[-1] > ema(close, self.slow_period)[-1]) & (len(close) > 1)
+        else:
+            price = np.full(len(symbols), 100.0) if close is None else np.asarray(close, dtype=np.float64)
+            uptrend = np.array([s in self._emas and self._emas[s][0].value > self._emas[s][1].value
+                                for s in symbols], dtype=bool)
+        return self._batch_signals(symbols, np.where(uptrend, "buy", ""),
+                                   {"target": price * 1.05, "stop": price * 0.95, "confidence": 0.75})
+    
+    def generate_signals_vectorized(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Buy (1) when the fast EMA crosses above the slow EMA, sell (-1) on the reverse cross."""
+        prices = columns["close"] if "close" in columns else columns["price"]
+        above = (ema(prices, self.fast_period) > ema(prices, self.slow_period)).astype(np.int8)
+        return np.diff(above, axis=0, prepend=above[:1])
+    
     def _detect_trend(self, prices: List[float]) -> str:
-        """Detect price trend direction."""
+        """Detect price trend direction from the fast/slow EMA spread."""
         if len(prices) < 2:
             return "sideways"
-        return "uptrend" if prices[-1] > prices[0] else "downtrend"
+        fast, slow = ema(prices, self.fast_period)[-1], ema(prices, self.slow_period)[-1]
+        return "uptrend" if fast > slow else "downtrend"
 
 # Global instance
 swing_trader = SwingTrader()
@@ -1,6 +1,7 @@
 """Value investing agent with fundamental analysis."""
 from agents.base_trading_agent import TradingAgent
 from typing import Dict, List
+import numpy as np
 
 class ValueInvestor(TradingAgent):
     """Specialized agent for long-term value investing."""
@@ -37,6 +38,16 @@ class ValueInvestor(TradingAgent):
         
         return signals
     
+    async def generate_signals_batch(self, symbols: List[str],
+                                     frame: Dict[str, np.ndarray]) -> Dict[str, List[Dict]]:
+        """Vectorized ``generate_signals`` over ``price`` and ``free_cash_flow`` columns."""
+        n = len(symbols)
+        price = self._field(frame, "price", 100.0, n)
+        intrinsic = self._calculate_dcf({"free_cash_flow": self._field(frame, "free_cash_flow", 10000000, n)})
+        margin = np.divide(intrinsic - price, intrinsic, out=np.zeros(n), where=intrinsic > 0)
+        return self._batch_signals(symbols, np.where(margin > 0.2, "buy", ""),
+                                   {"confidence": 0.9, "target_price": intrinsic})
+    
     def _calculate_dcf(self, data: Dict) -> float:
         """Calculate discounted cash flow valuation."""
         fcf = data.get("free_cash_flow", 10000000)
@@ -1,6 +1,7 @@
 """Futures trading specialist for ES, NQ, GC contracts."""
 from agents.base_trading_agent import TradingAgent
 from typing import Dict, List
+import numpy as np
 
 class FuturesTrader(TradingAgent):
     """Specialized agent for futures contract trading."""
@@ -37,6 +38,15 @@ class FuturesTrader(TradingAgent):
         
         return signals
     
+    async def generate_signals_batch(self, contracts: List[str],
+                                     frame: Dict[str, np.ndarray]) -> Dict[str, List[Dict]]:
+        """Vectorized ``generate_signals`` over ``volume`` and optional ``roll_needed`` columns."""
+        n = len(contracts)
+        roll_needed = self._field(frame, "roll_needed", 0, n) > 0
+        active = (self._field(frame, "volume", 100000, n) > 50000) & ~roll_needed
+        return self._batch_signals(contracts, np.where(active, "buy", ""),
+                                   {"confidence": 0.80, "position_size": 1}, key="contract")
+    
     def _check_roll_requirement(self, expiry: str) -> bool:
         """Check if contract needs to be rolled."""
         return False  # Simplified logic
@@ -1,7 +1,10 @@
 """Options strategist with Greeks calculation."""
 from agents.base_trading_agent import TradingAgent
+from agents.options.pricing import black_scholes, implied_volatility
+from agents.options.vol_surface import vol_surfaces
 from typing import Dict, List
 import math
+import numpy as np
 
 class OptionsStrategist(TradingAgent):
     """Specialized agent for options trading strategies."""
@@ -14,14 +17,25 @@ class OptionsStrategist(TradingAgent):
             strategy_type="options_trading"
         )
         self.strategies = ["iron_condor", "butterfly", "calendar_spread"]
-        self.greeks = ["delta", "gamma", "theta", "vega"]
+        self.greeks = ["delta", "gamma", "theta", "vega", "rho"]
+        self.risk_free_rate = 0.05
+        self.surfaces = vol_surfaces
     
     async def analyze_market(self, symbol: str, data: Dict) -> Dict:
         """Analyze options market and calculate Greeks."""
         spot_price = data.get("spot_price", 100.0)
         strike = data.get("strike", 100.0)
-        volatility = data.get("iv", 0.30)
         dte = data.get("days_to_expiry", 30)
+        volatility = data.get("iv")
+        if volatility is None and "option_price" in data:
+            volatility = float(implied_volatility(data["option_price"], spot_price, strike, dte / 365.0,
+                                                  self.risk_free_rate, data.get("is_call", True)))
+        elif volatility is None and symbol in self.surfaces:
+            # Read-only: the shared surface's spot is only moved by market data, never by what-if inputs
+            surface = self.surfaces.get(symbol)
+            volatility = float(surface.implied_vol(strike, dte / 365.0))
+        if volatility is None or math.isnan(volatility):
+            volatility = 0.30
         
         greeks = self._calculate_greeks(spot_price, strike, volatility, dte)
         return {"symbol": symbol, "greeks": greeks, "iv": volatility, "dte": dte}
@@ -29,7 +43,8 @@ class OptionsStrategist(TradingAgent):
     async def generate_signals(self, symbol: str) -> List[Dict]:
         """Generate options trading signals."""
         signals = []
-        analysis = await self.analyze_market(symbol, {"spot_price": 100.0, "strike": 100.0})
+        spot = self.surfaces.surfaces[symbol].spot if symbol in self.surfaces else 100.0
+        analysis = await self.analyze_market(symbol, {"spot_price": spot, "strike": spot})
         
         if analysis["iv"] > 0.40:  # High volatility
             signals.append({"action": "sell_iron_condor", "symbol": symbol,
@@ -37,10 +52,42 @@ class OptionsStrategist(TradingAgent):
         
         return signals
     
-    def _calculate_greeks(self, spot: float, strike: float, vol: float, dte: int) -> Dict:
-        """Calculate option Greeks."""
-        delta = 0.5  # Simplified
-        return {"delta": delta, "gamma": 0.05, "theta": -0.02, "vega": 0.15}
+    async def generate_signals_batch(self, symbols: List[str],
+                                     frame: Dict[str, np.ndarray]) -> Dict[str, List[Dict]]:
+        """Vectorized ``generate_signals`` over an ``iv`` column."""
+        high_vol = self._field(frame, "iv", 0.30, len(symbols)) > 0.40
+        return self._batch_signals(symbols, np.where(high_vol, "sell_iron_condor", ""),
+                                   {"confidence": 0.75, "strikes": [95, 100, 100, 105]})
+    
+    def _calculate_greeks(self, spot: float, strike: float, vol: float, dte: int,
+                          is_call: bool = True) -> Dict:
+        """Calculate option Greeks; theta per day, vega and rho per 1% move."""
+        return self._scale_greeks(black_scholes(spot, strike, dte / 365.0, self.risk_free_rate, vol, is_call))
+    
+    def calculate_chain_greeks(self, spot, strikes, dte, vols, is_call=True) -> Dict[str, np.ndarray]:
+        """Price and Greeks for a whole option chain of NumPy arrays in one pass."""
+        return self._scale_greeks(black_scholes(spot, strikes, np.asarray(dte) / 365.0,
+                                                self.risk_free_rate, vols, is_call))
+    
+    def evaluate_structures(self, symbol: str, spot: float, strikes, dte, quantities,
+                            is_call) -> Dict[str, np.ndarray]:
+        """Net premium and Greeks of many multi-leg structures off the cached surface.
+        
+        ``strikes``, ``quantities`` and ``is_call`` are shaped (structures, legs);
+        ``dte`` broadcasts against them, so calendars can mix expiries per leg.
+        """
+        strikes = np.asarray(strikes, dtype=np.float64)
+        expiry = np.broadcast_to(np.asarray(dte, dtype=np.float64) / 365.0, strikes.shape)
+        surface = self.surfaces.surfaces.get(symbol) or self.surfaces.get(symbol, spot)
+        vols = surface.implied_vol(strikes, expiry)
+        greeks = self._scale_greeks(black_scholes(spot, strikes, expiry, self.risk_free_rate, vols, is_call))
+        return {name: (np.asarray(value) * quantities).sum(axis=-1) for name, value in greeks.items()}
+    
+    def _scale_greeks(self, greeks: Dict) -> Dict:
+        scaled = {"price": greeks["price"], "delta": greeks["delta"], "gamma": greeks["gamma"],
+                  "theta": greeks["theta"] / 365.0, "vega": greeks["vega"] / 100.0,
+                  "rho": greeks["rho"] / 100.0}
+        return {k: float(v) if np.ndim(v) == 0 else v for k, v in scaled.items()}
 
 # Global instance
 options_strategist = OptionsStrategist()
@@ -0,0 +1,112 @@
+"""Vectorized Black-Scholes pricing, Greeks and implied volatility for option chains.
+
+Every argument broadcasts, so a whole chain of spot, strike, expiry (in years),
+rate and volatility arrays is priced in a single pass. Theta is per year, vega
+per unit of volatility and rho per unit of rate.
+"""
+from typing import Dict
+import numpy as np
+
+SQRT_2PI = np.sqrt(2.0 * np.pi)
+MIN_EXPIRY = 1e-10
+MIN_VOL = 1e-12
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal density."""
+    return np.exp(-0.5 * np.square(x)) / SQRT_2PI
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal CDF to double precision (Hart's algorithm as given by West, 2005)."""
+    x = np.asarray(x, dtype=np.float64)
+    z = np.abs(x)
+    exponential = np.exp(-0.5 * z * z)
+    num = ((((((0.0352624965998911 * z + 0.700383064443688) * z + 6.37396220353165) * z
+               + 33.912866078383) * z + 112.079291497871) * z + 221.213596169931) * z
+           + 220.206867912376)
+    den = (((((((0.0883883476483184 * z + 1.75566716318264) * z + 16.064177579207) * z
+                + 86.7807322029461) * z + 296.564248779674) * z + 637.333633378831) * z
+            + 793.826512519948) * z + 440.413735824752)
+    fraction = z + 1.0 / (z + 2.0 / (z + 3.0 / (z + 4.0 / (z + 0.65))))
+    tail = np.where(z < 7.07106781186547, exponential * num / den, exponential / fraction / SQRT_2PI)
+    tail = np.where(z > 37.0, 0.0, tail)
+    return np.where(x > 0, 1.0 - tail, tail)
+
+def _d1_d2(spot, strike, expiry, rate, vol, dividend):
+    sqrt_t = np.sqrt(expiry)
+    vol_t = vol * sqrt_t
+    d1 = (np.log(spot / strike) + (rate - dividend + 0.5 * vol * vol) * expiry) / vol_t
+    return d1, d1 - vol_t, sqrt_t
+
+def black_scholes(spot, strike, expiry, rate, vol, is_call=True, dividend=0.0) -> Dict[str, np.ndarray]:
+    """Price, delta, gamma, theta, vega and rho for every contract."""
+    spot, strike, rate, dividend = (np.asarray(a, dtype=np.float64) for a in (spot, strike, rate, dividend))
+    expiry = np.maximum(np.asarray(expiry, dtype=np.float64), MIN_EXPIRY)
+    vol = np.maximum(np.asarray(vol, dtype=np.float64), MIN_VOL)
+    sign = np.where(is_call, 1.0, -1.0)
+    d1, d2, sqrt_t = _d1_d2(spot, strike, expiry, rate, vol, dividend)
+    spot_df, strike_df = spot * np.exp(-dividend * expiry), strike * np.exp(-rate * expiry)
+    n1, n2, pdf = norm_cdf(sign * d1), norm_cdf(sign * d2), norm_pdf(d1)
+    return {"price": sign * (spot_df * n1 - strike_df * n2),
+            "delta": sign * np.exp(-dividend * expiry) * n1,
+            "gamma": spot_df * pdf / (spot * spot * vol * sqrt_t),
+            "theta": (-spot_df * pdf * vol / (2.0 * sqrt_t) - sign * rate * strike_df * n2
+                      + sign * dividend * spot_df * n1),
+            "vega": spot_df * pdf * sqrt_t,
+            "rho": sign * strike_df * expiry * n2}
+
+def _price_vega(log_moneyness, sqrt_t, spot_df, strike_df, sign, vol):
+    """Price and vega alone, from forward log-moneyness and discounted spot and strike."""
+    vol_t = vol * sqrt_t
+    d1 = log_moneyness / vol_t + 0.5 * vol_t
+    price = sign * (spot_df * norm_cdf(sign * d1) - strike_df * norm_cdf(sign * (d1 - vol_t)))
+    return price, spot_df * norm_pdf(d1) * sqrt_t
+
+def implied_volatility(price, spot, strike, expiry, rate, is_call=True, dividend=0.0,
+                       tol: float = 1e-8, max_iter: int = 100, lower: float = 1e-4,
+                       upper: float = 5.0) -> np.ndarray:
+    """Solve Black-Scholes for volatility contract by contract.
+
+    Newton steps start from the Corrado-Miller estimate and are kept inside a
+    per-contract bracket [lower, upper] that tightens every iteration, falling
+    back to bisection whenever a step leaves it, so deep wings with vanishing
+    vega still converge. Only unconverged contracts are repriced. Prices outside
+    the no-arbitrage bounds, or needing a volatility outside the bracket, come
+    back as NaN.
+    """
+    arrays = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64)
+                                   for a in (price, spot, strike, expiry, rate, dividend)),
+                                 np.asarray(is_call, dtype=bool))
+    price, spot, strike, expiry, rate, dividend, is_call = (a.ravel() for a in arrays)
+    expiry = np.maximum(expiry, MIN_EXPIRY)
+    spot_df, strike_df = spot * np.exp(-dividend * expiry), strike * np.exp(-rate * expiry)
+    sign, sqrt_t = np.where(is_call, 1.0, -1.0), np.sqrt(expiry)
+    log_moneyness = np.log(spot_df / strike_df)
+    forward_value = spot_df - strike_df
+    call_price = np.where(is_call, price, price + forward_value)
+    half = call_price - 0.5 * forward_value
+    root = np.sqrt(np.maximum(half * half - forward_value * forward_value / np.pi, 0.0))
+    vol = np.clip(SQRT_2PI / (spot_df + strike_df) * (half + root) / sqrt_t, lower, upper)
+    lo, hi = np.full(price.shape, lower), np.full(price.shape, upper)
+    floor, cap = np.maximum(sign * forward_value, 0.0), np.where(is_call, spot_df, strike_df)
+    active = np.flatnonzero((price > floor) & (price < cap))
+    out = np.full(price.shape, np.nan)
+    for _ in range(max_iter):
+        if not len(active):
+            break
+        i = active
+        model, vega = _price_vega(log_moneyness[i], sqrt_t[i], spot_df[i], strike_df[i], sign[i], vol[i])
+        diff = model - price[i]
+        done = np.abs(diff) < tol * np.maximum(price[i], 1.0)
+        out[i[done]] = vol[i[done]]
+        lo_i, hi_i = np.where(diff < 0, vol[i], lo[i]), np.where(diff > 0, vol[i], hi[i])
+        lo[i], hi[i] = lo_i, hi_i
+        with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+            step = vol[i] - diff / vega
+        inside = np.isfinite(step) & (step > lo_i) & (step < hi_i)
+        vol[i] = np.where(inside, step, 0.5 * (lo_i + hi_i))
+        collapsed = ~done & (hi_i - lo_i <= tol)
+        solved = i[collapsed & (lo_i > lower) & (hi_i < upper)]
+        out[solved] = vol[solved]
+        active = i[~done & ~collapsed]
+    out[active] = vol[active]
+    return out.reshape(arrays[0].shape)
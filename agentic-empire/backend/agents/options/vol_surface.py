@@ -0,0 +1,160 @@
+"""SVI volatility surfaces fitted from option chain quotes."""
+from typing import Dict, Optional
+import numpy as np
+
+GRID = 15
+REFINEMENTS = 3
+
+def svi_total_variance(params: np.ndarray, k: np.ndarray) -> np.ndarray:
+    """Raw SVI ``a + b * (rho * (k - m) + sqrt((k - m)^2 + sigma^2))``; params are (..., 5)."""
+    a, b, rho, m, sigma = np.moveaxis(np.asarray(params), -1, 0)
+    x = k - m
+    return a + b * (rho * x + np.sqrt(x * x + sigma * sigma))
+
+def _fit_grid(k: np.ndarray, w: np.ndarray, ms: np.ndarray, sigmas: np.ndarray):
+    """Best linear SVI fit over every (m, sigma) pair; returns (error, raw params)."""
+    m, sigma = (g.ravel()[:, None] for g in np.meshgrid(ms, sigmas))
+    y = (k - m) / sigma
+    design = np.stack([np.ones_like(y), y, np.sqrt(y * y + 1.0)], axis=-1)
+    gram = np.einsum("gni,gnj->gij", design, design) + 1e-12 * np.eye(3)
+    coef = np.linalg.solve(gram, np.einsum("gni,n->gi", design, w)[..., None])[..., 0]
+    a, d, c = coef.T
+    error = (((design @ coef[..., None])[..., 0] - w) ** 2).sum(axis=-1)
+    valid = (c > 0) & (np.abs(d) <= c) & (a + np.sqrt(np.maximum(c * c - d * d, 0.0)) >= 0)
+    error = np.where(valid, error, np.inf)
+    best = int(np.argmin(error))
+    sigma_b = sigma[best, 0]
+    params = np.array([a[best], c[best] / sigma_b, d[best] / c[best] if c[best] > 0 else 0.0,
+                       m[best, 0], sigma_b])
+    return error[best], params
+
+def fit_svi(k: np.ndarray, w: np.ndarray) -> np.ndarray:
+    """Fit one expiry slice of total variance ``w`` against log-moneyness ``k``.
+
+    Uses the quasi-explicit method: for fixed (m, sigma) SVI is linear in its
+    other three parameters, so a coarse grid over (m, sigma) is solved with
+    batched least squares and then refined around the best cell.
+    """
+    if len(k) < 3 or np.ptp(k) == 0:
+        return np.array([float(np.mean(w)), 0.0, 0.0, 0.0, 1.0])
+    span = np.ptp(k)
+    ms, sigmas = np.linspace(k.min(), k.max(), GRID), np.geomspace(span * 1e-3, span * 2, GRID)
+    error, params = _fit_grid(k, w, ms, sigmas)
+    if not np.isfinite(error):
+        return np.array([float(np.mean(w)), 0.0, 0.0, 0.0, 1.0])
+    m_step, sigma_ratio = ms[1] - ms[0], sigmas[1] / sigmas[0]
+    for _ in range(REFINEMENTS):
+        refined_error, refined = _fit_grid(k, w, np.linspace(params[3] - m_step, params[3] + m_step, GRID),
+                                           np.geomspace(params[4] / sigma_ratio, params[4] * sigma_ratio, GRID))
+        if refined_error < error:
+            error, params = refined_error, refined
+        m_step, sigma_ratio = 2 * m_step / (GRID - 1), sigma_ratio ** (2 / (GRID - 1))
+    return params
+
+class VolatilitySurface:
+    """Implied volatility across strikes and expiries for one underlying.
+
+    Quotes are kept per expiry slice; changing a quote only marks its slice
+    dirty, and dirty slices are refitted lazily on the next lookup. Lookups
+    interpolate total variance linearly in expiry at fixed log-moneyness, so
+    moving ``spot`` shifts the smile with the forward without a refit.
+    """
+
+    def __init__(self, underlying: str, spot: float = 100.0, rate: float = 0.0, dividend: float = 0.0):
+        self.underlying = underlying
+        self.spot, self.rate, self.dividend = spot, rate, dividend
+        self.quotes: Dict[float, Dict[float, float]] = {}
+        self.fitted: Dict[float, np.ndarray] = {}
+        self.dirty = set()
+        self.expiries = np.empty(0)
+        self.params = np.empty((0, 5))
+
+    def forward(self, expiry):
+        return self.spot * np.exp((self.rate - self.dividend) * np.asarray(expiry, dtype=np.float64))
+
+    def update_quotes(self, expiry: float, strikes, ivs):
+        """Merge implied vol quotes for one expiry (in years); NaN quotes are dropped."""
+        chain = self.quotes.setdefault(float(expiry), {})
+        for strike, iv in zip(np.atleast_1d(strikes).tolist(), np.atleast_1d(ivs).tolist()):
+            if iv == iv and iv > 0:
+                chain[strike] = iv
+            else:
+                chain.pop(strike, None)
+        self.dirty.add(float(expiry))
+
+    def remove_expiry(self, expiry: float):
+        self.quotes.pop(float(expiry), None)
+        self.fitted.pop(float(expiry), None)
+        self.dirty.discard(float(expiry))
+        self._stack()
+
+    def fit(self) -> int:
+        """Refit dirty slices only; returns how many were refitted."""
+        refitted = 0
+        for expiry in self.dirty:
+            chain = self.quotes.get(expiry)
+            if not chain:
+                self.fitted.pop(expiry, None)
+                continue
+            strikes = np.fromiter(chain.keys(), dtype=np.float64)
+            ivs = np.fromiter(chain.values(), dtype=np.float64)
+            k = np.log(strikes / self.forward(expiry))
+            self.fitted[expiry] = fit_svi(k, ivs * ivs * expiry)
+            refitted += 1
+        self.dirty.clear()
+        self._stack()
+        return refitted
+
+    def _stack(self):
+        self.expiries = np.array(sorted(self.fitted))
+        self.params = np.array([self.fitted[t] for t in self.expiries]).reshape(-1, 5)
+
+    def total_variance(self, strikes, expiries) -> np.ndarray:
+        """Total implied variance for any strikes and expiries (broadcast together)."""
+        if self.dirty:
+            self.fit()
+        if not len(self.expiries):
+            raise ValueError(f"No quotes for {self.underlying}")
+        expiries = np.asarray(expiries, dtype=np.float64)
+        k = np.log(np.asarray(strikes, dtype=np.float64) / self.forward(expiries))
+        upper = np.clip(np.searchsorted(self.expiries, expiries), 1, len(self.expiries) - 1)
+        if len(self.expiries) == 1:
+            w = svi_total_variance(self.params[0], k)
+            return np.maximum(w * expiries / self.expiries[0], 0.0)
+        t0, t1 = self.expiries[upper - 1], self.expiries[upper]
+        w0 = svi_total_variance(self.params[upper - 1], k)
+        w1 = svi_total_variance(self.params[upper], k)
+        weight = (expiries - t0) / (t1 - t0)
+        w = w0 + weight * (w1 - w0)
+        # Before the first and after the last slice, hold the nearest slice's vol flat.
+        w = np.where(expiries < self.expiries[0], w0 * expiries / t0, w)
+        w = np.where(expiries > self.expiries[-1], w1 * expiries / t1, w)
+        return np.maximum(w, 0.0)
+
+    def implied_vol(self, strikes, expiries) -> np.ndarray:
+        """Implied volatility for any strikes and expiries (in years)."""
+        expiries = np.maximum(np.asarray(expiries, dtype=np.float64), 1e-10)
+        return np.sqrt(self.total_variance(strikes, expiries) / expiries)
+
+class SurfaceCache:
+    """Volatility surfaces shared across strategies, one per underlying."""
+
+    def __init__(self):
+        self.surfaces: Dict[str, VolatilitySurface] = {}
+
+    def get(self, underlying: str, spot: Optional[float] = None, **kwargs) -> VolatilitySurface:
+        """Return the underlying's surface, creating it on first use."""
+        surface = self.surfaces.get(underlying)
+        if surface is None:
+            surface = self.surfaces[underlying] = VolatilitySurface(underlying, spot or 100.0, **kwargs)
+        elif spot is not None:
+            surface.spot = spot
+        return surface
+
+    def __contains__(self, underlying: str) -> bool:
+        """True once the underlying's surface holds quotes."""
+        surface = self.surfaces.get(underlying)
+        return surface is not None and any(surface.quotes.values())
+
+# Global instance
+vol_surfaces = SurfaceCache()
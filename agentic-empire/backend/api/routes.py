@@ -1,3 +1,4 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, BackgroundTasks
 from pydantic import BaseModel
 from core.auth import get_current_user
@@ -11,6 +12,7 @@ class TaskInput(BaseModel):
     prompt: str
     dept: str = "executive"
     use_queue: bool = False
+    caller: Optional[str] = None  # e.g. "Dashboard" or "HealthProbe"; selects the response cache TTL
 
 @router.get("/health")
 async def health():
@@ -20,10 +22,10 @@ async def health():
 async def execute(input: TaskInput, user: str = Depends(get_current_user)):
     if input.use_queue:
         # Push to background worker for 24/7 autonomy
-        task = heavy_task.delay(input.prompt)
+        task = heavy_task.delay(input.prompt, input.caller)
         return {"status": "queued", "task_id": task.id}
     
-    result = await tiered_generate(input.prompt)
+    result = await tiered_generate(input.prompt, caller=input.caller)
     return {"result": result}
 
 @router.post("/chat")
@@ -33,6 +35,6 @@ async def chat(input: TaskInput, user: str = Depends(get_current_user)):
     return {"response": result}
 
 @router.post("/generate")
-async def generate_text(prompt: str, user: str = Depends(get_current_user)):
-    response = await tiered_generate(prompt)
+async def generate_text(prompt: str, caller: Optional[str] = None, user: str = Depends(get_current_user)):
+    response = await tiered_generate(prompt, caller=caller)
     return {"response": response}
\ No newline at end of file
@@ -40,7 +40,7 @@ async def voice_chat(websocket: WebSocket):
                 os.unlink(temp_path)  # Clean up
                 
                 if text and text != "Sorry, could not understand audio.":
-                    response = await tiered_generate(text)  # Tiered LLM
+                    response = await tiered_generate(text, caller="voice_chat")  # Tiered LLM, never cached
                     
                     # TTS: Generate speech
                     engine.save_to_file(response, 'temp.mp3')
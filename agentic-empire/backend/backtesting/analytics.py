@@ -0,0 +1,50 @@
+"""Vectorized performance analytics over simulated equity curves."""
+from typing import Dict
+import numpy as np
+
+def drawdown(equity: np.ndarray) -> Dict[str, float]:
+    """Deepest peak-to-trough loss and the longest stretch spent below a peak."""
+    peak = np.maximum.accumulate(equity)
+    dd = equity / peak - 1.0
+    bars = np.arange(len(equity))
+    last_peak = np.maximum.accumulate(np.where(dd >= 0, bars, 0))
+    return {"max_drawdown": float(dd.min()), "max_drawdown_duration": int((bars - last_peak).max())}
+
+def holding_period_pnl(prices: np.ndarray, position: np.ndarray, fills: np.ndarray) -> np.ndarray:
+    """P&L of each stretch between fills during which a position was held."""
+    segment = np.cumsum(fills != 0)[:-1]
+    pnl = np.bincount(segment, weights=position[:-1] * np.diff(prices))
+    held = np.bincount(segment, weights=np.abs(position[:-1])) > 0
+    return pnl[held]
+
+def return_metrics(equity: np.ndarray, periods_per_year: int = 252) -> Dict:
+    """Total return, annualized Sharpe/Sortino and drawdown of an equity curve."""
+    if len(equity) < 2:
+        return {"total_return": float(equity[-1] / equity[0] - 1) if len(equity) else 0.0,
+                "sharpe_ratio": 0.0, "sortino_ratio": 0.0, "max_drawdown": 0.0,
+                "max_drawdown_duration": 0}
+    returns = np.diff(equity) / equity[:-1]
+    mean, std = returns.mean(), returns.std()
+    downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2))
+    scale = np.sqrt(periods_per_year)
+    return {"total_return": float(equity[-1] / equity[0] - 1),
+            "sharpe_ratio": float(mean / std * scale) if std > 0 else 0.0,
+            "sortino_ratio": float(mean / downside * scale) if downside > 0 else 0.0,
+            **drawdown(equity)}
+
+def performance_metrics(prices: np.ndarray, fills: np.ndarray, position: np.ndarray,
+                        equity: np.ndarray, periods_per_year: int = 252) -> Dict:
+    """Return, risk and activity statistics from per-bar arrays in O(n).
+
+    Win rate counts the holding periods between fills that closed with a profit.
+    """
+    total_trades = int(np.count_nonzero(fills))
+    if len(equity) < 2:
+        return {**return_metrics(equity, periods_per_year), "win_rate": 0.0, "turnover": 0.0,
+                "exposure": 0.0, "total_trades": total_trades}
+    periods = holding_period_pnl(prices, position, fills)
+    return {**return_metrics(equity, periods_per_year),
+            "win_rate": float((periods > 0).mean()) if len(periods) else 0.0,
+            "turnover": float(np.abs(fills * prices).sum() / equity.mean()),
+            "exposure": float(np.mean(np.abs(position * prices) / equity)),
+            "total_trades": total_trades}
@@ -1,35 +1,78 @@
 """Backtesting engine for strategy validation."""
-from typing import Dict, List
+from typing import Dict, List, Union
 from datetime import datetime
+import numpy as np
+from backtesting.vectorized import to_columns, price_column, simulate, fill_records
+from backtesting.analytics import performance_metrics
+
+SIDES = {"buy": 1, "sell": -1}
 
 class BacktestEngine:
     """Historical simulation and performance analysis."""
     
-    def __init__(self, initial_capital: float = 100000.0):
+    def __init__(self, initial_capital: float = 100000.0, trade_quantity: float = 10,
+                 periods_per_year: int = 252):
         self.initial_capital = initial_capital
+        self.trade_quantity = trade_quantity
+        self.periods_per_year = periods_per_year
         self.capital = initial_capital
         self.positions, self.trades = [], []
+        self._record_curve({k: np.empty(0) for k in ("prices", "fills", "position", "equity")})
     
-    async def run_backtest(self, strategy, historical_data: List[Dict]) -> Dict:
-        """Execute backtest on historical data."""
+    async def run_backtest(self, strategy, historical_data: Union[List[Dict], Dict[str, np.ndarray]],
+                           vectorized: bool = False) -> Dict:
+        """Execute backtest on historical data.
+
+        The per-bar path awaits ``strategy.generate_signals`` on every bar and is the
+        reference implementation; ``vectorized=True`` runs ``run_vectorized`` instead.
+        """
+        if vectorized:
+            return self.run_vectorized(strategy, historical_data)
         self.capital = self.initial_capital
         self.trades = []
+        cash, position, curve = self.initial_capital, 0.0, []
         for data_point in historical_data:
+            price, filled = data_point["price"], 0.0
             signals = await strategy.generate_signals(data_point["symbol"])
             for signal in signals:
-                self._execute_trade(signal, data_point["price"])
+                self._execute_trade(signal, price)
+                filled += SIDES.get(signal["action"], 0) * self.trade_quantity
+            cash, position = cash - filled * price, position + filled
+            curve.append((price, filled, position, cash + position * price))
+        prices, fills, positions, equity = np.array(curve, dtype=np.float64).reshape(-1, 4).T
+        self._record_curve({"prices": prices, "fills": fills, "position": positions, "equity": equity})
+        return self._calculate_metrics()
+    
+    def run_vectorized(self, strategy, historical_data: Union[List[Dict], Dict[str, np.ndarray]]) -> Dict:
+        """Backtest over whole NumPy columns via ``strategy.generate_signals_vectorized``."""
+        if not hasattr(strategy, "generate_signals_vectorized"):
+            raise TypeError(f"{type(strategy).__name__} has no generate_signals_vectorized")
+        columns = to_columns(historical_data) if isinstance(historical_data, list) else historical_data
+        prices = price_column(columns)
+        signals = strategy.generate_signals_vectorized(columns)
+        result = simulate(prices, signals, self.initial_capital, self.trade_quantity)
+        self.trades = fill_records(prices, result["fills"])
+        self._record_curve({"prices": prices, **result})
         return self._calculate_metrics()
     
     def _execute_trade(self, signal: Dict, price: float):
         """Simulate trade execution."""
         self.trades.append({"action": signal["action"], "price": price, 
-            "quantity": 10, "timestamp": datetime.now().isoformat()})
+            "quantity": self.trade_quantity, "timestamp": datetime.now().isoformat()})
+    
+    def _record_curve(self, curve: Dict[str, np.ndarray]):
+        """Keep the per-bar price, fill, position and equity arrays of the last run."""
+        self.curve = curve
+        self.capital = float(curve["equity"][-1]) if len(curve["equity"]) else self.initial_capital
     
     def _calculate_metrics(self) -> Dict:
-        """Calculate backtest performance metrics."""
-        total_return = (self.capital - self.initial_capital) / self.initial_capital
-        return {"total_return": total_return, "win_rate": 0.55, "sharpe_ratio": 1.5,
-                "max_drawdown": -0.15, "total_trades": len(self.trades)}
+        """Calculate backtest performance metrics from the simulated equity curve."""
+        curve = self.curve
+        metrics = performance_metrics(curve["prices"], curve["fills"], curve["position"],
+                                      curve["equity"], self.periods_per_year)
+        metrics["total_return"] = (self.capital - self.initial_capital) / self.initial_capital
+        metrics["total_trades"] = len(self.trades)
+        return metrics
     
     def generate_report(self) -> str:
         """Generate backtest report."""
@@ -0,0 +1,100 @@
+"""Parallel parameter sweeps with walk-forward optimization."""
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from backtesting.backtest_engine import BacktestEngine
+
+_columns: Dict[str, np.ndarray] = {}
+_blocks: List[shared_memory.SharedMemory] = []
+
+def expand_grid(param_grid: Dict[str, List]) -> List[Dict]:
+    """Expand a parameter grid into one dict per combination."""
+    keys = list(param_grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*param_grid.values())]
+
+def walk_forward_windows(n_bars: int, train_size: int, test_size: int,
+                         step: Optional[int] = None) -> List[Tuple[int, int, int]]:
+    """Rolling (start, split, end) bar offsets for train/test windows."""
+    step = step or test_size
+    return [(s, s + train_size, s + train_size + test_size)
+            for s in range(0, n_bars - train_size - test_size + 1, step)]
+
+def _slice_range(columns: Dict[str, np.ndarray], start, end) -> Dict[str, np.ndarray]:
+    """Restrict columns to ``start <= timestamp < end``."""
+    if start is None and end is None:
+        return columns
+    ts = columns["timestamp"]
+    lo = 0 if start is None else int(np.searchsorted(ts, np.asarray(start, dtype=ts.dtype)))
+    hi = len(ts) if end is None else int(np.searchsorted(ts, np.asarray(end, dtype=ts.dtype)))
+    return {k: v[lo:hi] for k, v in columns.items()}
+
+def _share(columns: Dict[str, np.ndarray]) -> Dict[str, Tuple[str, str, int]]:
+    """Copy each column once into shared memory and return attach specs."""
+    specs = {}
+    for key, col in columns.items():
+        col = np.ascontiguousarray(col)
+        block = shared_memory.SharedMemory(create=True, size=max(col.nbytes, 1))
+        np.ndarray(col.shape, col.dtype, buffer=block.buf)[:] = col
+        _blocks.append(block)
+        specs[key] = (block.name, col.dtype.str, len(col))
+    return specs
+
+def _attach(specs: Dict[str, Tuple[str, str, int]]):
+    """Pool initializer: map the shared columns as read-only views."""
+    for key, (name, dtype, length) in specs.items():
+        block = shared_memory.SharedMemory(name=name)
+        _blocks.append(block)
+        _columns[key] = np.ndarray((length,), np.dtype(dtype), buffer=block.buf)
+        _columns[key].flags.writeable = False
+
+def _evaluate(task: Tuple, columns: Optional[Dict[str, np.ndarray]] = None) -> Tuple:
+    """Backtest one parameter set on one walk-forward window."""
+    strategy_cls, params, (start, split, end), initial_capital, quantity = task
+    columns = _columns if columns is None else columns
+    engine = BacktestEngine(initial_capital, quantity)
+    train = engine.run_vectorized(strategy_cls(**params), {k: v[start:split] for k, v in columns.items()})
+    test = engine.run_vectorized(strategy_cls(**params), {k: v[split:end] for k, v in columns.items()})
+    return params, train, test
+
+def _rank(results: List[Tuple], rank_by: str) -> List[Dict]:
+    """Average train/test metrics per parameter set, best out-of-sample first."""
+    grouped: Dict[tuple, Dict] = {}
+    for params, train, test in results:
+        row = grouped.setdefault(tuple(params.items()), {"params": params, "train": [], "test": []})
+        row["train"].append(train[rank_by])
+        row["test"].append(test[rank_by])
+    table = [{"params": row["params"], "windows": len(row["test"]),
+              f"train_{rank_by}": float(np.mean(row["train"])),
+              f"test_{rank_by}": float(np.mean(row["test"]))} for row in grouped.values()]
+    return sorted(table, key=lambda r: r[f"test_{rank_by}"], reverse=True)
+
+def run_sweep(strategy_cls, param_grid: Dict[str, List], columns: Dict[str, np.ndarray],
+              train_size: int, test_size: int, start=None, end=None, step: Optional[int] = None,
+              max_workers: Optional[int] = None, rank_by: str = "total_return",
+              initial_capital: float = 100000.0, quantity: float = 10) -> List[Dict]:
+    """Walk-forward sweep of ``strategy_cls(**params)`` over a process pool.
+
+    Every (parameter set, window) pair is an independent task with its own
+    ``BacktestEngine``; bar columns are shared read-only between workers.
+    """
+    columns = _slice_range(columns, start, end)
+    n_bars = len(next(iter(columns.values()))) if columns else 0
+    windows = walk_forward_windows(n_bars, train_size, test_size, step)
+    tasks = [(strategy_cls, params, window, initial_capital, quantity)
+             for params in expand_grid(param_grid) for window in windows]
+    if max_workers == 1:
+        return _rank([_evaluate(task, columns) for task in tasks], rank_by)
+    workers = max_workers or os.cpu_count() or 1
+    specs = _share(columns)
+    try:
+        with ProcessPoolExecutor(workers, initializer=_attach, initargs=(specs,)) as pool:
+            results = list(pool.map(_evaluate, tasks, chunksize=max(1, len(tasks) // (4 * workers))))
+    finally:
+        while _blocks:
+            block = _blocks.pop()
+            block.close()
+            block.unlink()
+    return _rank(results, rank_by)
@@ -0,0 +1,36 @@
+"""Vectorized columnar backtest simulation."""
+from typing import Dict, List
+import numpy as np
+
+def to_columns(historical_data: List[Dict]) -> Dict[str, np.ndarray]:
+    """Load per-bar dicts into one NumPy column per numeric field."""
+    if not historical_data:
+        return {}
+    keys = [k for k, v in historical_data[0].items() if isinstance(v, (int, float))]
+    return {k: np.fromiter((bar[k] for bar in historical_data), dtype=np.float64,
+                           count=len(historical_data)) for k in keys}
+
+def price_column(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """Return the fill price column of a bar frame."""
+    return np.asarray(columns["close"] if "close" in columns else columns["price"], dtype=np.float64)
+
+def simulate(prices: np.ndarray, signals: np.ndarray, initial_capital: float,
+             quantity: float) -> Dict[str, np.ndarray]:
+    """Simulate fills, positions and the equity curve with array operations.
+
+    ``signals`` holds one code per bar: 1 buys ``quantity`` at that bar's price,
+    -1 sells it and 0 does nothing, matching the per-bar fill model.
+    """
+    fills = np.asarray(signals, dtype=np.float64) * quantity
+    position = np.cumsum(fills)
+    cash = initial_capital - np.cumsum(fills * prices)
+    return {"fills": fills, "position": position, "cash": cash,
+            "equity": cash + position * prices}
+
+def fill_records(prices: np.ndarray, fills: np.ndarray) -> np.ndarray:
+    """Pack non-zero fills into a compact structured trade array."""
+    idx = np.flatnonzero(fills)
+    trades = np.empty(len(idx), dtype=[("bar", np.int64), ("price", np.float64),
+                                       ("quantity", np.float64)])
+    trades["bar"], trades["price"], trades["quantity"] = idx, prices[idx], fills[idx]
+    return trades
@@ -0,0 +1,39 @@
+"""Simulated broker with fixed latency for benchmarking the order gateway."""
+import asyncio
+import itertools
+from typing import Dict, List, Optional
+from brokers.universal_adapter import BrokerType, UniversalBrokerAdapter
+
+class FakeBrokerAdapter(UniversalBrokerAdapter):
+    """Acknowledges every request after ``latency`` seconds and supports batch calls."""
+    _ids = itertools.count(1)
+    
+    def __init__(self, broker_type: BrokerType = BrokerType.PAPER, credentials: Optional[Dict] = None,
+                 latency: float = 0.005):
+        super().__init__(broker_type, credentials or {})
+        self.latency = latency
+        self.calls = self.connects = 0
+    
+    async def connect(self) -> bool:
+        self.connects += 1
+        return await super().connect()
+    
+    async def place_order(self, symbol: str, quantity: float, 
+                         order_type: str, price: Optional[float] = None, **kwargs) -> Dict:
+        return (await self.place_orders([{"symbol": symbol, "quantity": quantity, "order_type": order_type,
+                                          "price": price, **kwargs}]))[0]
+    
+    async def place_orders(self, orders: List[Dict]) -> List[Dict]:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return [{"order_id": f"{self.broker_type.value}_{next(self._ids)}", "symbol": o["symbol"],
+                 "quantity": o["quantity"], "type": o["order_type"], "price": o.get("price"),
+                 "status": "submitted"} for o in orders]
+    
+    async def cancel_order(self, order_id: str) -> bool:
+        return (await self.cancel_orders([order_id]))[0]
+    
+    async def cancel_orders(self, order_ids: List[str]) -> List[bool]:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return [True] * len(order_ids)
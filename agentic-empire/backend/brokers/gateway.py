@@ -0,0 +1,207 @@
+"""Pooled, rate-limited async order gateway in front of broker adapters."""
+import asyncio
+from collections import deque
+import inspect
+import time
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+import numpy as np
+from brokers.universal_adapter import BrokerType, UniversalBrokerAdapter, create_broker_adapter
+
+# Requests per second, burst size, largest batch call, pooled connections and
+# orders allowed in flight per broker. A batch call costs one request.
+BROKER_LIMITS = {
+    BrokerType.INTERACTIVE_BROKERS: {"rate": 50.0, "burst": 50, "max_batch": 1, "pool_size": 1,
+                                     "max_in_flight": 100},
+    BrokerType.TD_AMERITRADE: {"rate": 2.0, "burst": 10, "max_batch": 1, "pool_size": 2, "max_in_flight": 20},
+    BrokerType.COINBASE_PRO: {"rate": 15.0, "burst": 30, "max_batch": 100, "pool_size": 2,
+                              "max_in_flight": 200},
+    BrokerType.ALPACA: {"rate": 200 / 60.0, "burst": 20, "max_batch": 1, "pool_size": 2, "max_in_flight": 50},
+    # One paper adapter: each owns its own matching engine and order ids, so a pool would split the book.
+    BrokerType.PAPER: {"rate": 1e6, "burst": 1e6, "max_batch": 100, "pool_size": 1, "max_in_flight": 10000},
+}
+
+OPERATIONS = {"cancel": ("cancel_order", "cancel_orders"), "place": ("place_order", "place_orders")}
+
+def _accepted(method: Callable) -> Optional[frozenset]:
+    """Keyword names ``method`` accepts, or None when it takes ``**kwargs``."""
+    parameters = inspect.signature(method).parameters.values()
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters):
+        return None
+    return frozenset(p.name for p in parameters)
+
+class TokenBucket:
+    """Async token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate, self.capacity = rate, capacity
+        self.tokens, self.updated = float(capacity), time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, tokens: float = 1.0):
+        self._refill()
+        while self.tokens < tokens:
+            await asyncio.sleep((tokens - self.tokens) / self.rate)
+            self._refill()
+        self.tokens -= tokens
+
+    def refund(self, tokens: float = 1.0):
+        self.tokens = min(self.capacity, self.tokens + tokens)
+
+class BrokerLane:
+    """Connection pool, queues, limiter and statistics for one broker."""
+
+    def __init__(self, broker_type: BrokerType, limits: Dict):
+        self.broker_type, self.limits = broker_type, limits
+        self.queues: Dict[str, Deque[Tuple]] = {op: deque() for op in OPERATIONS}
+        self.ready = asyncio.Event()
+        self.bucket = TokenBucket(limits["rate"], limits["burst"])
+        self.in_flight = asyncio.Semaphore(limits["max_in_flight"])
+        self.pool: List[UniversalBrokerAdapter] = []
+        self.workers: List[asyncio.Task] = []
+        self.latency: Deque[float] = deque(maxlen=4096)
+        self.calls = self.batched_calls = self.requests = self.errors = self.waiting = 0
+
+    def depth(self) -> int:
+        return sum(len(queue) for queue in self.queues.values())
+
+    def stats(self) -> Dict:
+        latency = np.array(self.latency) * 1000.0
+        return {"queue_depth": self.depth(), "in_flight": self.waiting,
+                "connections": len(self.pool), "calls": self.calls, "batched_calls": self.batched_calls,
+                "requests": self.requests, "errors": self.errors,
+                "latency_ms": {"mean": float(latency.mean()), "p50": float(np.percentile(latency, 50)),
+                               "p99": float(np.percentile(latency, 99))} if len(latency) else {}}
+
+class OrderGateway:
+    """Routes order submits and cancels to brokers through persistent pooled connections.
+
+    Each broker gets ``pool_size`` adapters connected once, each drained by its
+    own worker. Workers wait for a rate-limit token before taking work, so
+    requests queued meanwhile are coalesced into one batch call (up to
+    ``max_batch``) when the adapter offers ``place_orders``/``cancel_orders``.
+    Cancels are always sent ahead of queued submits, and callers wait on the
+    ``max_in_flight`` cap once a broker is saturated.
+    """
+
+    def __init__(self, factory: Optional[Callable[[BrokerType], UniversalBrokerAdapter]] = None,
+                 limits: Optional[Dict[BrokerType, Dict]] = None,
+                 credentials: Optional[Dict[BrokerType, Dict]] = None):
+        credentials = credentials or {}
+        self.factory = factory or (lambda bt: create_broker_adapter(bt.name, credentials.get(bt, {})))
+        self.limits = {**BROKER_LIMITS, **(limits or {})}
+        self.lanes: Dict[BrokerType, BrokerLane] = {}
+        self._opening: Dict[BrokerType, asyncio.Future] = {}
+
+    async def place_order(self, broker_type: BrokerType, symbol: str, quantity: float, order_type: str,
+                          price: Optional[float] = None, **kwargs) -> Dict:
+        """Submit one order and wait for the broker's acknowledgement."""
+        return await self._enqueue(broker_type, "place", {"symbol": symbol, "quantity": quantity,
+                                                          "order_type": order_type, "price": price, **kwargs})
+
+    async def cancel_order(self, broker_type: BrokerType, order_id: str) -> bool:
+        """Cancel one order, ahead of any queued submits."""
+        return await self._enqueue(broker_type, "cancel", {"order_id": order_id})
+
+    def stats(self) -> Dict[str, Dict]:
+        """Queue depth, in-flight orders, call counts and latency per broker."""
+        return {bt.value: lane.stats() for bt, lane in self.lanes.items()}
+
+    async def close(self):
+        """Stop workers and disconnect every pooled adapter."""
+        for lane in self.lanes.values():
+            for worker in lane.workers:
+                worker.cancel()
+            await asyncio.gather(*lane.workers, return_exceptions=True)
+            for adapter in lane.pool:
+                await adapter.disconnect()
+        self.lanes.clear()
+        self._opening.clear()
+
+    async def _lane(self, broker_type: BrokerType) -> BrokerLane:
+        lane = self.lanes.get(broker_type)
+        if lane is not None:
+            return lane
+        opening = self._opening.get(broker_type)
+        if opening is None:
+            opening = self._opening[broker_type] = asyncio.ensure_future(self._open(broker_type))
+        try:
+            return await asyncio.shield(opening)
+        except Exception:
+            # A failed connect is retried by the next caller rather than cached.
+            if opening.done() and self._opening.get(broker_type) is opening:
+                del self._opening[broker_type]
+            raise
+
+    async def _open(self, broker_type: BrokerType) -> BrokerLane:
+        lane = BrokerLane(broker_type, self.limits[broker_type])
+        lane.pool = [self.factory(broker_type) for _ in range(lane.limits["pool_size"])]
+        await asyncio.gather(*(adapter.connect() for adapter in lane.pool))
+        lane.workers = [asyncio.create_task(self._worker(lane, adapter)) for adapter in lane.pool]
+        self.lanes[broker_type] = lane
+        return lane
+
+    async def _enqueue(self, broker_type: BrokerType, op: str, payload: Dict):
+        lane = await self._lane(broker_type)
+        async with lane.in_flight:
+            future = asyncio.get_running_loop().create_future()
+            lane.queues[op].append((payload, future))
+            lane.ready.set()
+            lane.waiting += 1
+            try:
+                return await future
+            finally:
+                lane.waiting -= 1
+
+    async def _worker(self, lane: BrokerLane, adapter: UniversalBrokerAdapter):
+        # Only pass an adapter's single-request method the keywords its signature takes.
+        accepted = {op: _accepted(getattr(adapter, single)) for op, (single, _) in OPERATIONS.items()}
+        while True:
+            if not lane.depth():
+                lane.ready.clear()
+                await lane.ready.wait()
+                continue
+            await lane.bucket.acquire()
+            op = "cancel" if lane.queues["cancel"] else "place"
+            queue = lane.queues[op]
+            if not queue:
+                lane.bucket.refund()
+                continue
+            single, batch = OPERATIONS[op]
+            batch_call = getattr(adapter, batch, None) if lane.limits["max_batch"] > 1 else None
+            size = lane.limits["max_batch"] if batch_call else 1
+            items = [queue.popleft() for _ in range(min(len(queue), size))]
+            started = time.perf_counter()
+            try:
+                if len(items) > 1:
+                    results = await batch_call([payload if op == "place" else payload["order_id"]
+                                                for payload, _ in items])
+                    lane.batched_calls += 1
+                else:
+                    payload, names = items[0][0], accepted[op]
+                    if names is not None:
+                        payload = {k: v for k, v in payload.items() if k in names}
+                    results = [await getattr(adapter, single)(**payload)]
+            except Exception as exc:
+                lane.errors += 1
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            finally:
+                lane.latency.append(time.perf_counter() - started)
+                lane.calls += 1
+                lane.requests += len(items)
+            for (_, future), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
+            for _, future in items[len(results):]:
+                if not future.done():
+                    future.set_exception(RuntimeError(
+                        f"{lane.broker_type.value} returned {len(results)} results for {len(items)} requests"))
+
+# Global instance
+order_gateway = OrderGateway()
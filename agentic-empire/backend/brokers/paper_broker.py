@@ -0,0 +1,53 @@
+"""Paper trading broker backed by the local matching engine."""
+import itertools
+from typing import Dict, Optional, Set
+from brokers.universal_adapter import BrokerType, UniversalBrokerAdapter
+from execution.matching_engine import MatchingEngine
+
+class PaperBrokerAdapter(UniversalBrokerAdapter):
+    """Broker stand-in that matches orders in process with price-time priority.
+
+    Positions and balance track only the account's own orders (those placed
+    through ``place_order``); other liquidity can be seeded straight into
+    ``engine``, as the rest of the market.
+    """
+    
+    def __init__(self, credentials: Optional[Dict] = None, initial_balance: float = 100000.0):
+        super().__init__(BrokerType.PAPER, credentials or {})
+        self.engine = MatchingEngine(on_fill=self._on_fill)
+        self._ids = itertools.count(1)
+        self.fills = []
+        self.positions: Dict[str, float] = {}
+        self.order_ids: Set[str] = set()
+        self.balance = initial_balance
+    
+    def _on_fill(self, fill: Dict):
+        if fill["order_id"] not in self.order_ids:
+            return
+        sign = 1.0 if fill["side"] == "buy" else -1.0
+        self.positions[fill["symbol"]] = self.positions.get(fill["symbol"], 0.0) + sign * fill["quantity"]
+        self.balance -= sign * fill["quantity"] * fill["price"]
+        self.fills.append(fill)
+    
+    async def place_order(self, symbol: str, quantity: float, 
+                         order_type: str, price: Optional[float] = None, side: str = "buy") -> Dict:
+        if not self.is_connected:
+            await self.connect()
+        order_id = f"PAPER{next(self._ids)}"
+        self.order_ids.add(order_id)
+        try:
+            result = self.engine.submit(symbol, side, quantity, order_type, price, order_id)
+        except ValueError:
+            self.order_ids.discard(order_id)
+            raise
+        return {"order_id": result["order_id"], "symbol": symbol, "quantity": quantity, "type": order_type,
+                "price": price, "side": side, "status": result["status"], "filled": result["filled"]}
+    
+    async def get_account_info(self) -> Dict:
+        return {"balance": self.balance, "buying_power": self.balance, "positions": await self.get_positions()}
+    
+    async def get_positions(self) -> list:
+        return [{"symbol": s, "quantity": q} for s, q in self.positions.items() if q]
+    
+    async def cancel_order(self, order_id: str) -> bool:
+        return self.engine.cancel(order_id)
@@ -7,6 +7,7 @@ class BrokerType(Enum):
     TD_AMERITRADE = "td"
     COINBASE_PRO = "coinbase"
     ALPACA = "alpaca"
+    PAPER = "paper"
 
 class UniversalBrokerAdapter:
     """Unified interface for multiple broker APIs."""
@@ -38,4 +39,7 @@ class UniversalBrokerAdapter:
         self.is_connected = False
 
 def create_broker_adapter(broker_type: str, credentials: Dict) -> UniversalBrokerAdapter:
+    if BrokerType[broker_type.upper()] is BrokerType.PAPER:
+        from brokers.paper_broker import PaperBrokerAdapter
+        return PaperBrokerAdapter(credentials)
     return UniversalBrokerAdapter(BrokerType[broker_type.upper()], credentials)
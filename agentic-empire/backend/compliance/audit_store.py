@@ -0,0 +1,160 @@
+"""Tiered trade history for audits: an in-memory hot window over sealed columnar segments.
+
+Trades are buffered as columns in memory. Once a calendar day (UTC) falls out
+of the hot window, or the buffer reaches ``max_hot_rows``, its rows are sealed
+into a compressed ``.npz`` segment under ``root/<day>/``, with symbols
+dictionary-encoded. ``manifest.jsonl`` gets one line per segment with its
+timestamp min/max and symbol set, so a query opens only segments that can match.
+"""
+from datetime import datetime, timezone
+import json
+import math
+import os
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from core.config import AUDIT_STORE_DIR
+
+SIDE_CODES = {"buy": 1, "sell": -1}
+SIDE_NAMES = {1: "buy", -1: "sell", 0: ""}
+NUMERIC = ("timestamp", "quantity", "price", "pnl")
+FLAGS = {"day_trade": 1, "wash_sale": 2}
+MANIFEST = "manifest.jsonl"
+
+def _day(timestamp: float) -> int:
+    """UTC day number of an epoch timestamp."""
+    return int(timestamp // 86400.0)
+
+class AuditStore:
+    """Append-only trade history with day-partitioned compressed segments."""
+
+    def __init__(self, root: str = AUDIT_STORE_DIR, hot_days: int = 1, max_hot_rows: int = 500_000):
+        self.root, self.hot_days, self.max_hot_rows = root, hot_days, max_hot_rows
+        os.makedirs(root, exist_ok=True)
+        path = os.path.join(root, MANIFEST)
+        self.segments: List[Dict] = []
+        if os.path.exists(path):
+            with open(path) as f:
+                # A torn last line from a crash mid-append is ignored.
+                for line in f:
+                    try:
+                        self.segments.append(json.loads(line))
+                    except ValueError:
+                        break
+        self.hot: Dict[str, list] = {name: [] for name in NUMERIC + ("symbol", "side", "flags")}
+        self.segments_scanned = 0
+
+    def __len__(self) -> int:
+        return sum(segment["rows"] for segment in self.segments) + len(self.hot["timestamp"])
+
+    def append(self, trade: Dict, timestamp: float):
+        """Buffer one trade; ``timestamp`` is epoch seconds and must not decrease."""
+        if self.hot["timestamp"] and _day(timestamp) != _day(self.hot["timestamp"][-1]):
+            self._seal_before(timestamp - self.hot_days * 86400.0)
+        hot = self.hot
+        hot["timestamp"].append(timestamp)
+        hot["quantity"].append(float(trade.get("quantity", math.nan)))
+        hot["price"].append(float(trade.get("price") if trade.get("price") is not None else math.nan))
+        hot["pnl"].append(float(trade.get("pnl", math.nan)))
+        hot["symbol"].append(trade.get("symbol", ""))
+        hot["side"].append(SIDE_CODES.get(trade.get("side"), 0))
+        hot["flags"].append(sum(bit for name, bit in FLAGS.items() if trade.get(name)))
+        if len(hot["timestamp"]) >= self.max_hot_rows:
+            self.seal()
+
+    def _seal_before(self, cutoff: float):
+        """Seal every whole hot day that ended before ``cutoff``."""
+        times, cutoff_day, end = self.hot["timestamp"], _day(cutoff), 0
+        while end < len(times) and _day(times[end]) < cutoff_day:
+            end += 1
+        if end:
+            self._seal_rows(end)
+
+    def seal(self):
+        """Seal the whole hot window."""
+        self._seal_rows(len(self.hot["timestamp"]))
+
+    def _seal_rows(self, end: int):
+        columns = {name: values[:end] for name, values in self.hot.items()}
+        remainder = {name: values[end:] for name, values in self.hot.items()}
+        days = [_day(t) for t in columns["timestamp"]]
+        start = 0
+        while start < end:
+            stop = start
+            while stop < end and days[stop] == days[start]:
+                stop += 1
+            self._write_segment(days[start], {name: values[start:stop] for name, values in columns.items()})
+            start = stop
+        self.hot = remainder
+
+    def _write_segment(self, day_number: int, columns: Dict[str, list]):
+        symbols, codes = np.unique(np.array(columns["symbol"], dtype=str), return_inverse=True)
+        day = datetime.fromtimestamp(day_number * 86400.0, timezone.utc).strftime("%Y-%m-%d")
+        directory = os.path.join(self.root, day)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(day, f"{len(os.listdir(directory)):06d}.npz")
+        arrays = {name: np.array(columns[name], dtype=np.float64) for name in NUMERIC}
+        np.savez_compressed(os.path.join(self.root, path), symbols=symbols,
+                            symbol=codes.astype(np.int32 if len(symbols) > 32767 else np.int16),
+                            side=np.array(columns["side"], dtype=np.int8),
+                            flags=np.array(columns["flags"], dtype=np.int8), **arrays)
+        timestamps = arrays["timestamp"]
+        segment = {"path": path, "day": day, "rows": len(timestamps), "min_ts": float(timestamps.min()),
+                   "max_ts": float(timestamps.max()), "symbols": symbols.tolist()}
+        with open(os.path.join(self.root, MANIFEST), "a") as f:
+            f.write(json.dumps(segment) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.segments.append(segment)
+
+    def query(self, symbol: Optional[str] = None, start: Optional[float] = None,
+              end: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """Columns of trades for ``symbol`` (or all) with ``start <= timestamp <= end``, oldest first."""
+        low = -math.inf if start is None else start
+        high = math.inf if end is None else end
+        parts = [self._scan_segment(segment, symbol, low, high) for segment in self.segments
+                 if segment["max_ts"] >= low and segment["min_ts"] <= high
+                 and (symbol is None or symbol in segment["symbols"])]
+        parts.append(self._scan_hot(symbol, low, high))
+        result = {name: np.concatenate([part[name] for part in parts]) for name in parts[-1]}
+        order = np.argsort(result["timestamp"], kind="stable")
+        return {name: column[order] for name, column in result.items()}
+
+    def _scan_segment(self, segment: Dict, symbol: Optional[str], low: float, high: float) -> Dict:
+        self.segments_scanned += 1
+        with np.load(os.path.join(self.root, segment["path"])) as data:
+            timestamps = data["timestamp"]
+            mask = (timestamps >= low) & (timestamps <= high)
+            symbols = data["symbols"]
+            codes = data["symbol"]
+            if symbol is not None:
+                mask &= codes == int(np.searchsorted(symbols, symbol))
+            return self._columns({name: data[name][mask] for name in NUMERIC + ("side", "flags")},
+                                 symbols[codes[mask]])
+
+    def _scan_hot(self, symbol: Optional[str], low: float, high: float) -> Dict:
+        hot = self.hot
+        timestamps = np.array(hot["timestamp"], dtype=np.float64)
+        symbols = np.array(hot["symbol"], dtype=str)
+        mask = (timestamps >= low) & (timestamps <= high)
+        if symbol is not None:
+            mask &= symbols == symbol
+        columns = {name: np.array(hot[name], dtype=np.float64)[mask] for name in NUMERIC}
+        columns["side"] = np.array(hot["side"], dtype=np.int8)[mask]
+        columns["flags"] = np.array(hot["flags"], dtype=np.int8)[mask]
+        return self._columns(columns, symbols[mask])
+
+    @staticmethod
+    def _columns(columns: Dict[str, np.ndarray], symbols: np.ndarray) -> Dict[str, np.ndarray]:
+        columns["symbol"] = symbols.astype(object)
+        return columns
+
+    def records(self, symbol: Optional[str] = None, start: Optional[float] = None,
+                end: Optional[float] = None) -> Iterable[Dict]:
+        """``query`` results as trade dicts."""
+        columns = self.query(symbol, start, end)
+        for i in range(len(columns["timestamp"])):
+            flags = int(columns["flags"][i])
+            yield {"symbol": columns["symbol"][i], "side": SIDE_NAMES[int(columns["side"][i])],
+                   "quantity": float(columns["quantity"][i]), "price": float(columns["price"][i]),
+                   "pnl": float(columns["pnl"][i]), "timestamp": float(columns["timestamp"][i]),
+                   **{name: bool(flags & bit) for name, bit in FLAGS.items()}}
@@ -1,23 +1,35 @@
 """Compliance checking for SEC/FINRA regulations."""
-from typing import Dict, List
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from datetime import datetime
+from compliance.audit_store import AuditStore
+from compliance.rule_engine import DEFAULT_ACCOUNT, RuleEngine
+from compliance.trade_index import DAY_SECONDS, LOSS_SALE, WASH_SALE_DAYS, TradeIndex
 
 class ComplianceOfficer:
-    """Automated compliance checks for trading regulations."""
+    """Automated compliance checks for trading regulations.
+
+    ``trade_history`` is a rolling ``TradeIndex``: trades older than the
+    wash-sale lookback are evicted as new ones arrive. Pre-trade checks run
+    through ``rules``, which PDT status and loss sales keep up to date. With
+    an ``AuditStore`` attached, every recorded trade is also kept for audits.
+    """
+    
+    def __init__(self, rules: Optional[RuleEngine] = None, audit: Optional[AuditStore] = None):
+        self.trade_history = TradeIndex()
+        self.rules = rules or RuleEngine()
+        self.audit = audit
     
-    def __init__(self):
-        self.trade_history = []
-        self.day_trades_count = 0
-        self.last_reset_date = datetime.now().date()
+    @property
+    def day_trades_count(self) -> int:
+        """Day trades in the rolling five-business-day PDT window."""
+        return self.trade_history.day_trades(datetime.now().timestamp())
     
     def check_pattern_day_trader(self, account_value: float) -> Dict:
         """Detect Pattern Day Trader status per FINRA rules."""
-        if datetime.now().date() > self.last_reset_date + timedelta(days=5):
-            self.day_trades_count = 0
-            self.last_reset_date = datetime.now().date()
-        
-        is_pdt = self.day_trades_count >= 4 and account_value < 25000
-        return {"is_pdt": is_pdt, "day_trades": self.day_trades_count, 
+        day_trades = self.day_trades_count
+        is_pdt = day_trades >= 4 and account_value < 25000
+        self.rules.set_pdt_restricted(DEFAULT_ACCOUNT, is_pdt)
+        return {"is_pdt": is_pdt, "day_trades": day_trades, 
                 "min_equity": 25000 if is_pdt else 0}
     
     def check_wash_sale(self, symbol: str, sell_date: datetime, 
@@ -26,24 +38,63 @@ class ComplianceOfficer:
         days_diff = abs((sell_date - buy_date).days)
         return days_diff <= 30
     
-    def validate_trade(self, symbol: str, quantity: float, side: str) -> Dict:
+    def has_wash_sale(self, symbol: str, sell_date: datetime) -> bool:
+        """Check for recorded buys of ``symbol`` within 30 days either side of a sale.
+
+        Trades are recorded in time order, so buys after the sale are caught
+        when they are recorded (see ``record_trade``).
+        """
+        return self.trade_history.trades_within(symbol, "buy", sell_date.timestamp()) > 0
+    
+    def validate_trade(self, symbol: str, quantity: float, side: str, price: Optional[float] = None,
+                       account: str = DEFAULT_ACCOUNT) -> Dict:
         """Pre-trade compliance validation."""
-        violations = []
-        if quantity <= 0:
-            violations.append("Invalid quantity")
-        if side not in ["buy", "sell"]:
-            violations.append("Invalid side")
-        return {"approved": len(violations) == 0, "violations": violations}
-    
-    def record_trade(self, trade: Dict):
-        """Record trade for compliance tracking."""
-        self.trade_history.append({**trade, "timestamp": datetime.now().isoformat()})
-        if self._is_day_trade(trade):
-            self.day_trades_count += 1
-    
-    def _is_day_trade(self, trade: Dict) -> bool:
-        """Determine if trade qualifies as day trade."""
-        return True  # Simplified logic
+        return self.rules.check(symbol, quantity, side, price, account)
+    
+    def record_trade(self, trade: Dict, timestamp: Optional[datetime] = None) -> Dict:
+        """Record trade for compliance tracking.
+
+        A sale with a negative ``pnl`` is flagged ``wash_sale`` when the same
+        symbol was bought in the previous 30 days, and locks further buys of
+        it for the next 30. A buy is flagged when the symbol was sold at a loss
+        in the previous 30 days.
+        """
+        timestamp = timestamp or datetime.now()
+        record = {**trade, "timestamp": timestamp.isoformat()}
+        day_trade = self._is_day_trade(trade, timestamp)
+        if day_trade:
+            record["day_trade"] = True
+        side = trade.get("side", "buy")
+        loss_sale = side == "sell" and trade.get("pnl", 0.0) < 0
+        if loss_sale and self.has_wash_sale(trade["symbol"], timestamp):
+            record["wash_sale"] = True
+        if side == "buy" and self.trade_history.trades_within(trade["symbol"], LOSS_SALE, timestamp.timestamp()):
+            record["wash_sale"] = True
+        if loss_sale:
+            self.rules.lock_wash_sale(trade["symbol"], timestamp.timestamp() + WASH_SALE_DAYS * DAY_SECONDS)
+        self.trade_history.add(trade["symbol"], side, timestamp.timestamp(), record, day_trade, loss_sale)
+        if self.audit is not None:
+            self.audit.append(record, timestamp.timestamp())
+        return record
+    
+    def audit_trail(self, symbol: Optional[str] = None, start: Optional[datetime] = None,
+                    end: Optional[datetime] = None) -> List[Dict]:
+        """Recorded trades from the audit store, optionally for one symbol and date range.
+
+        Empty when no ``AuditStore`` is attached.
+        """
+        if self.audit is None:
+            return []
+        return list(self.audit.records(symbol, start and start.timestamp(), end and end.timestamp()))
+    
+    def _is_day_trade(self, trade: Dict, timestamp: datetime) -> bool:
+        """Determine if trade qualifies as day trade.
+
+        It does when it closes a position opened the same day, i.e. the symbol
+        traded on the opposite side earlier that day.
+        """
+        opposite = "sell" if trade.get("side", "buy") == "buy" else "buy"
+        return self.trade_history.traded_today(trade["symbol"], opposite, timestamp.timestamp())
 
 # Global instance  
 compliance_officer = ComplianceOfficer()
@@ -0,0 +1,165 @@
+"""Compiled pre-trade compliance rules with atomic reloads."""
+import math
+import threading
+import time
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional
+import numpy as np
+
+DEFAULT_ACCOUNT = "default"
+SIDES = frozenset(("buy", "sell"))
+
+class CompiledRules:
+    """Immutable rule snapshot: hash sets for membership rules and dicts for limits.
+
+    ``wash_sale_locks`` maps a symbol to the epoch time its buy lock expires;
+    PDT-restricted accounts may not open new long positions (buy).
+    """
+    __slots__ = ("version", "restricted", "max_quantity", "max_notional", "account_max_notional",
+                 "default_max_quantity", "default_max_notional", "pdt_restricted", "wash_sale_locks")
+
+    def __init__(self, version: int = 0, restricted: Iterable[str] = (),
+                 max_quantity: Optional[Dict[str, float]] = None, max_notional: Optional[Dict[str, float]] = None,
+                 account_max_notional: Optional[Dict[str, float]] = None,
+                 default_max_quantity: float = math.inf, default_max_notional: float = math.inf,
+                 pdt_restricted: Iterable[str] = (), wash_sale_locks: Optional[Dict[str, float]] = None):
+        self.version = version
+        self.restricted: FrozenSet[str] = frozenset(restricted)
+        self.max_quantity = dict(max_quantity or {})
+        self.max_notional = dict(max_notional or {})
+        self.account_max_notional = dict(account_max_notional or {})
+        self.default_max_quantity, self.default_max_notional = default_max_quantity, default_max_notional
+        self.pdt_restricted: FrozenSet[str] = frozenset(pdt_restricted)
+        self.wash_sale_locks = dict(wash_sale_locks or {})
+
+    def replace(self, **changes) -> "CompiledRules":
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes, version=self.version + 1)
+        return CompiledRules(**fields)
+
+def compile_rules(config: Dict, version: int = 0) -> CompiledRules:
+    """Build a snapshot from a config of ``restricted_symbols``, ``symbol_limits``
+    (symbol -> max_quantity/max_notional), ``account_limits`` (account ->
+    max_notional), ``default_max_quantity``, ``default_max_notional``,
+    ``pdt_restricted_accounts`` and ``wash_sale_locks`` (symbol -> expiry).
+    """
+    symbol_limits = config.get("symbol_limits", {})
+    return CompiledRules(
+        version=version, restricted=config.get("restricted_symbols", ()),
+        max_quantity={s: l["max_quantity"] for s, l in symbol_limits.items() if "max_quantity" in l},
+        max_notional={s: l["max_notional"] for s, l in symbol_limits.items() if "max_notional" in l},
+        account_max_notional={a: l["max_notional"] for a, l in config.get("account_limits", {}).items()},
+        default_max_quantity=config.get("default_max_quantity", math.inf),
+        default_max_notional=config.get("default_max_notional", math.inf),
+        pdt_restricted=config.get("pdt_restricted_accounts", ()),
+        wash_sale_locks=config.get("wash_sale_locks", {}))
+
+class RuleEngine:
+    """Pre-trade checks against the current ``CompiledRules`` snapshot.
+
+    Checks read ``self.rules`` once and never lock, so a reload or a PDT or
+    wash-sale state change, which builds a new snapshot and swaps the reference
+    under a writer lock, never stalls order flow.
+    """
+
+    def __init__(self, config: Optional[Dict] = None):
+        self.rules = compile_rules(config or {})
+        self._write_lock = threading.Lock()
+
+    def load(self, config: Dict) -> int:
+        """Compile ``config`` and swap it in; returns the new version."""
+        with self._write_lock:
+            rules = compile_rules(config, self.rules.version + 1)
+            # Live state is not part of the static config and survives reloads.
+            rules.pdt_restricted |= self.rules.pdt_restricted
+            rules.wash_sale_locks = {**self.rules.wash_sale_locks, **rules.wash_sale_locks}
+            self.rules = rules
+        return rules.version
+
+    def _update(self, changes: Callable[[CompiledRules], Dict]):
+        """Swap in a snapshot with the fields ``changes`` derives from the current one."""
+        with self._write_lock:
+            self.rules = self.rules.replace(**changes(self.rules))
+
+    def set_pdt_restricted(self, account: str, restricted: bool):
+        if (account in self.rules.pdt_restricted) != restricted:
+            self._update(lambda rules: {"pdt_restricted": rules.pdt_restricted | {account} if restricted
+                                        else rules.pdt_restricted - {account}})
+
+    def lock_wash_sale(self, symbol: str, until: float):
+        """Block buys of ``symbol`` until epoch ``until``, dropping locks that have expired."""
+        def changes(rules: CompiledRules) -> Dict:
+            now = time.time()
+            locks = {s: t for s, t in rules.wash_sale_locks.items() if t > now}
+            locks[symbol] = max(until, locks.get(symbol, until))
+            return {"wash_sale_locks": locks}
+        self._update(changes)
+
+    def allows(self, symbol: str, quantity: float, side: str, price: Optional[float] = None,
+               account: str = DEFAULT_ACCOUNT) -> bool:
+        """Allocation-free pass/fail check for the order path."""
+        rules = self.rules
+        if quantity <= 0 or side not in SIDES or symbol in rules.restricted:
+            return False
+        if quantity > rules.max_quantity.get(symbol, rules.default_max_quantity):
+            return False
+        if price is not None:
+            notional = quantity * price
+            if (notional > rules.max_notional.get(symbol, rules.default_max_notional)
+                    or notional > rules.account_max_notional.get(account, math.inf)):
+                return False
+        if side == "buy":
+            if account in rules.pdt_restricted:
+                return False
+            if symbol in rules.wash_sale_locks and time.time() < rules.wash_sale_locks[symbol]:
+                return False
+        return True
+
+    def check(self, symbol: str, quantity: float, side: str, price: Optional[float] = None,
+              account: str = DEFAULT_ACCOUNT) -> Dict:
+        """Run every rule and report each violation."""
+        rules, violations = self.rules, []
+        if quantity <= 0:
+            violations.append("Invalid quantity")
+        if side not in SIDES:
+            violations.append("Invalid side")
+        if symbol in rules.restricted:
+            violations.append("Restricted symbol")
+        if quantity > rules.max_quantity.get(symbol, rules.default_max_quantity):
+            violations.append("Quantity limit exceeded")
+        if price is not None:
+            notional = quantity * price
+            if notional > rules.max_notional.get(symbol, rules.default_max_notional):
+                violations.append("Notional limit exceeded")
+            if notional > rules.account_max_notional.get(account, math.inf):
+                violations.append("Account notional limit exceeded")
+        if side == "buy" and account in rules.pdt_restricted:
+            violations.append("Pattern day trader restriction")
+        if side == "buy" and time.time() < rules.wash_sale_locks.get(symbol, -math.inf):
+            violations.append("Wash sale lock")
+        return {"approved": len(violations) == 0, "violations": violations}
+
+    def check_batch(self, symbols: List[str], quantities, sides: List[str], prices=None,
+                    account: str = DEFAULT_ACCOUNT) -> np.ndarray:
+        """Vectorized ``allows`` for a basket; returns one bool per order (NaN price means none)."""
+        rules = self.rules
+        quantities = np.asarray(quantities, dtype=float)
+        buys = np.array([side == "buy" for side in sides], dtype=bool)
+        sells = np.array([side == "sell" for side in sides], dtype=bool)
+        ok = (quantities > 0) & (buys | sells)
+        if rules.restricted:
+            ok &= ~np.array([symbol in rules.restricted for symbol in symbols], dtype=bool)
+        limits = rules.max_quantity
+        ok &= quantities <= (np.array([limits.get(s, rules.default_max_quantity) for s in symbols])
+                             if limits else rules.default_max_quantity)
+        if prices is not None:
+            notional = quantities * np.asarray(prices, dtype=float)
+            limits = rules.max_notional
+            ok &= ~(notional > (np.array([limits.get(s, rules.default_max_notional) for s in symbols])
+                                if limits else rules.default_max_notional))
+            ok &= ~(notional > rules.account_max_notional.get(account, math.inf))
+        if account in rules.pdt_restricted:
+            ok &= ~buys
+        if rules.wash_sale_locks:
+            now, locks = time.time(), rules.wash_sale_locks
+            ok &= ~(buys & np.array([now < locks.get(s, -math.inf) for s in symbols], dtype=bool))
+        return ok
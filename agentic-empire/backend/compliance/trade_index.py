@@ -0,0 +1,118 @@
+"""Rolling, per-symbol time-ordered trade indexes for PDT and wash-sale checks."""
+from bisect import bisect_left, bisect_right
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Tuple
+
+DAY_SECONDS = 86400.0
+WASH_SALE_DAYS = 30
+PDT_BUSINESS_DAYS = 5
+LOSS_SALE = "loss_sale"
+
+def business_day(timestamp: float) -> int:
+    """Monday-to-Friday day number of a timestamp; weekends count as the next Monday.
+
+    Exchange holidays are not excluded.
+    """
+    ordinal = datetime.fromtimestamp(timestamp).toordinal() - 1
+    weeks, weekday = divmod(ordinal, 7)
+    return weeks * 5 + min(weekday, 5)
+
+class TradeSeries:
+    """Trade times of one symbol and side, oldest first, with a lazily compacted head."""
+    __slots__ = ("times", "start")
+
+    def __init__(self):
+        self.times: List[float] = []
+        self.start = 0
+
+    def __len__(self) -> int:
+        return len(self.times) - self.start
+
+    def pop_oldest(self):
+        self.start += 1
+        if self.start > 64 and self.start * 2 > len(self.times):
+            del self.times[:self.start]
+            self.start = 0
+
+    def count(self, low: float, high: float) -> int:
+        """Trades with ``low <= time <= high``, by binary search."""
+        return (bisect_right(self.times, high, self.start)
+                - bisect_left(self.times, low, self.start))
+
+class TradeIndex:
+    """Trades kept for the longest compliance lookback, indexed by symbol and side.
+
+    Trades must arrive in time order (an earlier timestamp is recorded at the
+    latest one seen). Each trade is also queued globally, so anything older than
+    ``retention_days`` is evicted in arrival order with O(1) amortized work.
+    Loss-making sales are also indexed under the ``LOSS_SALE`` side. Day trades
+    are kept as a queue of business-day numbers, trimmed to the rolling PDT
+    window as trades arrive.
+    """
+
+    def __init__(self, retention_days: float = WASH_SALE_DAYS + 1):
+        self.retention = retention_days * DAY_SECONDS
+        self.series: Dict[Tuple[str, str], TradeSeries] = {}
+        self.queue: Deque[Tuple[float, Tuple[TradeSeries, ...], Dict]] = deque()
+        self.day_trade_days: Deque[int] = deque()
+        self.latest = float("-inf")
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def __iter__(self):
+        return (trade for _, _, trade in self.queue)
+
+    def _series(self, symbol: str, side: str) -> TradeSeries:
+        series = self.series.get((symbol, side))
+        if series is None:
+            series = self.series[(symbol, side)] = TradeSeries()
+        return series
+
+    def add(self, symbol: str, side: str, timestamp: float, trade: Dict, day_trade: bool = False,
+            loss_sale: bool = False):
+        """Index one trade, counting it towards PDT if ``day_trade``."""
+        timestamp = max(timestamp, self.latest)
+        self.latest = timestamp
+        self.evict(timestamp)
+        series = (self._series(symbol, side),) + ((self._series(symbol, LOSS_SALE),) if loss_sale else ())
+        for each in series:
+            each.times.append(timestamp)
+        self.queue.append((timestamp, series, trade))
+        if day_trade:
+            self.day_trade_days.append(business_day(timestamp))
+
+    def evict(self, now: float):
+        """Drop trades older than the retention window and day trades outside the PDT window."""
+        horizon, queue = now - self.retention, self.queue
+        while queue and queue[0][0] < horizon:
+            for series in queue.popleft()[1]:
+                series.pop_oldest()
+        self._trim_day_trades(now)
+
+    def _trim_day_trades(self, now: float):
+        oldest, days = business_day(now) - PDT_BUSINESS_DAYS + 1, self.day_trade_days
+        while days and days[0] < oldest:
+            days.popleft()
+
+    def traded_today(self, symbol: str, side: str, timestamp: float) -> bool:
+        """Whether ``symbol`` traded on ``side`` earlier on the calendar day of ``timestamp``."""
+        series = self.series.get((symbol, side))
+        if not series:
+            return False
+        midnight = datetime.fromtimestamp(timestamp).replace(hour=0, minute=0, second=0, microsecond=0)
+        return series.count(midnight.timestamp(), timestamp) > 0
+
+    def day_trades(self, now: float) -> int:
+        """Day trades in the rolling window of the last ``PDT_BUSINESS_DAYS`` business days."""
+        self._trim_day_trades(now)
+        return len(self.day_trade_days)
+
+    def trades_within(self, symbol: str, side: str, timestamp: float,
+                      days: float = WASH_SALE_DAYS) -> int:
+        """Number of ``side`` trades of ``symbol`` within ``days`` either side of ``timestamp``."""
+        series = self.series.get((symbol, side))
+        if not series:
+            return 0
+        return series.count(timestamp - days * DAY_SECONDS, timestamp + days * DAY_SECONDS)
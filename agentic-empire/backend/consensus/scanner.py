@@ -0,0 +1,79 @@
+"""Universe-wide consensus scanning with bounded concurrency."""
+import asyncio
+from collections import OrderedDict
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Tuple, Union
+from consensus.validation_pipeline import ValidationPipeline
+
+TIMEFRAME_SECONDS = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600, "4h": 14400, "1d": 86400}
+
+class SignalCache:
+    """Size-bounded LRU cache of agent signals keyed by (agent, symbol, bar)."""
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Tuple, List[Dict]]" = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key: Tuple):
+        signals = self.entries.get(key)
+        if signals is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return signals
+
+    def put(self, key: Tuple, signals: List[Dict]):
+        self.entries[key] = signals
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+class ConsensusScanner:
+    """Runs ``ValidationPipeline`` consensus across a watchlist every cycle.
+
+    At most ``concurrency`` symbols are in flight at once. Agent signals are
+    cached per bar of the agent's own ``timeframe``, so a 4h agent is queried
+    once per 4h bar however often the universe is rescanned.
+    """
+
+    def __init__(self, pipeline: ValidationPipeline, concurrency: int = 32, cache_size: int = 100000,
+                 agent_timeout: float = 1.0, deadline: float = 2.0):
+        self.pipeline = pipeline
+        self.concurrency = concurrency
+        self.cache = SignalCache(cache_size)
+        self.agent_timeout, self.deadline = agent_timeout, deadline
+
+    def _bar_key(self, agent, bar_time: float) -> float:
+        """Floor a bar timestamp to the start of the agent's own timeframe bar."""
+        period = TIMEFRAME_SECONDS.get(getattr(agent, "timeframe", None))
+        return bar_time // period * period if period else bar_time
+
+    async def _cached_signals(self, agent, symbol: str, bar_time: float) -> List[Dict]:
+        key = (id(agent), symbol, self._bar_key(agent, bar_time))
+        signals = self.cache.get(key)
+        if signals is None:
+            signals = await agent.generate_signals(symbol)
+            self.cache.put(key, signals)
+        return signals
+
+    async def scan(self, symbols: List[str],
+                   bar_time: Union[float, datetime, Dict[str, float]]) -> AsyncIterator[Tuple[str, Dict]]:
+        """Yield (symbol, consensus) pairs in completion order.
+
+        ``bar_time`` is the current bar's epoch seconds (or datetime), either
+        shared by the universe or given per symbol.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(symbol: str) -> Tuple[str, Dict]:
+            when = bar_time[symbol] if isinstance(bar_time, dict) else bar_time
+            when = when.timestamp() if isinstance(when, datetime) else when
+            fetch = lambda agent, sym: self._cached_signals(agent, sym, when)
+            async with semaphore:
+                return symbol, await self.pipeline.get_consensus_concurrent(
+                    symbol, self.agent_timeout, self.deadline, fetch=fetch)
+
+        for finished in asyncio.as_completed([run(symbol) for symbol in symbols]):
+            yield await finished
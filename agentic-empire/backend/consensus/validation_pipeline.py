@@ -1,5 +1,8 @@
 """Multi-agent consensus validation pipeline."""
-from typing import List, Dict
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Dict, Optional, Tuple
+import numpy as np
 
 class ValidationPipeline:
     """Coordinates multiple trading agents for consensus decisions."""
@@ -19,6 +22,67 @@ class ValidationPipeline:
         consensus = self._calculate_consensus(all_signals)
         return consensus
     
+    async def get_consensus_concurrent(self, symbol: str, agent_timeout: float = 1.0, deadline: float = 2.0,
+                                       fetch: Optional[Callable[..., Awaitable[List[Dict]]]] = None) -> Dict:
+        """Query all agents at once and build consensus from whatever arrives in time.
+
+        Each agent gets ``agent_timeout`` seconds and the whole round ``deadline``
+        seconds; late or failing agents are left out of a partial consensus. Votes
+        are weighted by signal confidence times the agent's track record, and
+        ``agents`` reports each agent's status and latency. ``fetch(agent, symbol)``
+        replaces ``agent.generate_signals(symbol)``, e.g. to serve cached signals.
+        """
+        tasks = [asyncio.create_task(self._timed_signals(agent, symbol, agent_timeout, fetch))
+                 for agent in self.agents]
+        done = (await asyncio.wait(tasks, timeout=deadline))[0] if tasks else set()
+        weighted, report = [], {}
+        for index, (agent, task) in enumerate(zip(self.agents, tasks)):
+            name = getattr(agent, "role", type(agent).__name__)
+            name = name if name not in report else f"{name}#{index}"
+            if task not in done:
+                task.cancel()
+                report[name] = {"status": "timeout", "latency": deadline}
+                continue
+            status, latency, signals = task.result()
+            report[name] = {"status": status, "latency": latency}
+            weight = self._track_record(agent)
+            weighted.extend((signal, weight * signal.get("confidence", 1.0)) for signal in signals)
+        consensus = self._calculate_weighted_consensus(weighted)
+        consensus["agents"] = report
+        consensus["partial"] = any(r["status"] != "ok" for r in report.values())
+        return consensus
+    
+    async def _timed_signals(self, agent, symbol: str, timeout: float,
+                             fetch=None) -> Tuple[str, float, List[Dict]]:
+        """Fetch one agent's signals, recording latency, timeout or failure."""
+        started = time.perf_counter()
+        pending = fetch(agent, symbol) if fetch else agent.generate_signals(symbol)
+        try:
+            signals = await asyncio.wait_for(pending, timeout)
+            return "ok", time.perf_counter() - started, signals
+        except asyncio.TimeoutError:
+            return "timeout", time.perf_counter() - started, []
+        except Exception:
+            return "error", time.perf_counter() - started, []
+    
+    def _track_record(self, agent) -> float:
+        """Agent win rate with one prior win and loss, so new agents weigh 0.5."""
+        performance = getattr(agent, "performance", None) or {}
+        return (performance.get("wins", 0) + 1) / (performance.get("trades", 0) + 2)
+    
+    def _calculate_weighted_consensus(self, weighted: List[Tuple[Dict, float]]) -> Dict:
+        """Calculate consensus from (signal, weight) pairs."""
+        total = sum(weight for _, weight in weighted)
+        if not weighted or total <= 0:
+            return {"action": "hold", "confidence": 0.0, "agents_count": len(weighted)}
+        buy_pct = sum(w for s, w in weighted if s.get("action") == "buy") / total
+        sell_pct = sum(w for s, w in weighted if s.get("action") == "sell") / total
+        if buy_pct >= self.min_consensus_threshold:
+            return {"action": "buy", "confidence": buy_pct, "agents_count": len(weighted)}
+        elif sell_pct >= self.min_consensus_threshold:
+            return {"action": "sell", "confidence": sell_pct, "agents_count": len(weighted)}
+        return {"action": "hold", "confidence": max(buy_pct, sell_pct), "agents_count": len(weighted)}
+    
     def _calculate_consensus(self, signals: List[Dict]) -> Dict:
         """Calculate consensus from multiple agent signals."""
         if not signals:
@@ -38,6 +102,22 @@ class ValidationPipeline:
         else:
             return {"action": "hold", "confidence": max(buy_pct, sell_pct), "agents_count": total_votes}
     
+    def calculate_consensus_batch(self, votes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized ``_calculate_consensus`` over stacked agent votes.
+
+        ``votes`` has one leading row per agent holding 1 (buy), -1 (sell) or 0 (no
+        signal); returns the consensus action codes and confidences per cell.
+        """
+        total = np.count_nonzero(votes, axis=0)
+        safe_total = np.maximum(total, 1)
+        buy_pct = (votes > 0).sum(axis=0) / safe_total
+        sell_pct = (votes < 0).sum(axis=0) / safe_total
+        action = np.where(buy_pct >= self.min_consensus_threshold, 1,
+                          np.where(sell_pct >= self.min_consensus_threshold, -1, 0))
+        confidence = np.where(action == 1, buy_pct,
+                              np.where(action == -1, sell_pct, np.maximum(buy_pct, sell_pct)))
+        return np.where(total > 0, action, 0), confidence
+    
     def add_agent(self, agent):
         """Add agent to consensus pipeline."""
         self.agents.append(agent)
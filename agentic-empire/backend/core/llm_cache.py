@@ -0,0 +1,152 @@
+"""Two-tier LLM response cache: an in-memory LRU over a local SQLite table."""
+from collections import OrderedDict
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from core.config import LLM_CACHE_PATH, LLM_CACHE_TTLS
+
+WHITESPACE = re.compile(r"\s+")
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse runs of whitespace so formatting-only differences share an entry."""
+    return WHITESPACE.sub(" ", prompt).strip()
+
+def parse_ttls(spec: str) -> Dict[str, float]:
+    """Per-caller TTLs from a ``"caller=seconds,..."`` string."""
+    ttls = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        caller, _, seconds = item.partition("=")
+        ttls[caller.strip()] = float(seconds)
+    return ttls
+
+class ResponseCache:
+    """Responses keyed by normalized prompt, model and parameters.
+
+    Caching is opt-in: only callers given a positive TTL in ``ttls`` (by
+    default ``LLM_CACHE_TTLS``) are cached, so interactive prompts always
+    reach the model. Lookups try the memory LRU, then SQLite (promoting hits
+    into memory) and never write; access times are batched and flushed on the
+    next ``put``. Both tiers are size-bounded, SQLite by evicting the least
+    recently used rows once it exceeds ``max_disk_entries``.
+    """
+
+    def __init__(self, path: str = LLM_CACHE_PATH, max_entries: int = 1024, max_disk_entries: int = 100_000,
+                 ttls: Optional[Dict[str, float]] = None):
+        self.path = path
+        self.max_entries, self.max_disk_entries = max_entries, max_disk_entries
+        self.ttls = parse_ttls(LLM_CACHE_TTLS) if ttls is None else dict(ttls)
+        self.memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.memory_hits = self.disk_hits = self.misses = self.evictions = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_entries = 0
+        self._accessed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def ttl_for(self, caller: Optional[str]) -> float:
+        return self.ttls.get(caller, 0.0) if caller is not None else 0.0
+
+    @staticmethod
+    def key(prompt: str, model: str, params: Optional[Dict] = None) -> str:
+        payload = json.dumps([normalize_prompt(prompt), model, params or {}], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL,"
+                       " expires REAL NOT NULL, accessed REAL NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            db.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+            db.commit()
+            self._disk_entries = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            self._db = db
+        return self._db
+
+    def get(self, prompt: str, model: str, params: Optional[Dict] = None,
+            caller: Optional[str] = None) -> Optional[str]:
+        """Cached response, or None on a miss or for callers with caching disabled."""
+        if self.ttl_for(caller) <= 0:
+            return None
+        key, now = self.key(prompt, model, params), time.time()
+        with self._lock:
+            entry = self.memory.get(key)
+            if entry is not None and entry[0] > now:
+                self.memory.move_to_end(key)
+                self._accessed[key] = now
+                self.memory_hits += 1
+                return entry[1]
+            db = self._connection()
+            row = db.execute("SELECT response, expires FROM responses WHERE key = ? AND expires > ?",
+                             (key, now)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._accessed[key] = now
+            self.disk_hits += 1
+            self._remember(key, row[0], row[1])
+            return row[0]
+
+    def put(self, prompt: str, response: str, model: str, params: Optional[Dict] = None,
+            caller: Optional[str] = None):
+        """Store a response in both tiers for the caller's TTL."""
+        ttl = self.ttl_for(caller)
+        if ttl <= 0:
+            return
+        key, now = self.key(prompt, model, params), time.time()
+        with self._lock:
+            self._remember(key, response, now + ttl)
+            db = self._connection()
+            self._flush_accessed(db)
+            inserted = db.execute("INSERT OR REPLACE INTO responses (key, response, expires, accessed)"
+                                  " VALUES (?, ?, ?, ?)", (key, response, now + ttl, now)).rowcount
+            # Replacements count too, so the total may run high; it is re-counted before evicting.
+            self._disk_entries += inserted
+            excess = self._disk_entries - self.max_disk_entries
+            if excess > 0:
+                # Drop expired rows first, then the least recently used, in one batch.
+                db.execute("DELETE FROM responses WHERE expires <= ?", (now,))
+                self._disk_entries = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+                excess = self._disk_entries - self.max_disk_entries
+                if excess > 0:
+                    db.execute("DELETE FROM responses WHERE key IN (SELECT key FROM responses"
+                               " ORDER BY accessed LIMIT ?)", (excess,))
+                    self._disk_entries -= excess
+                    self.evictions += excess
+            db.commit()
+
+    def _flush_accessed(self, db: sqlite3.Connection):
+        """Write batched access times so LRU eviction sees recent hits."""
+        if self._accessed:
+            db.executemany("UPDATE responses SET accessed = ? WHERE key = ?",
+                           [(accessed, key) for key, accessed in self._accessed.items()])
+            self._accessed.clear()
+
+    def _remember(self, key: str, response: str, expires: float):
+        self.memory[key] = (expires, response)
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def stats(self) -> Dict:
+        """Hit and miss counts per tier and entries held."""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {"memory_hits": self.memory_hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self.memory), "disk_entries": self._disk_entries,
+                "evictions": self.evictions}
+
+    def clear(self):
+        with self._lock:
+            self.memory.clear()
+            self._accessed.clear()
+            self._connection().execute("DELETE FROM responses")
+            self._db.commit()
+            self._disk_entries = 0
+
+# Global instance
+llm_cache = ResponseCache()
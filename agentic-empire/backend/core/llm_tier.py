@@ -1,10 +1,18 @@
+from typing import Optional
 from services.ollama_service import OllamaService
 from core.config import SMALL_LLM_MODEL, LARGE_LLM_MODEL
+from core.llm_cache import llm_cache
 
 ollama_svc = OllamaService()
 
-async def tiered_generate(prompt: str):
+async def tiered_generate(prompt: str, caller: Optional[str] = None):
     token_est = len(prompt) // 4  # Rough estimate
     model = LARGE_LLM_MODEL if token_est > 500 else SMALL_LLM_MODEL
     device_priority = 'gpu' if token_est > 500 else 'cpu'  # Heavy to GPU
-    return await ollama_svc.generate(prompt, gpu_priority=(device_priority == 'gpu'))
\ No newline at end of file
+    # Callers with a TTL in LLM_CACHE_TTLS (dashboards, probes, agents) are served from cache; others always hit the model
+    cached = llm_cache.get(prompt, model, caller=caller)
+    if cached is not None:
+        return cached
+    response = await ollama_svc.generate(prompt, model=model, gpu_priority=(device_priority == 'gpu'))
+    llm_cache.put(prompt, response, model, caller=caller)
+    return response
@@ -0,0 +1 @@
+"""Market data services module."""
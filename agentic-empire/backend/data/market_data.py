@@ -0,0 +1,119 @@
+"""Memory-mapped historical bar store and price access."""
+import os
+from typing import Dict, Optional, Tuple
+import numpy as np
+from core.config import MARKET_DATA_DIR
+
+COLUMNS = {"open": np.float64, "high": np.float64, "low": np.float64,
+           "close": np.float64, "volume": np.float64}
+TIMEFRAMES = ("1m", "5m", "15m", "1h", "4h", "1d")
+INDEX_STRIDE = 4096
+
+def _to_ns(value) -> np.int64:
+    """Convert a datetime, string or datetime64 into epoch nanoseconds."""
+    return np.datetime64(value, "ns").astype(np.int64)
+
+class MarketDataStore:
+    """Columnar bar store with one memory-mapped file per symbol, timeframe and column.
+
+    Timestamps are kept as sorted int64 nanoseconds; a sparse in-memory index
+    over every ``INDEX_STRIDE``-th timestamp narrows range lookups to one block.
+    """
+
+    def __init__(self, root: str = MARKET_DATA_DIR):
+        self.root = root
+        self.latest: Dict[str, float] = {}
+        self._maps: Dict[Tuple[str, str], Tuple[int, Dict[str, np.ndarray], np.ndarray]] = {}
+
+    def _path(self, symbol: str, timeframe: str, column: str) -> str:
+        return os.path.join(self.root, symbol.replace("/", "_"), timeframe, f"{column}.bin")
+
+    def write_bars(self, symbol: str, bars: Dict[str, np.ndarray], timeframe: str = "1d"):
+        """Append bars; timestamps must be increasing and after the stored tail."""
+        ts = np.asarray(bars["timestamp"]).astype("datetime64[ns]").astype(np.int64)
+        stored = self._load(symbol, timeframe)
+        if len(ts) == 0:
+            return
+        if np.any(np.diff(ts) <= 0) or (stored and len(stored[1]["timestamp"]) and
+                                        ts[0] <= stored[1]["timestamp"][-1]):
+            raise ValueError(f"Bars for {symbol} {timeframe} must be appended in time order")
+        os.makedirs(os.path.dirname(self._path(symbol, timeframe, "timestamp")), exist_ok=True)
+        self._align(symbol, timeframe)
+        # Timestamps go last: readers size the frame by them, so a torn append stays hidden.
+        for column, dtype in (*COLUMNS.items(), ("timestamp", np.int64)):
+            values = ts if column == "timestamp" else np.asarray(bars.get(column, np.full(len(ts), np.nan)))
+            with open(self._path(symbol, timeframe, column), "ab") as f:
+                f.write(values.astype(dtype).tobytes())
+
+    def _align(self, symbol: str, timeframe: str):
+        """Cut every column file back to the rows the timestamp file holds.
+
+        Drops the leftovers of a torn earlier append so the next one starts
+        aligned across columns.
+        """
+        ts_path = self._path(symbol, timeframe, "timestamp")
+        rows = (os.path.getsize(ts_path) if os.path.exists(ts_path) else 0) // np.dtype(np.int64).itemsize
+        for column, dtype in (*COLUMNS.items(), ("timestamp", np.int64)):
+            path = self._path(symbol, timeframe, column)
+            size = rows * np.dtype(dtype).itemsize
+            actual = os.path.getsize(path) if os.path.exists(path) else 0
+            if actual < size:
+                raise ValueError(f"{column} for {symbol} {timeframe} has fewer rows than its timestamps")
+            if actual > size:
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+
+    def _load(self, symbol: str, timeframe: str):
+        """Map the column files, remapping only when the store has grown."""
+        ts_path = self._path(symbol, timeframe, "timestamp")
+        size = os.path.getsize(ts_path) if os.path.exists(ts_path) else 0
+        cached = self._maps.get((symbol, timeframe))
+        if cached and cached[0] == size:
+            return cached
+        if size == 0:
+            return None
+        rows = size // np.dtype(np.int64).itemsize
+        columns = {c: np.memmap(self._path(symbol, timeframe, c), dtype=d, mode="r", shape=(rows,))
+                   for c, d in (*COLUMNS.items(), ("timestamp", np.int64))}
+        self._maps[(symbol, timeframe)] = (size, columns, np.array(columns["timestamp"][::INDEX_STRIDE]))
+        return self._maps[(symbol, timeframe)]
+
+    def _locate(self, ts: np.ndarray, index: np.ndarray, value: np.int64) -> int:
+        """Binary search the sparse index, then one ``INDEX_STRIDE`` block on disk."""
+        block = max(int(np.searchsorted(index, value)) - 1, 0) * INDEX_STRIDE
+        return block + int(np.searchsorted(ts[block:block + INDEX_STRIDE + 1], value))
+
+    def bars(self, symbol: str, start=None, end=None, timeframe: str = "1d") -> Dict[str, np.ndarray]:
+        """Zero-copy column views for ``start <= timestamp < end``."""
+        loaded = self._load(symbol, timeframe)
+        if loaded is None:
+            return {c: np.empty(0, d) for c, d in COLUMNS.items()} | {"timestamp": np.empty(0, "M8[ns]")}
+        _, columns, index = loaded
+        ts = columns["timestamp"]
+        lo = 0 if start is None else self._locate(ts, index, _to_ns(start))
+        hi = len(ts) if end is None else self._locate(ts, index, _to_ns(end))
+        view = {c: col[lo:hi] for c, col in columns.items()}
+        view["timestamp"] = view["timestamp"].view("M8[ns]")
+        return view
+
+    async def get_historical(self, symbol: str, start=None, end=None,
+                             timeframe: str = "1d") -> Dict[str, np.ndarray]:
+        """Historical bars as memory-mapped NumPy columns."""
+        return self.bars(symbol, start, end, timeframe)
+
+    def on_tick(self, symbol: str, price: float):
+        """Record the latest traded price for a symbol."""
+        self.latest[symbol] = price
+
+    async def get_price(self, symbol: str, exchange: Optional[str] = None) -> float:
+        """Latest tick, falling back to the last close of the finest stored timeframe."""
+        if symbol in self.latest:
+            return float(self.latest[symbol])
+        for timeframe in TIMEFRAMES:
+            loaded = self._load(symbol, timeframe)
+            if loaded is not None:
+                return float(loaded[1]["close"][-1])
+        raise KeyError(f"No market data for {symbol}")
+
+# Global instance
+market_data = MarketDataStore()
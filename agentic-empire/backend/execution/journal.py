@@ -0,0 +1,216 @@
+"""Append-only write-ahead journal and snapshots for order manager state.
+
+Events are packed into an in-memory buffer on the caller's thread; a flusher
+thread writes and fsyncs whatever has accumulated every ``flush_interval``
+seconds (group commit), so a crash loses at most that window. Each record is
+``<length, crc32, kind, sequence>`` followed by fixed numeric fields and the
+string fields joined with a unit separator. A snapshot saves the full state
+with the last sequence it covers, then journal segments it covers are removed.
+Replay stops at the first torn or corrupt record; recovery truncates the log
+there so later appends continue from the last good record.
+"""
+import glob
+import math
+import os
+import pickle
+import struct
+import threading
+import zlib
+from typing import Dict, Iterator, Tuple
+from core.config import EXECUTION_JOURNAL_DIR
+from execution.order_store import OrderRecord, OrderStore
+
+HEADER = struct.Struct("<IIBQ")
+NEW_FIELDS = struct.Struct("<dddq")
+STATUS_FIELDS = struct.Struct("<d")
+FILL_FIELDS = struct.Struct("<ddd")
+SEQUENCE = struct.Struct("<Q")
+NEW, STATUS, FILL = 1, 2, 3
+RECORD_SIZES = {NEW: NEW_FIELDS.size, STATUS: STATUS_FIELDS.size, FILL: FILL_FIELDS.size}
+SEPARATOR = "\x1f"
+SNAPSHOT = "snapshot.bin"
+
+class Journal:
+    """Durable event log for one ``OrderManager``."""
+
+    def __init__(self, root: str = EXECUTION_JOURNAL_DIR, flush_interval: float = 0.005,
+                 snapshot_interval: int = 1_000_000):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.flush_interval, self.snapshot_interval = flush_interval, snapshot_interval
+        self.snapshot_sequence = self._read_snapshot_sequence()
+        self.sequence = self.snapshot_sequence
+        for _, _, _, sequence in self._records(self._segments()[-1:], []):
+            self.sequence = max(self.sequence, sequence)
+        self.since_snapshot = 0
+        self._buffer = bytearray()
+        self._lock, self._io_lock = threading.Lock(), threading.Lock()
+        self._file = None
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._run, name="order-journal", daemon=True)
+        self._flusher.start()
+
+    def _segments(self):
+        return sorted(glob.glob(os.path.join(self.root, "*.wal")))
+
+    def _append(self, kind: int, fields: bytes, strings) -> bool:
+        payload = fields + SEPARATOR.join(strings).encode()
+        with self._lock:
+            self.sequence += 1
+            self._buffer += HEADER.pack(len(payload), zlib.crc32(payload), kind, self.sequence)
+            self._buffer += payload
+        self.since_snapshot += 1
+        return self.since_snapshot >= self.snapshot_interval
+
+    def order(self, record: OrderRecord, next_id: int) -> bool:
+        """Journal a new order; returns True when a snapshot is due."""
+        price = math.nan if record.price is None else record.price
+        return self._append(NEW, NEW_FIELDS.pack(record.quantity, price, record.timestamp, next_id),
+                            (record.id, record.symbol, record.type, record.status, record.tag or "", record.side))
+
+    def status(self, record: OrderRecord) -> bool:
+        """Journal a status change that did not come from a fill."""
+        return self._append(STATUS, STATUS_FIELDS.pack(record.filled), (record.id, record.status))
+
+    def fill(self, fill: Dict) -> bool:
+        """Journal a fill; replaying it also reapplies the order's filled quantity and status."""
+        return self._append(FILL, FILL_FIELDS.pack(fill["price"], fill["quantity"], fill["timestamp"]),
+                            (fill["order_id"], fill["symbol"], fill["side"], fill.get("liquidity", "")))
+
+    def flush(self):
+        """Write and fsync everything buffered so far."""
+        with self._io_lock:
+            self._write()
+
+    def _write(self):
+        with self._lock:
+            data, self._buffer = self._buffer, bytearray()
+        if not data:
+            return
+        if self._file is None:
+            # Segments are named after their first sequence number.
+            start = HEADER.unpack_from(data)[3]
+            self._file = open(os.path.join(self.root, f"{start:020d}.wal"), "ab")
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _run(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def snapshot(self, manager) -> int:
+        """Save ``manager`` state atomically and drop the journal it supersedes.
+
+        Must run on the thread that mutates ``manager`` so state and sequence agree.
+        """
+        with self._io_lock:
+            self._write()
+            covered = self.sequence
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        state = {"order_id_counter": manager.order_id_counter,
+                 "orders": [(r.id, r.symbol, r.quantity, r.type, r.price, r.status, r.timestamp, r.tag,
+                             r.side, r.filled) for r in manager.orders.values()],
+                 "fills": manager.fills}
+        path = os.path.join(self.root, SNAPSHOT)
+        with open(path + ".tmp", "wb") as f:
+            f.write(SEQUENCE.pack(covered))
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+        for segment in self._segments():
+            if int(os.path.basename(segment)[:-4]) <= covered:
+                os.remove(segment)
+        self.snapshot_sequence, self.since_snapshot = covered, 0
+        return covered
+
+    def recover(self, manager) -> int:
+        """Rebuild ``manager`` from the last snapshot plus the journal tail; returns events replayed."""
+        manager.orders, manager.fills = OrderStore(), []
+        path = os.path.join(self.root, SNAPSHOT)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                f.seek(SEQUENCE.size)
+                state = pickle.load(f)
+            manager.order_id_counter = state["order_id_counter"]
+            for fields in state["orders"]:
+                record = OrderRecord(*fields[:9])
+                record.filled = fields[9]
+                manager.orders.add(record)
+            manager.fills = state["fills"]
+        replayed, torn, last = 0, [], self.snapshot_sequence
+        segments = self._segments()
+        for kind, fields, strings, sequence in self._records(segments, torn):
+            last = max(last, sequence)
+            if sequence <= self.snapshot_sequence:
+                continue
+            replayed += 1
+            if kind == NEW:
+                quantity, price, timestamp, next_id = NEW_FIELDS.unpack(fields)
+                order_id, symbol, order_type, status, tag, side = strings
+                manager.orders.add(OrderRecord(order_id, symbol, quantity, order_type,
+                                               None if math.isnan(price) else price, status, timestamp,
+                                               tag or None, side))
+                manager.order_id_counter = max(manager.order_id_counter, next_id)
+            elif kind == STATUS:
+                record = manager.orders.get(strings[0])
+                if record is not None:
+                    record.filled = STATUS_FIELDS.unpack(fields)[0]
+                    manager.orders.set_status(record, strings[1])
+            elif kind == FILL:
+                price, quantity, timestamp = FILL_FIELDS.unpack(fields)
+                order_id, symbol, side, liquidity = strings
+                manager._apply_fill({"order_id": order_id, "symbol": symbol, "side": side, "price": price,
+                                     "quantity": quantity, "liquidity": liquidity, "timestamp": timestamp})
+        if torn:
+            # Everything after the first bad record follows a gap: cut it so the log stays contiguous.
+            segment, offset = torn[0]
+            with open(segment, "r+b") as f:
+                f.truncate(offset)
+            for later in segments[segments.index(segment) + 1:]:
+                os.remove(later)
+            self.sequence = last
+        return replayed
+
+    def _read_snapshot_sequence(self) -> int:
+        path = os.path.join(self.root, SNAPSHOT)
+        if not os.path.exists(path):
+            return 0
+        with open(path, "rb") as f:
+            return SEQUENCE.unpack(f.read(SEQUENCE.size))[0]
+
+    @staticmethod
+    def _records(segments, torn: list) -> Iterator[Tuple[int, bytes, list, int]]:
+        """Decode records in order, stopping at the first torn or corrupt one.
+
+        Where it stopped, as ``(segment, offset)``, is appended to ``torn``.
+        """
+        for segment in segments:
+            with open(segment, "rb") as f:
+                data = f.read()
+            offset = 0
+            while offset < len(data):
+                if offset + HEADER.size > len(data):
+                    torn.append((segment, offset))
+                    return
+                length, crc, kind, sequence = HEADER.unpack_from(data, offset)
+                start = offset + HEADER.size
+                payload = data[start:start + length]
+                if len(payload) < length or zlib.crc32(payload) != crc or kind not in RECORD_SIZES:
+                    torn.append((segment, offset))
+                    return
+                size = RECORD_SIZES[kind]
+                yield kind, payload[:size], payload[size:].decode().split(SEPARATOR), sequence
+                offset = start + length
+
+    def close(self):
+        """Stop the flusher and make everything durable."""
+        self._closed.set()
+        self._flusher.join()
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,202 @@
+"""In-process price-time priority matching engine for paper trading."""
+from collections import deque
+from heapq import heappop, heappush
+import itertools
+import time
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+ORDER_TYPES = frozenset(("market", "limit", "stop"))
+
+class OrderBook:
+    """Resting limit orders for one symbol.
+
+    Each side keeps a heap of prices (bids negated) over a dict of FIFO price
+    levels. Level entries are ``[order_id, remaining]`` lists; cancelling zeroes
+    ``remaining`` and matching drops such tombstones when it reaches them, so
+    cancels are O(1) and emptied prices leave the heap lazily.
+    """
+    __slots__ = ("symbol", "bids", "asks", "bid_levels", "ask_levels", "buy_stops", "sell_stops", "last_price")
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids: List[float] = []
+        self.asks: List[float] = []
+        self.bid_levels: Dict[float, Deque[list]] = {}
+        self.ask_levels: Dict[float, Deque[list]] = {}
+        self.buy_stops: List[Tuple] = []
+        self.sell_stops: List[Tuple] = []
+        self.last_price: Optional[float] = None
+
+    def best_bid(self) -> Optional[float]:
+        return self._best(self.bids, self.bid_levels, -1.0)
+
+    def best_ask(self) -> Optional[float]:
+        return self._best(self.asks, self.ask_levels, 1.0)
+
+    @staticmethod
+    def _best(heap: List[float], levels: Dict[float, Deque[list]], sign: float) -> Optional[float]:
+        while heap:
+            price = heap[0] * sign
+            level = levels.get(price)
+            while level and level[0][1] <= 0:
+                level.popleft()
+            if level:
+                return price
+            levels.pop(price, None)
+            heappop(heap)
+        return None
+
+    def depth(self, side: str, levels: int = 5) -> List[Tuple[float, float]]:
+        """Aggregated (price, quantity) for the best ``levels`` prices on one side."""
+        book = self.bid_levels if side == "buy" else self.ask_levels
+        prices = sorted(book, reverse=side == "buy")
+        out = []
+        for price in prices:
+            quantity = sum(entry[1] for entry in book[price] if entry[1] > 0)
+            if quantity > 0:
+                out.append((price, quantity))
+                if len(out) == levels:
+                    break
+        return out
+
+class MatchingEngine:
+    """Matches market, limit and stop orders with partial fills and price-time priority.
+
+    ``on_fill(fill)`` is called once per side of every trade with a dict of
+    order_id, symbol, side, price, quantity, liquidity and timestamp.
+    ``on_cancel(order_id, remaining)`` reports quantity the engine dropped, i.e.
+    the unfilled rest of market orders (including triggered stops).
+    """
+
+    def __init__(self, on_fill: Optional[Callable[[Dict], None]] = None,
+                 on_cancel: Optional[Callable[[str, float], None]] = None):
+        self.on_fill, self.on_cancel = on_fill, on_cancel
+        self.books: Dict[str, OrderBook] = {}
+        self.resting: Dict[str, list] = {}
+        self.stops: Dict[str, list] = {}
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+
+    def book(self, symbol: str) -> OrderBook:
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = OrderBook(symbol)
+        return book
+
+    def submit(self, symbol: str, side: str, quantity: float, order_type: str = "limit",
+               price: Optional[float] = None, order_id: Optional[str] = None) -> Dict:
+        """Match or rest one order; ``price`` is the stop price for stop orders.
+
+        Returns the order's id, status and filled quantity after matching; a
+        market order's unfilled rest is dropped and reported as cancelled.
+        """
+        if order_type not in ORDER_TYPES:
+            raise ValueError(f"Unknown order type: {order_type}")
+        if quantity <= 0:
+            raise ValueError("quantity must be positive")
+        if price is None and order_type in ("limit", "stop"):
+            raise ValueError(f"{order_type} orders require a price")
+        order_id = order_id or f"ME{next(self._ids)}"
+        book = self.book(symbol)
+        if order_type == "stop":
+            entry = [order_id, quantity, side, "pending"]
+            self.stops[order_id] = entry
+            if side == "buy":
+                heappush(book.buy_stops, (price, next(self._seq), entry))
+            else:
+                heappush(book.sell_stops, (-price, next(self._seq), entry))
+            self._trigger_stops(book, time.time())
+            if order_id in self.stops:
+                return {"order_id": order_id, "status": "pending", "filled": 0.0}
+            return {"order_id": order_id, "status": entry[3], "filled": quantity - entry[1]}
+        now = time.time()
+        limit = price if order_type == "limit" else None
+        remaining = self._match(book, order_id, side, quantity, limit, now)
+        filled = quantity - remaining
+        if remaining > 0 and limit is not None:
+            self._rest(book, order_id, side, limit, remaining)
+            status = "partially_filled" if filled else "pending"
+        elif remaining > 0:
+            status = "cancelled"
+            if self.on_cancel:
+                self.on_cancel(order_id, remaining)
+        else:
+            status = "filled"
+        if filled:
+            self._trigger_stops(book, now)
+        return {"order_id": order_id, "status": status, "filled": filled}
+
+    def cancel(self, order_id: str) -> bool:
+        """Cancel a resting limit or untriggered stop order."""
+        entry = self.resting.pop(order_id, None) or self.stops.pop(order_id, None)
+        if entry is None:
+            return False
+        entry[1] = 0.0
+        return True
+
+    def _rest(self, book: OrderBook, order_id: str, side: str, price: float, quantity: float):
+        entry = [order_id, quantity]
+        if side == "buy":
+            levels, heap, key = book.bid_levels, book.bids, -price
+        else:
+            levels, heap, key = book.ask_levels, book.asks, price
+        level = levels.get(price)
+        if level is None:
+            level = levels[price] = deque()
+            heappush(heap, key)
+        level.append(entry)
+        self.resting[order_id] = entry
+
+    def _match(self, book: OrderBook, order_id: str, side: str, quantity: float,
+               limit: Optional[float], now: float) -> float:
+        """Sweep the opposite side up to ``limit``; returns the unfilled quantity."""
+        if side == "buy":
+            heap, levels, sign, maker_side = book.asks, book.ask_levels, 1.0, "sell"
+        else:
+            heap, levels, sign, maker_side = book.bids, book.bid_levels, -1.0, "buy"
+        remaining, resting, on_fill, symbol = quantity, self.resting, self.on_fill, book.symbol
+        while remaining > 0 and heap:
+            best = heap[0] * sign
+            if limit is not None and (best > limit if sign > 0 else best < limit):
+                break
+            level = levels.get(best)
+            while level and remaining > 0:
+                entry = level[0]
+                available = entry[1]
+                if available <= 0:
+                    level.popleft()
+                    continue
+                traded = available if available < remaining else remaining
+                entry[1] = available - traded
+                remaining -= traded
+                book.last_price = best
+                if entry[1] <= 0:
+                    level.popleft()
+                    del resting[entry[0]]
+                if on_fill:
+                    on_fill({"order_id": entry[0], "symbol": symbol, "side": maker_side, "price": best,
+                             "quantity": traded, "liquidity": "maker", "timestamp": now})
+                    on_fill({"order_id": order_id, "symbol": symbol, "side": side, "price": best,
+                             "quantity": traded, "liquidity": "taker", "timestamp": now})
+            if not level:
+                levels.pop(best, None)
+                heappop(heap)
+        return remaining
+
+    def _trigger_stops(self, book: OrderBook, now: float):
+        """Convert stops crossed by the last trade into market orders, cascading."""
+        while book.last_price is not None:
+            if book.buy_stops and book.buy_stops[0][0] <= book.last_price:
+                _, _, entry = heappop(book.buy_stops)
+            elif book.sell_stops and -book.sell_stops[0][0] >= book.last_price:
+                _, _, entry = heappop(book.sell_stops)
+            else:
+                return
+            order_id, quantity, side, _ = entry
+            if self.stops.pop(order_id, None) is None or quantity <= 0:
+                continue
+            remaining = self._match(book, order_id, side, quantity, None, now)
+            entry[1] = remaining
+            entry[3] = "filled" if remaining <= 0 else "cancelled"
+            if remaining > 0 and self.on_cancel:
+                self.on_cancel(order_id, remaining)
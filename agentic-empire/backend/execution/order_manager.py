@@ -1,7 +1,12 @@
 """Order execution and tracking system."""
 from typing import Dict, List, Optional
 from enum import Enum
-from datetime import datetime
+import time
+from compliance.compliance_officer import compliance_officer
+from compliance.rule_engine import RuleEngine
+from execution.journal import Journal
+from execution.matching_engine import MatchingEngine
+from execution.order_store import OPEN_STATUSES, OrderRecord, OrderStore
 
 class OrderType(Enum):
     MARKET = "market"
@@ -10,40 +15,138 @@ class OrderType(Enum):
 
 class OrderStatus(Enum):
     PENDING = "pending"
+    PARTIALLY_FILLED = "partially_filled"
     FILLED = "filled"
     REJECTED = "rejected"
     CANCELLED = "cancelled"
 
+ORDER_TYPE_VALUES = {**{t: t.value for t in OrderType}, **{t.value: t.value for t in OrderType}}
+PENDING = OrderStatus.PENDING.value
+REJECTED = OrderStatus.REJECTED.value
+
 class OrderManager:
-    """Manages order routing and fill tracking."""
+    """Manages order routing and fill tracking.
+    
+    With a ``MatchingEngine`` attached, orders are matched locally as a paper
+    broker and its fills update order status and ``fills``. With a ``Journal``
+    attached, state is first recovered from it and every change is journaled;
+    recovered open limit and stop orders are resubmitted to the engine in
+    time order, and market orders caught in flight by the crash are cancelled.
+    With a compliance ``RuleEngine`` attached, orders it refuses are recorded
+    as rejected and never routed.
+    """
     
-    def __init__(self):
-        self.orders = {}
+    def __init__(self, engine: Optional[MatchingEngine] = None, journal: Optional[Journal] = None,
+                 compliance: Optional[RuleEngine] = None):
+        self.orders = OrderStore()
         self.fills = []
         self.order_id_counter = 1000
+        self.engine = engine
+        self.compliance = compliance
+        if engine is not None:
+            engine.on_fill, engine.on_cancel = self._on_fill, self._on_engine_cancel
+        self.journal = journal
+        if journal is not None:
+            journal.recover(self)
+            if engine is not None:
+                self._restore_engine()
+    
+    def _restore_engine(self):
+        for record in sorted(self.orders.open_orders(), key=lambda r: r.timestamp):
+            if record.type == OrderType.MARKET.value:
+                self._cancel(record)
+            else:
+                self.engine.submit(record.symbol, record.side, record.quantity - record.filled,
+                                   record.type, record.price, record.id)
+    
+    def _journal(self, event: str, *args):
+        if self.journal is not None and getattr(self.journal, event)(*args):
+            self.journal.snapshot(self)
     
     async def submit_order(self, symbol: str, quantity: float, order_type: OrderType, 
-                          price: Optional[float] = None) -> str:
+                          price: Optional[float] = None, tag: Optional[str] = None,
+                          side: str = "buy") -> str:
         """Submit order to broker."""
+        return self._new_order(symbol, quantity, order_type.value, price, tag, time.time(), side)
+    
+    async def submit_orders(self, orders: List[Dict]) -> List[str]:
+        """Submit many orders at once; each dict has symbol, quantity, order_type and optional price/tag/side."""
+        now = time.time()
+        invalid = [o["order_type"] for o in orders if o["order_type"] not in ORDER_TYPE_VALUES]
+        if invalid:
+            raise ValueError(f"Unknown order types: {invalid}")
+        approved = [True] * len(orders)
+        if self.compliance is not None and orders:
+            approved = self.compliance.check_batch(
+                [o["symbol"] for o in orders], [o["quantity"] for o in orders],
+                [o.get("side", "buy") for o in orders],
+                [o["price"] if o.get("price") is not None else float("nan") for o in orders]).tolist()
+        return [self._new_order(o["symbol"], o["quantity"], ORDER_TYPE_VALUES[o["order_type"]], o.get("price"),
+                                o.get("tag"), now, o.get("side", "buy"), ok) for o, ok in zip(orders, approved)]
+    
+    def _new_order(self, symbol: str, quantity: float, order_type: str, price: Optional[float],
+                   tag: Optional[str], timestamp: float, side: str = "buy",
+                   approved: Optional[bool] = None) -> str:
         order_id = f"ORD{self.order_id_counter}"
         self.order_id_counter += 1
-        self.orders[order_id] = {
-            "id": order_id, "symbol": symbol, "quantity": quantity,
-            "type": order_type.value, "price": price, "status": OrderStatus.PENDING.value,
-            "timestamp": datetime.now().isoformat()
-        }
+        if approved is None:
+            approved = self.compliance is None or self.compliance.allows(symbol, quantity, side, price)
+        status = PENDING if approved else REJECTED
+        record = OrderRecord(order_id, symbol, quantity, order_type, price, status, timestamp, tag, side)
+        self.orders.add(record)
+        self._journal("order", record, self.order_id_counter)
+        if approved and self.engine is not None:
+            self.engine.submit(symbol, side, quantity, order_type, price, order_id)
         return order_id
     
+    def _on_fill(self, fill: Dict):
+        """Apply one engine fill to its order."""
+        self._apply_fill(fill)
+        self._journal("fill", fill)
+    
+    def _apply_fill(self, fill: Dict):
+        record = self.orders.get(fill["order_id"])
+        if record is not None:
+            record.filled += fill["quantity"]
+            status = OrderStatus.FILLED if record.filled >= record.quantity else OrderStatus.PARTIALLY_FILLED
+            self.orders.set_status(record, status.value)
+        self.fills.append(fill)
+    
+    def _on_engine_cancel(self, order_id: str, remaining: float):
+        record = self.orders.get(order_id)
+        if record is not None:
+            self.orders.set_status(record, OrderStatus.CANCELLED.value)
+            self._journal("status", record)
+    
     async def cancel_order(self, order_id: str) -> bool:
         """Cancel pending order."""
-        if order_id in self.orders:
-            self.orders[order_id]["status"] = OrderStatus.CANCELLED.value
-            return True
-        return False
+        record = self.orders.get(order_id)
+        if record is None or record.status not in OPEN_STATUSES:
+            return False
+        self._cancel(record)
+        return True
+    
+    async def cancel_all(self, symbol: Optional[str] = None, tag: Optional[str] = None) -> List[str]:
+        """Cancel every open order, or only those for a symbol and/or client tag."""
+        cancelled = self.orders.open_orders(symbol, tag)
+        for record in cancelled:
+            self._cancel(record)
+        return [record.id for record in cancelled]
+    
+    def _cancel(self, record: OrderRecord):
+        if self.engine is not None:
+            self.engine.cancel(record.id)
+        self.orders.set_status(record, OrderStatus.CANCELLED.value)
+        self._journal("status", record)
+    
+    def get_open_orders(self, symbol: Optional[str] = None, tag: Optional[str] = None) -> List[Dict]:
+        """List open orders without scanning closed ones."""
+        return [record.to_dict() for record in self.orders.open_orders(symbol, tag)]
     
     def get_order_status(self, order_id: str) -> Optional[Dict]:
         """Check order status."""
-        return self.orders.get(order_id)
+        record = self.orders.get(order_id)
+        return record.to_dict() if record else None
 
-# Global instance
-order_manager = OrderManager()
+# Global instance, checked against the global compliance officer's rules
+order_manager = OrderManager(compliance=compliance_officer.rules)
@@ -0,0 +1,87 @@
+"""Compact order records with secondary indexes."""
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+OPEN_STATUSES = {"pending", "partially_filled"}
+
+class OrderRecord:
+    """One order; ``timestamp`` is epoch seconds."""
+    __slots__ = ("id", "symbol", "quantity", "type", "price", "status", "timestamp", "tag", "side", "filled")
+
+    def __init__(self, order_id: str, symbol: str, quantity: float, order_type: str,
+                 price: Optional[float], status: str, timestamp: float, tag: Optional[str] = None,
+                 side: str = "buy"):
+        self.id = order_id
+        self.symbol = symbol
+        self.quantity = quantity
+        self.type = order_type
+        self.price = price
+        self.status = status
+        self.timestamp = timestamp
+        self.tag = tag
+        self.side = side
+        self.filled = 0.0
+
+    def to_dict(self) -> Dict:
+        return {"id": self.id, "symbol": self.symbol, "quantity": self.quantity, "type": self.type,
+                "price": self.price, "status": self.status, "tag": self.tag, "side": self.side,
+                "filled": self.filled,
+                "timestamp": datetime.fromtimestamp(self.timestamp).isoformat()}
+
+class OrderStore(dict):
+    """Orders by id, indexed by symbol, status and client tag.
+
+    Each index maps a key to an insertion-ordered dict of records, and open
+    orders are also indexed per symbol, so status listings and cancel-all touch
+    only the matching orders. Status changes must go through ``set_status``.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.by_symbol: Dict[str, Dict[str, OrderRecord]] = {}
+        self.by_status: Dict[str, Dict[str, OrderRecord]] = {}
+        self.by_tag: Dict[str, Dict[str, OrderRecord]] = {}
+        self.open_by_symbol: Dict[str, Dict[str, OrderRecord]] = {}
+
+    def add(self, record: OrderRecord):
+        self[record.id] = record
+        self.by_symbol.setdefault(record.symbol, {})[record.id] = record
+        self.by_status.setdefault(record.status, {})[record.id] = record
+        if record.tag is not None:
+            self.by_tag.setdefault(record.tag, {})[record.id] = record
+        if record.status in OPEN_STATUSES:
+            self.open_by_symbol.setdefault(record.symbol, {})[record.id] = record
+
+    def set_status(self, record: OrderRecord, status: str):
+        """Move a record between status indexes."""
+        if status == record.status:
+            return
+        self.by_status[record.status].pop(record.id, None)
+        self.by_status.setdefault(status, {})[record.id] = record
+        if status in OPEN_STATUSES:
+            self.open_by_symbol.setdefault(record.symbol, {})[record.id] = record
+        elif record.status in OPEN_STATUSES:
+            self.open_by_symbol[record.symbol].pop(record.id, None)
+        record.status = status
+
+    def open_orders(self, symbol: Optional[str] = None, tag: Optional[str] = None) -> List[OrderRecord]:
+        """Open orders, optionally for one symbol and/or client tag."""
+        if symbol is not None:
+            records: Iterable[OrderRecord] = self.open_by_symbol.get(symbol, {}).values()
+        elif tag is not None:
+            records = self.by_tag.get(tag, {}).values()
+        else:
+            records = (r for status in OPEN_STATUSES for r in self.by_status.get(status, {}).values())
+        return [r for r in records if r.status in OPEN_STATUSES and (tag is None or r.tag == tag)]
+
+    def select(self, symbol: Optional[str] = None, status: Optional[str] = None,
+               tag: Optional[str] = None) -> List[OrderRecord]:
+        """Orders matching every given key, scanning only the smallest matching index."""
+        candidates = [index.get(key, {}) for index, key in
+                      ((self.by_symbol, symbol), (self.by_status, status), (self.by_tag, tag))
+                      if key is not None]
+        if not candidates:
+            return list(self.values())
+        smallest = min(candidates, key=len)
+        return [r for r in smallest.values() if (symbol is None or r.symbol == symbol)
+                and (status is None or r.status == status) and (tag is None or r.tag == tag)]
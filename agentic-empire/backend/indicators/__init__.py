@@ -0,0 +1 @@
+"""Technical indicator library module."""
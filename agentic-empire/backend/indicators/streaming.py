@@ -0,0 +1,114 @@
+"""Incremental indicators holding O(1) state per symbol.
+
+Each ``update`` consumes one new bar or tick and returns the same value the
+matching ``indicators.vectorized`` function gives at that position.
+"""
+from collections import deque
+from typing import Dict, Optional
+
+class EMA:
+    """Exponential moving average seeded with the first price."""
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, period: int = 20, alpha: Optional[float] = None):
+        self.alpha = alpha if alpha is not None else 2.0 / (period + 1)
+        self.value: Optional[float] = None
+
+    def update(self, price: float) -> float:
+        self.value = price if self.value is None else (1.0 - self.alpha) * self.value + self.alpha * price
+        return self.value
+
+class RSI:
+    """Wilder RSI; 50 until the first price change."""
+    __slots__ = ("gain", "loss", "last", "value")
+
+    def __init__(self, period: int = 14):
+        self.gain, self.loss = EMA(alpha=1.0 / period), EMA(alpha=1.0 / period)
+        self.last: Optional[float] = None
+        self.value = 50.0
+
+    def update(self, price: float) -> float:
+        if self.last is not None:
+            delta = price - self.last
+            gain, loss = self.gain.update(max(delta, 0.0)), self.loss.update(max(-delta, 0.0))
+            self.value = 100.0 - 100.0 / (1.0 + gain / loss) if loss > 0 else 100.0 if gain > 0 else 50.0
+        self.last = price
+        return self.value
+
+class MACD:
+    """MACD line, signal line and histogram."""
+    __slots__ = ("fast", "slow", "signal", "value")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast, self.slow, self.signal = EMA(fast), EMA(slow), EMA(signal)
+        self.value: Optional[Dict[str, float]] = None
+
+    def update(self, price: float) -> Dict[str, float]:
+        line = self.fast.update(price) - self.slow.update(price)
+        signal = self.signal.update(line)
+        self.value = {"macd": line, "signal": signal, "histogram": line - signal}
+        return self.value
+
+class ATR:
+    """Wilder average true range."""
+    __slots__ = ("average", "close", "value")
+
+    def __init__(self, period: int = 14):
+        self.average = EMA(alpha=1.0 / period)
+        self.close: Optional[float] = None
+        self.value: Optional[float] = None
+
+    def update(self, high: float, low: float, close: float) -> float:
+        true_range = high - low
+        if self.close is not None:
+            true_range = max(true_range, abs(high - self.close), abs(low - self.close))
+        self.close = close
+        self.value = self.average.update(true_range)
+        return self.value
+
+class Bollinger:
+    """Rolling mean +/- ``num_std`` population deviations over a bounded window.
+
+    Mean and squared deviations are updated with Welford's method as a price
+    enters and the oldest leaves, so each update is O(1).
+    """
+    __slots__ = ("window", "num_std", "mean", "m2", "value")
+
+    def __init__(self, period: int = 20, num_std: float = 2.0):
+        self.window, self.num_std = deque(maxlen=period), num_std
+        self.mean = self.m2 = 0.0
+        self.value: Optional[Dict[str, float]] = None
+
+    def update(self, price: float) -> Dict[str, float]:
+        window, mean = self.window, self.mean
+        if len(window) == window.maxlen:
+            oldest = window[0]
+            self.mean = mean + (price - oldest) / len(window)
+            self.m2 += (price - oldest) * (price - self.mean + oldest - mean)
+        else:
+            self.mean = mean + (price - mean) / (len(window) + 1)
+            self.m2 += (price - mean) * (price - self.mean)
+        window.append(price)
+        mean = self.mean
+        std = (max(self.m2, 0.0) / len(window)) ** 0.5
+        self.value = {"middle": mean, "upper": mean + self.num_std * std,
+                      "lower": mean - self.num_std * std}
+        return self.value
+
+class VWAP:
+    """Cumulative volume-weighted average price; ``reset`` starts a new session."""
+    __slots__ = ("pv", "volume", "value")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.pv, self.volume, self.value = 0.0, 0.0, None
+
+    def update(self, price: float, volume: float, high: Optional[float] = None,
+               low: Optional[float] = None) -> float:
+        typical = price if high is None or low is None else (high + low + price) / 3.0
+        self.pv += typical * volume
+        self.volume += volume
+        self.value = self.pv / self.volume if self.volume > 0 else typical
+        return self.value
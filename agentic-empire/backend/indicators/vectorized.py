@@ -0,0 +1,87 @@
+"""Vectorized indicators over whole NumPy price histories.
+
+Every function works along axis 0, so a (bars, symbols) array computes the
+whole universe at once, and matches ``indicators.streaming`` bar for bar.
+"""
+from typing import Dict, Optional
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+def ema_filter(x: np.ndarray, alpha: float) -> np.ndarray:
+    """Exponential smoothing ``y[t] = (1 - alpha) * y[t-1] + alpha * x[t]`` seeded with ``x[0]``.
+
+    The recursion is solved in closed form inside blocks short enough for
+    ``(1 - alpha) ** -block`` to stay finite, carrying ``y`` across blocks.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    out = np.empty_like(x)
+    if len(x) == 0:
+        return out
+    decay = 1.0 - alpha
+    if decay <= 0:
+        return x.copy()
+    block = max(1, min(len(x), int(300 / -np.log(decay))))
+    steps = np.arange(block).reshape((-1,) + (1,) * (x.ndim - 1))
+    grow, shrink = decay ** -steps, decay ** steps
+    carry = x[0]
+    for start in range(0, len(x), block):
+        chunk = x[start:start + block]
+        n = len(chunk)
+        acc = np.cumsum(chunk * grow[:n], axis=0)
+        out[start:start + n] = shrink[:n] * (decay * carry + alpha * acc)
+        carry = out[start + n - 1]
+    return out
+
+def ema(prices: np.ndarray, period: int) -> np.ndarray:
+    """Exponential moving average with ``alpha = 2 / (period + 1)``."""
+    return ema_filter(prices, 2.0 / (period + 1))
+
+def rsi(prices: np.ndarray, period: int = 14) -> np.ndarray:
+    """Wilder RSI; 50 until the first price change."""
+    prices = np.asarray(prices, dtype=np.float64)
+    out = np.full(prices.shape, 50.0)
+    if len(prices) < 2:
+        return out
+    delta = np.diff(prices, axis=0)
+    gain = ema_filter(np.maximum(delta, 0.0), 1.0 / period)
+    loss = ema_filter(np.maximum(-delta, 0.0), 1.0 / period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = 100.0 - 100.0 / (1.0 + gain / loss)
+    out[1:] = np.where(loss > 0, value, np.where(gain > 0, 100.0, 50.0))
+    return out
+
+def macd(prices: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, np.ndarray]:
+    """MACD line, signal line and histogram."""
+    line = ema(prices, fast) - ema(prices, slow)
+    signal_line = ema(line, signal)
+    return {"macd": line, "signal": signal_line, "histogram": line - signal_line}
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Wilder average true range."""
+    high, low, close = (np.asarray(a, dtype=np.float64) for a in (high, low, close))
+    true_range = high - low
+    if len(close) > 1:
+        prev = close[:-1]
+        true_range[1:] = np.maximum(true_range[1:], np.maximum(np.abs(high[1:] - prev),
+                                                               np.abs(low[1:] - prev)))
+    return ema_filter(true_range, 1.0 / period)
+
+def bollinger(prices: np.ndarray, period: int = 20, num_std: float = 2.0) -> Dict[str, np.ndarray]:
+    """Rolling mean +/- ``num_std`` population deviations; early bars use a partial window."""
+    prices = np.asarray(prices, dtype=np.float64)
+    padded = np.concatenate((np.zeros((period - 1,) + prices.shape[1:]), prices), axis=0)
+    windows = sliding_window_view(padded, period, axis=0)
+    count = np.minimum(np.arange(1, len(prices) + 1), period).reshape((-1,) + (1,) * (prices.ndim - 1))
+    mean = windows.sum(axis=-1) / count
+    var = np.einsum("...i,...i->...", windows, windows) / count - mean ** 2
+    std = np.sqrt(np.maximum(var, 0.0))
+    return {"middle": mean, "upper": mean + num_std * std, "lower": mean - num_std * std}
+
+def vwap(prices: np.ndarray, volume: np.ndarray, high: Optional[np.ndarray] = None,
+         low: Optional[np.ndarray] = None) -> np.ndarray:
+    """Cumulative volume-weighted average of the typical price."""
+    prices = np.asarray(prices, dtype=np.float64)
+    typical = prices if high is None or low is None else (np.asarray(high) + np.asarray(low) + prices) / 3.0
+    pv = np.cumsum(typical * volume, axis=0)
+    vol = np.cumsum(np.asarray(volume, dtype=np.float64), axis=0)
+    return np.divide(pv, vol, out=typical.copy(), where=vol > 0)
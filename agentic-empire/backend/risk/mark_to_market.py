@@ -0,0 +1,138 @@
+"""Streaming mark-to-market P&L and Greeks over stock and option positions."""
+import math
+import time
+from typing import Dict, Optional
+import numpy as np
+from agents.options.pricing import black_scholes
+
+YEAR_SECONDS = 365.0 * 24 * 3600
+
+class UnderlyingBook:
+    """Shares and option contracts on one underlying, with their last marked contribution."""
+    __slots__ = ("symbol", "quantity", "cost", "option_cost", "price", "option_index", "units", "strikes", "expiries",
+                 "vols", "is_call", "value", "delta", "gamma", "vega")
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.quantity = self.cost = self.option_cost = 0.0
+        self.price: Optional[float] = None
+        self.option_index: Dict[str, int] = {}
+        self.units = np.empty(0)
+        self.strikes = np.empty(0)
+        self.expiries = np.empty(0)
+        self.vols = np.empty(0)
+        self.is_call = np.empty(0, dtype=bool)
+        self.value = self.delta = self.gamma = self.vega = 0.0
+
+    def to_dict(self) -> Dict:
+        return {"symbol": self.symbol, "quantity": self.quantity, "price": self.price, "value": self.value,
+                "cost": self.cost + self.option_cost,
+                "unrealized_pnl": self.value - self.cost - self.option_cost, "delta": self.delta,
+                "gamma": self.gamma, "vega": self.vega, "options": len(self.option_index)}
+
+class MarkToMarket:
+    """Marks positions to each price tick, keeping portfolio totals as running sums.
+
+    A tick re-marks only the book of the symbol that moved (its shares plus
+    every option on it, priced in one vectorized call) and adjusts the totals by
+    the change in that book's contribution. Per-book delta and gamma are in
+    shares of the underlying; the portfolio totals are dollar Greeks
+    (``delta * S`` and ``gamma * S^2``) so they add across underlyings. Vega is
+    per unit of volatility.
+    """
+
+    def __init__(self, cash: float = 100000.0, rate: float = 0.05, dividend: float = 0.0):
+        self.cash, self.rate, self.dividend = cash, rate, dividend
+        self.books: Dict[str, UnderlyingBook] = {}
+        self.market_value = self.cost_basis = self.realized_pnl = 0.0
+        self.dollar_delta = self.dollar_gamma = self.vega = 0.0
+        self.ticks = 0
+
+    @property
+    def unrealized_pnl(self) -> float:
+        return self.market_value - self.cost_basis
+
+    @property
+    def portfolio_value(self) -> float:
+        return self.cash + self.market_value
+
+    def _book(self, symbol: str) -> UnderlyingBook:
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = UnderlyingBook(symbol)
+        return book
+
+    def apply_fill(self, symbol: str, quantity: float, price: float, now: Optional[float] = None):
+        """Trade ``quantity`` shares (negative sells) at ``price`` with average-cost accounting."""
+        book = self._book(symbol)
+        self.cash -= quantity * price
+        cost = book.cost
+        closing = 0.0
+        if book.quantity and (book.quantity > 0) != (quantity > 0):
+            closing = -math.copysign(min(abs(quantity), abs(book.quantity)), book.quantity)
+            average = book.cost / book.quantity
+            self.realized_pnl += (price - average) * -closing
+            book.cost += closing * average
+        book.cost += (quantity - closing) * price
+        book.quantity += quantity
+        self.cost_basis += book.cost - cost
+        self._mark(book, price if book.price is None else book.price, now)
+
+    def add_option(self, key: str, underlying: str, quantity: float, strike: float, expiry: float,
+                   vol: float, is_call: bool = True, price: float = 0.0, multiplier: float = 100.0,
+                   now: Optional[float] = None):
+        """Trade ``quantity`` contracts of option ``key`` expiring at epoch ``expiry`` for ``price`` each."""
+        book = self._book(underlying)
+        units = quantity * multiplier
+        self.cash -= units * price
+        book.option_cost += units * price
+        self.cost_basis += units * price
+        i = book.option_index.get(key)
+        if i is None:
+            book.option_index[key] = len(book.units)
+            book.units = np.append(book.units, units)
+            book.strikes = np.append(book.strikes, strike)
+            book.expiries = np.append(book.expiries, expiry)
+            book.vols = np.append(book.vols, vol)
+            book.is_call = np.append(book.is_call, is_call)
+        else:
+            book.units[i] += units
+            book.vols[i] = vol
+        if book.price is not None:
+            self._mark(book, book.price, now)
+
+    def set_vol(self, key: str, underlying: str, vol: float):
+        """Change the volatility an option is marked with from the next tick on."""
+        book = self.books[underlying]
+        book.vols[book.option_index[key]] = vol
+
+    def on_tick(self, symbol: str, price: float, now: Optional[float] = None):
+        """Re-mark the book on ``symbol``; symbols without positions cost one dict lookup."""
+        book = self.books.get(symbol)
+        if book is not None:
+            self.ticks += 1
+            self._mark(book, price, now)
+
+    def _mark(self, book: UnderlyingBook, price: float, now: Optional[float]):
+        value, delta, gamma, vega = book.quantity * price, book.quantity, 0.0, 0.0
+        if len(book.units):
+            expiry = (book.expiries - (time.time() if now is None else now)) / YEAR_SECONDS
+            greeks = black_scholes(price, book.strikes, expiry, self.rate, book.vols, book.is_call,
+                                   self.dividend)
+            units = book.units
+            value += float(units @ greeks["price"])
+            delta += float(units @ greeks["delta"])
+            gamma = float(units @ greeks["gamma"])
+            vega = float(units @ greeks["vega"])
+        old = book.price or 0.0
+        self.market_value += value - book.value
+        self.dollar_delta += delta * price - book.delta * old
+        self.dollar_gamma += gamma * price * price - book.gamma * old * old
+        self.vega += vega - book.vega
+        book.price, book.value, book.delta, book.gamma, book.vega = price, value, delta, gamma, vega
+
+    def totals(self) -> Dict:
+        """Portfolio value, P&L and aggregated Greeks."""
+        return {"cash": self.cash, "market_value": self.market_value, "portfolio_value": self.portfolio_value,
+                "unrealized_pnl": self.unrealized_pnl, "realized_pnl": self.realized_pnl,
+                "dollar_delta": self.dollar_delta, "dollar_gamma": self.dollar_gamma, "vega": self.vega}
@@ -1,42 +1,145 @@
 """Risk management and position sizing system."""
-from typing import Dict, Optional
+from typing import Dict, Optional, Sequence
+import numpy as np
+from risk.mark_to_market import MarkToMarket
+from risk.var_engine import VaREngine
 
 class RiskManager:
-    """Portfolio risk management with position limits and stop-loss."""
+    """Portfolio risk management with position limits and stop-loss.
+
+    Gross, net and per-sector exposure are running totals kept up to date by
+    ``update_position``, so pre-trade checks never walk the positions. Exposure
+    limits are fractions of ``portfolio_value``; symbols without a sector are
+    exempt from the sector limit. With a ``MarkToMarket`` attached, fills and
+    ticks keep positions, exposure and ``portfolio_value`` at live prices.
+    """
     
-    def __init__(self, max_position_size: float = 0.1, max_portfolio_risk: float = 0.02):
+    def __init__(self, max_position_size: float = 0.1, max_portfolio_risk: float = 0.02,
+                 max_gross_exposure: float = 0.8, max_net_exposure: float = 0.8,
+                 max_sector_exposure: float = 0.3, var_engine: Optional[VaREngine] = None,
+                 mark_to_market: Optional[MarkToMarket] = None):
         self.max_position_size = max_position_size
         self.max_portfolio_risk = max_portfolio_risk
+        self.max_gross_exposure = max_gross_exposure
+        self.max_net_exposure = max_net_exposure
+        self.max_sector_exposure = max_sector_exposure
         self.positions = {}
         self.portfolio_value = 100000.0
+        self.sectors: Dict[str, str] = {}
+        self.gross_exposure = 0.0
+        self.net_exposure = 0.0
+        self.sector_exposure: Dict[str, float] = {}
+        self.var_engine = var_engine
+        self.mark_to_market = mark_to_market
+        if mark_to_market is not None:
+            self.portfolio_value = mark_to_market.portfolio_value
     
     def calculate_position_size(self, symbol: str, price: float, 
                                risk_per_trade: float = 0.01) -> float:
-        """Calculate safe position size based on portfolio value."""
+        """Calculate safe position size based on portfolio value.
+
+        ``price`` may also be a NumPy array to size a whole universe in one call.
+        """
         max_risk_amount = self.portfolio_value * risk_per_trade
         position_size = max_risk_amount / price
         max_size = self.portfolio_value * self.max_position_size / price
-        return min(position_size, max_size)
+        size = np.minimum(position_size, max_size)
+        return float(size) if np.ndim(size) == 0 else size
     
     def check_risk_limits(self, symbol: str, quantity: float, price: float) -> bool:
-        """Validate if trade is within risk limits."""
+        """Validate if trade is within risk limits.
+
+        Limits only apply to the exposure a trade adds: an order that shrinks its
+        position (``abs(old + value) <= abs(old)``) or the net exposure always passes.
+        """
         position_value = quantity * price
-        if position_value > self.portfolio_value * self.max_position_size:
-            return False
-        total_exposure = sum(pos["value"] for pos in self.positions.values())
-        if (total_exposure + position_value) > self.portfolio_value * 0.8:
-            return False
-        return True
+        position = self.positions.get(symbol)
+        old = position["value"] if position is not None else 0.0
+        added = abs(old + position_value) - abs(old)
+        if added > 0:
+            if abs(position_value) > self.portfolio_value * self.max_position_size:
+                return False
+            if self.gross_exposure + added > self.portfolio_value * self.max_gross_exposure:
+                return False
+            sector = self.sectors.get(symbol)
+            if sector is not None and (self.sector_exposure.get(sector, 0.0) + added
+                                       > self.portfolio_value * self.max_sector_exposure):
+                return False
+        net = abs(self.net_exposure + position_value)
+        return net <= abs(self.net_exposure) or net <= self.portfolio_value * self.max_net_exposure
+    
+    def check_risk_limits_batch(self, symbols: Sequence[str], quantities, prices) -> np.ndarray:
+        """Vectorized ``check_risk_limits``; each order is checked alone against current exposure."""
+        values = np.asarray(quantities, dtype=float) * np.asarray(prices, dtype=float)
+        positions = self.positions
+        old = np.array([positions[s]["value"] if s in positions else 0.0 for s in symbols], dtype=float)
+        added = np.abs(old + values) - np.abs(old)
+        ok = np.abs(values) <= self.portfolio_value * self.max_position_size
+        ok &= self.gross_exposure + added <= self.portfolio_value * self.max_gross_exposure
+        if self.sectors:
+            sectors, exposure = self.sectors, self.sector_exposure
+            current = np.array([exposure.get(sectors[s], 0.0) if s in sectors else -np.inf for s in symbols])
+            ok &= current + added <= self.portfolio_value * self.max_sector_exposure
+        ok |= added <= 0
+        net = np.abs(self.net_exposure + values)
+        ok &= (net <= abs(self.net_exposure)) | (net <= self.portfolio_value * self.max_net_exposure)
+        return ok
+    
+    def portfolio_var(self, method: str = "monte_carlo", horizon: int = 1, **kwargs) -> Dict:
+        """VaR/CVaR of current positions from ``var_engine`` ("monte_carlo" or "historical")."""
+        if self.var_engine is None:
+            raise ValueError("portfolio_var requires a var_engine")
+        exposures = self.var_engine.exposures({s: pos["value"] for s, pos in self.positions.items()})
+        return getattr(self.var_engine, method)(exposures, horizon=horizon, **kwargs)
+    
+    def check_portfolio_risk(self, method: str = "monte_carlo") -> bool:
+        """Validate that portfolio VaR stays within ``max_portfolio_risk`` of portfolio value."""
+        if self.var_engine is None or self.var_engine.bars < 2:
+            return True
+        return self.portfolio_var(method)["var"] <= self.portfolio_value * self.max_portfolio_risk
     
     def set_stop_loss(self, symbol: str, entry_price: float, 
                      stop_pct: float = 0.02) -> float:
         """Calculate stop-loss price."""
         return entry_price * (1 - stop_pct)
     
-    def update_position(self, symbol: str, quantity: float, price: float):
-        """Update position tracking."""
+    def update_position(self, symbol: str, quantity: float, price: float, sector: Optional[str] = None):
+        """Update position tracking and the running exposure totals."""
+        old = self.positions.get(symbol)
+        if old is not None:
+            self._add_exposure(symbol, -old["value"], -abs(old["value"]))
+        if sector is not None:
+            self.sectors[symbol] = sector
         self.positions[symbol] = {"quantity": quantity, "price": price, 
                                   "value": quantity * price}
+        self._add_exposure(symbol, quantity * price, abs(quantity * price))
+    
+    def on_fill(self, symbol: str, quantity: float, price: float):
+        """Book a fill of ``quantity`` shares (negative sells) into the live position."""
+        if self.mark_to_market is None:
+            position = self.positions.get(symbol)
+            self.update_position(symbol, (position["quantity"] if position else 0.0) + quantity, price)
+            return
+        self.mark_to_market.apply_fill(symbol, quantity, price)
+        book = self.mark_to_market.books[symbol]
+        self.update_position(symbol, book.quantity, book.price)
+        self.portfolio_value = self.mark_to_market.portfolio_value
+    
+    def on_tick(self, symbol: str, price: float):
+        """Mark one price tick; symbols without a position are a couple of dict lookups."""
+        position = self.positions.get(symbol)
+        if position is not None:
+            self.update_position(symbol, position["quantity"], price)
+        if self.mark_to_market is not None:
+            self.mark_to_market.on_tick(symbol, price)
+            self.portfolio_value = self.mark_to_market.portfolio_value
+    
+    def _add_exposure(self, symbol: str, value: float, size: float):
+        self.gross_exposure += size
+        self.net_exposure += value
+        sector = self.sectors.get(symbol)
+        if sector is not None:
+            self.sector_exposure[sector] = self.sector_exposure.get(sector, 0.0) + size
 
 # Global instance
 risk_manager = RiskManager()
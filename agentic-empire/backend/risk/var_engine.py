@@ -0,0 +1,194 @@
+"""Portfolio Value-at-Risk from a rolling window of asset returns.
+
+The engine keeps the last ``window`` return vectors in a ring buffer along
+with their running sum and the Cholesky factor of their cross-product matrix
+``sum(r r^T)``. A new bar is a rank-one update of that factor and the bar
+leaving the window a rank-one downdate, so refreshing the covariance factor
+costs O(n^2) per bar instead of a fresh O(n^3) decomposition.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import math
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+def cholesky_update(factor: np.ndarray, vector: np.ndarray, sign: float = 1.0) -> bool:
+    """Turn lower-triangular ``L`` into the factor of ``L L^T + sign * v v^T`` in place.
+
+    Returns False if a downdate would leave the matrix not positive definite.
+    """
+    x = np.array(vector, dtype=float)
+    for k in range(len(x)):
+        diagonal = factor[k, k]
+        squared = diagonal * diagonal + sign * x[k] * x[k]
+        if squared <= 0.0:
+            return False
+        r = math.sqrt(squared)
+        c, s = r / diagonal, x[k] / diagonal
+        factor[k, k] = r
+        if k + 1 < len(x):
+            factor[k + 1:, k] = (factor[k + 1:, k] + sign * s * x[k + 1:]) / c
+            x[k + 1:] = c * x[k + 1:] - s * factor[k + 1:, k]
+    return True
+
+def _tail(losses: np.ndarray, keep: int) -> np.ndarray:
+    """The ``keep`` largest losses, unsorted."""
+    if keep >= len(losses):
+        return losses
+    return np.partition(losses, len(losses) - keep)[-keep:]
+
+def _simulate(task: Tuple) -> np.ndarray:
+    """Largest losses of one Monte Carlo chunk; runs in pool workers."""
+    loading, drift, count, keep, seed = task
+    rng = np.random.default_rng(seed)
+    losses = np.empty(0)
+    for start in range(0, count, 16384):
+        shocks = rng.standard_normal((min(16384, count - start), len(loading)))
+        losses = _tail(np.concatenate([losses, -(shocks @ loading + drift)]), keep)
+    return losses
+
+def _var_cvar(tail: np.ndarray, total: int, confidence: float) -> Dict:
+    tail = np.sort(tail)[::-1]
+    excess = max(1, int(math.ceil(total * (1.0 - confidence))))
+    return {"var": float(tail[excess - 1]), "cvar": float(tail[:excess].mean()),
+            "confidence": confidence, "samples": total}
+
+class VaREngine:
+    """Rolling covariance with an incrementally maintained Cholesky factor, plus VaR/CVaR.
+
+    Losses are reported as positive currency amounts for a portfolio given as
+    exposures (position values) per symbol, aligned with ``symbols``.
+    """
+
+    def __init__(self, symbols: Sequence[str], window: int = 252, confidence: float = 0.99,
+                 simulations: int = 100_000, seed: Optional[int] = None):
+        self.symbols = list(symbols)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.window, self.confidence, self.simulations = window, confidence, simulations
+        n = len(self.symbols)
+        self.returns = np.zeros((window, n))
+        self.count = 0
+        self.total = np.zeros(n)
+        self.factor = np.zeros((n, n))
+        self.seed = np.random.SeedSequence(seed)
+        self._covariance_factor: Optional[np.ndarray] = None
+        self.refactorizations = 0
+
+    def fit(self, history: np.ndarray):
+        """Load a (bars, symbols) array of returns, keeping the last ``window`` rows."""
+        history = np.asarray(history, dtype=float)[-self.window:]
+        self.count = len(history)
+        self.returns[:self.count] = history
+        self._refactor()
+
+    def add_bar(self, returns: np.ndarray):
+        """Append one bar of returns, dropping the oldest once the window is full."""
+        returns = np.asarray(returns, dtype=float)
+        slot = self.count % self.window
+        if self.count <= len(self.symbols):
+            # Until the window holds more bars than assets the factor is rank deficient.
+            self.returns[slot] = returns
+            self.count += 1
+            self._refactor()
+            return
+        if self.count >= self.window:
+            old = self.returns[slot].copy()
+            self.total -= old
+            if not cholesky_update(self.factor, old, -1.0):
+                self.returns[slot] = returns
+                self.count += 1
+                self._refactor()
+                return
+        self.returns[slot] = returns
+        self.total += returns
+        self.count += 1
+        if not cholesky_update(self.factor, returns) or self.count % self.window == 0:
+            # A fresh factor once per window also stops rounding error from accumulating.
+            self._refactor()
+        self._covariance_factor = None
+
+    def _refactor(self):
+        """Rebuild the sums and factor from the buffer, with a tiny ridge if singular."""
+        rows = self.history()
+        self.total = rows.sum(axis=0)
+        cross = rows.T @ rows
+        ridge = 1e-12 * max(np.trace(cross), 1e-12)
+        self.factor = np.linalg.cholesky(cross + ridge * np.eye(len(cross)))
+        self._covariance_factor = None
+        self.refactorizations += 1
+
+    def history(self) -> np.ndarray:
+        """Returns in the window, oldest first."""
+        if self.count <= self.window:
+            return self.returns[:self.count]
+        return np.roll(self.returns, -(self.count % self.window), axis=0)
+
+    @property
+    def bars(self) -> int:
+        return min(self.count, self.window)
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.total / max(self.bars, 1)
+
+    @property
+    def covariance(self) -> np.ndarray:
+        factor = self.cholesky
+        return factor @ factor.T
+
+    @property
+    def cholesky(self) -> np.ndarray:
+        """Factor of the sample covariance, derived from the cross-product factor by one downdate."""
+        if self._covariance_factor is None:
+            bars = self.bars
+            if bars < 2:
+                raise ValueError("VaR needs at least two bars of returns")
+            factor = self.factor.copy()
+            # sum((r - mean)(r - mean)^T) = sum(r r^T) - bars * mean mean^T
+            if cholesky_update(factor, math.sqrt(bars) * self.mean, -1.0):
+                self._covariance_factor = factor / math.sqrt(bars - 1)
+            else:
+                covariance = np.atleast_2d(np.cov(self.history(), rowvar=False))
+                ridge = 1e-12 * max(np.trace(covariance), 1e-12)
+                self._covariance_factor = np.linalg.cholesky(covariance + ridge * np.eye(len(covariance)))
+        return self._covariance_factor
+
+    def exposures(self, values: Dict[str, float]) -> np.ndarray:
+        """Position values keyed by symbol as a vector aligned with ``symbols``."""
+        out = np.zeros(len(self.symbols))
+        for symbol, value in values.items():
+            i = self.index.get(symbol)
+            if i is not None:
+                out[i] = value
+        return out
+
+    def historical(self, exposures: np.ndarray, horizon: int = 1,
+                   confidence: Optional[float] = None) -> Dict:
+        """Historical-simulation VaR/CVaR: the window's returns replayed on today's exposures."""
+        losses = -(self.history() @ np.asarray(exposures, dtype=float)) * math.sqrt(horizon)
+        return _var_cvar(losses, len(losses), confidence or self.confidence)
+
+    def monte_carlo(self, exposures: np.ndarray, horizon: int = 1, simulations: Optional[int] = None,
+                    confidence: Optional[float] = None, max_workers: Optional[int] = 1) -> Dict:
+        """Gaussian Monte Carlo VaR/CVaR over ``horizon`` bars.
+
+        Draws are split into chunks with independent seeds; with ``max_workers``
+        other than 1 the chunks run on a process pool and only each chunk's
+        loss tail is sent back.
+        """
+        exposures = np.asarray(exposures, dtype=float)
+        confidence = confidence or self.confidence
+        simulations = simulations or self.simulations
+        loading = self.cholesky.T @ exposures * math.sqrt(horizon)
+        drift = float(self.mean @ exposures) * horizon
+        keep = max(1, int(math.ceil(simulations * (1.0 - confidence))))
+        workers = 1 if max_workers == 1 else max_workers or os.cpu_count() or 1
+        chunks = max(workers, -(-simulations // 250_000))
+        sizes = [simulations // chunks + (i < simulations % chunks) for i in range(chunks)]
+        tasks = [(loading, drift, size, keep, seed) for size, seed in zip(sizes, self.seed.spawn(chunks))]
+        if workers == 1:
+            tails: List[np.ndarray] = [_simulate(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(workers) as pool:
+                tails = list(pool.map(_simulate, tasks))
+        return _var_cvar(_tail(np.concatenate(tails), keep), simulations, confidence)
@@ -1,22 +1,105 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.svm import SVC  # ML for PII classification
+from collections import OrderedDict
+import hashlib
+import os
 import re  # Regex for PII (SSN, emails, health data)
+import tempfile
+import threading
+from typing import List
+from core.config import DLP_MODEL_PATH
+
+PII_PATTERNS = {
+    "ssn": r'\b\d{3}-\d{2}-\d{4}\b',
+    "email": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+}
+# Compiled once at import into one alternation; regex runs first because it is cheap (CPU)
+PII_PATTERN = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in PII_PATTERNS.items()))
+
+# Stub training data (production: load a fine-tuned PII dataset from secure DB)
+TRAINING_TEXTS = ["sample SSN 123-45-6789", "no pii here", "health record: diabetes"]
+TRAINING_LABELS = [1, 0, 1]  # 1 = PII
 
 class DLPScanner:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer()
-        self.classifier = SVC()  # Trained stub (in enterprise, fine-tune on PII dataset)
-        # Train on sample data (production: Load from secure DB)
-        X = ["sample SSN 123-45-6789", "no pii here", "health record: diabetes"]
-        y = [1, 0, 1]  # 1 = PII
-        X_vec = self.vectorizer.fit_transform(X)
-        self.classifier.fit(X_vec, y)
-
-    def scan(self, text: str):
-        # Regex first (fast, CPU)
-        if re.search(r'\b\d{3}-\d{2}-\d{4}\b|\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text):
-            return False  # Block PII
-        # ML classify (GPU if heavy dataset)
-        vec = self.vectorizer.transform([text])
-        pred = self.classifier.predict(vec)
-        return pred[0] == 0  # True if no PII
\ No newline at end of file
+    """PII gate for agent tasks.
+
+    The TF-IDF + SVC model is loaded from ``model_path`` on first use (fitted
+    and saved there once if missing), so importing costs nothing. Verdicts are
+    cached by content hash, and ``scan_batch`` classifies every uncached text
+    in one vectorize/predict call.
+    """
+
+    def __init__(self, model_path: str = DLP_MODEL_PATH, cache_size: int = 4096):
+        self.model_path = model_path
+        self.cache_size = cache_size
+        self.cache: "OrderedDict[bytes, bool]" = OrderedDict()
+        self.hits = self.misses = 0
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._load()
+        return self._model
+
+    def _load(self):
+        import joblib  # sklearn and joblib are only imported once a scan needs the model
+        if os.path.exists(self.model_path):
+            return joblib.load(self.model_path)
+        return self.fit(TRAINING_TEXTS, TRAINING_LABELS)
+
+    def fit(self, texts: List[str], labels: List[int]):
+        """Train on labelled texts (1 = PII), persist atomically and use the new model."""
+        import joblib
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.pipeline import make_pipeline
+        from sklearn.svm import SVC  # ML for PII classification
+        model = make_pipeline(TfidfVectorizer(), SVC())
+        model.fit(texts, labels)
+        directory = os.path.dirname(self.model_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        # Unique temp file per writer: workers fitting at once never see or clobber a partial dump
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                joblib.dump(model, f)
+            os.replace(tmp_path, self.model_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._model = model
+        self.cache.clear()
+        return model
+
+    def scan(self, text: str) -> bool:
+        """True if no PII is detected."""
+        return self.scan_batch([text])[0]
+
+    def scan_batch(self, texts: List[str]) -> List[bool]:
+        """``scan`` for many texts, with one model call for everything not already cached."""
+        results: List[bool] = [False] * len(texts)
+        pending = {}
+        for i, text in enumerate(texts):
+            if PII_PATTERN.search(text):
+                continue  # Block PII
+            key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+            verdict = self.cache.get(key)
+            if verdict is None:
+                pending.setdefault(key, (text, []))[1].append(i)
+                continue
+            self.hits += 1
+            self.cache.move_to_end(key)
+            results[i] = verdict
+        if pending:
+            self.misses += len(pending)
+            keys = list(pending)
+            predictions = self.model.predict([pending[key][0] for key in keys])
+            for key, prediction in zip(keys, predictions):
+                verdict = bool(prediction == 0)  # True if no PII
+                for i in pending[key][1]:
+                    results[i] = verdict
+                self.cache[key] = verdict
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+        return results
@@ -0,0 +1,111 @@
+"""Streaming DLP scan of large documents in overlapping chunks."""
+import codecs
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+from services.dlp import PII_PATTERN, DLPScanner
+
+def _scan_chunk(task: Tuple[str, int, int, int]) -> List[Dict]:
+    """PII matches starting in ``text[lead:owned]``, with offsets relative to the whole document."""
+    text, base, lead, owned = task
+    findings = []
+    for match in PII_PATTERN.finditer(text, lead):
+        if match.start() >= owned:
+            break
+        findings.append({"type": match.lastgroup, "start": base + match.start(), "end": base + match.end()})
+    return findings
+
+class StreamingDLPScanner:
+    """Scans a text or binary stream chunk by chunk with bounded memory.
+
+    Each chunk carries the previous chunk's last ``overlap`` characters (plus
+    one character of context for word boundaries) and reports only matches
+    starting in its own span, so a match up to ``overlap`` characters long is
+    found exactly once wherever the boundaries fall; as with a single regex
+    pass, matches never overlap. All patterns run as one
+    combined regex. With ``max_workers`` other than 1, chunks are scanned on a
+    process pool with at most two per worker in flight. An optional
+    ``classifier`` also flags whole chunks its model labels as PII.
+    """
+
+    def __init__(self, chunk_size: int = 1 << 20, overlap: int = 1024, max_workers: Optional[int] = 1,
+                 classifier: Optional[DLPScanner] = None):
+        if overlap >= chunk_size:
+            raise ValueError("overlap must be smaller than chunk_size")
+        self.chunk_size, self.overlap = chunk_size, overlap
+        self.max_workers, self.classifier = max_workers, classifier
+
+    def _tasks(self, stream) -> Iterator[Tuple[str, int, int, int]]:
+        """(text, base offset, lead, owned end) per chunk; offsets count characters."""
+        decoder = None
+        carry, base, start = "", 0, 0
+        while True:
+            data = stream.read(self.chunk_size)
+            if isinstance(data, bytes):
+                decoder = decoder or codecs.getincrementaldecoder("utf-8")("replace")
+                data = decoder.decode(data, final=not data)
+            text = carry + data
+            if not text:
+                return
+            lead = start - base
+            owned = len(text) if not data else max(lead, len(text) - self.overlap)
+            if owned > lead or not data:
+                yield text, base, lead, owned
+            if not data:
+                return
+            start = base + owned
+            # Keep the unowned tail plus one character of context for the next chunk.
+            keep = max(start - 1, base)
+            carry, base = text[keep - base:], keep
+
+    def iter_findings(self, stream) -> Iterator[Dict]:
+        """Findings in document order; stop iterating to abandon the rest of the stream."""
+        reported = 0
+        for finding in self._chunk_findings(stream):
+            # Scanning from a chunk's start can pick up the tail of a match reported by the previous chunk.
+            if finding["type"] != "classifier":
+                if finding["start"] < reported:
+                    continue
+                reported = finding["end"]
+            yield finding
+
+    def _chunk_findings(self, stream) -> Iterator[Dict]:
+        workers = 1 if self.max_workers == 1 else self.max_workers or os.cpu_count() or 1
+        if workers == 1:
+            for task in self._tasks(stream):
+                yield from self._findings(task, _scan_chunk(task))
+            return
+        pool = ProcessPoolExecutor(workers)
+        try:
+            in_flight = deque()
+            for task in self._tasks(stream):
+                in_flight.append((task, pool.submit(_scan_chunk, task)))
+                if len(in_flight) >= 2 * workers:
+                    done, future = in_flight.popleft()
+                    yield from self._findings(done, future.result())
+            while in_flight:
+                done, future = in_flight.popleft()
+                yield from self._findings(done, future.result())
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _findings(self, task: Tuple[str, int, int, int], findings: List[Dict]) -> Iterator[Dict]:
+        yield from findings
+        if self.classifier is not None:
+            text, base, lead, owned = task
+            if self.classifier.model.predict([text[lead:owned]])[0] == 1:
+                yield {"type": "classifier", "start": base + lead, "end": base + owned}
+
+    def scan(self, stream, stop_on_first: bool = True) -> Dict:
+        """Scan a stream; by default stop at the first blocking finding."""
+        findings = []
+        for finding in self.iter_findings(stream):
+            findings.append(finding)
+            if stop_on_first:
+                break
+        return {"clean": not findings, "findings": findings}
+
+    def scan_file(self, path: str, stop_on_first: bool = True) -> Dict:
+        with open(path, "rb") as stream:
+            return self.scan(stream, stop_on_first)
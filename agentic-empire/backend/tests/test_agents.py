@@ -1,13 +1,18 @@
 """Comprehensive test suite for trading agents."""
+import math
 import pytest
-from agents.equity.day_trader import day_trader
-from agents.equity.swing_trader import swing_trader
+import numpy as np
+from agents.equity.day_trader import day_trader, DayTrader
+from agents.equity.swing_trader import swing_trader, SwingTrader
 from agents.equity.value_investor import value_investor
 from agents.crypto.btc_eth_trader import btc_eth_trader
 from agents.crypto.altcoin_trader import altcoin_trader
-from agents.crypto.arbitrage import arbitrage_agent
+from agents.crypto.arbitrage import arbitrage_agent, ArbitrageAgent
+from agents.crypto.arb_graph import ArbitrageGraph
 from agents.futures.futures_trader import futures_trader
 from agents.options.options_strategist import options_strategist
+from agents.options.pricing import black_scholes, implied_volatility, norm_cdf
+from agents.options.vol_surface import SurfaceCache, VolatilitySurface, svi_total_variance
 
 @pytest.mark.asyncio
 async def test_day_trader_analysis():
@@ -49,3 +54,190 @@ async def test_arbitrage_detection():
     """Test arbitrage opportunity detection."""
     analysis = await arbitrage_agent.analyze_market("BTC/USD", {})
     assert "opportunity" in analysis
+    opportunity = arbitrage_agent._find_best_arbitrage({"binance": 101.0, "coinbase": 99.0, "kraken": 100.0})
+    assert (opportunity["buy_exchange"], opportunity["sell_exchange"]) == ("coinbase", "binance")
+
+@pytest.mark.asyncio
+async def test_arbitrage_graph_triangular_and_cross_exchange():
+    """Test the rate graph finds triangular and cross-exchange cycles net of fees."""
+    agent = ArbitrageAgent()
+    agent.on_quote("binance", "BTC", "USD", 29999.0, 30001.0)
+    agent.on_quote("binance", "ETH", "USD", 1999.9, 2000.1)
+    assert agent.on_quote("binance", "ETH", "BTC", 0.0666, 0.0667) == []
+    found = agent.on_quote("binance", "ETH", "BTC", 0.0700, 0.0701)
+    assert found and found[0]["profit_pct"] > 0.04
+    assert {asset for _, asset in found[0]["path"]} == {"BTC", "ETH", "USD"}
+    agent.on_quote("binance", "ETH", "BTC", 0.0666, 0.0667)
+    assert agent.graph.violated == {}
+    agent.on_quote("kraken", "BTC", "USD", 30500.0, 30501.0)
+    cycles = agent.graph.opportunities()
+    assert cycles and {exchange for exchange, _ in cycles[0]["path"]} == {"binance", "kraken"}
+    signals = await agent.generate_signals("BTC/USD")
+    assert any(s["action"] == "arbitrage_cycle" for s in signals)
+
+def test_arbitrage_graph_matches_bellman_ford():
+    """Test incremental detection agrees with a full Bellman-Ford pass after every quote."""
+    def has_negative_cycle(graph):
+        dist = dict.fromkeys(graph.potential, 0.0)
+        edges = [e for out in graph.edges.values() for e in out.values()]
+        for _ in range(len(dist)):
+            relaxed = False
+            for e in edges:
+                if dist[e.src] + e.weight < dist[e.dst] - 1e-12:
+                    dist[e.dst], relaxed = dist[e.src] + e.weight, True
+            if not relaxed:
+                return False
+        return True
+    rng = np.random.default_rng(7)
+    pairs = [("BTC", "USD", 30000.0), ("ETH", "USD", 2000.0), ("ETH", "BTC", 2000 / 30000), ("SOL", "BTC", 1 / 1500)]
+    graph = ArbitrageGraph(default_fee=0.001, transfer_fee=0.0005)
+    for _ in range(600):
+        base, quote, price = pairs[rng.integers(len(pairs))]
+        mid = price * (1 + rng.normal(0, 0.002))
+        graph.update_quote(["binance", "coinbase", "kraken"][rng.integers(3)], base, quote,
+                           mid * 0.9997, mid * 1.0003)
+        assert bool(graph.violated) == has_negative_cycle(graph)
+        for cycle in graph.opportunities():
+            growth = np.prod([graph.edges[a][b].rate * (1 - graph.edges[a][b].fee)
+                              for a, b in zip(cycle["path"], cycle["path"][1:])])
+            assert growth - 1 == pytest.approx(cycle["profit_pct"])
+
+@pytest.mark.asyncio
+async def test_day_trader_streaming_rsi():
+    """Test streaming RSI state drives analysis without a price list."""
+    agent = DayTrader()
+    for price in [100.0 - i for i in range(20)]:
+        agent.on_tick("AAPL", price)
+    analysis = await agent.analyze_market("AAPL", {"price": 81.0})
+    assert analysis["rsi"] < 30
+    assert analysis["trend"] == "bullish"
+
+def test_swing_trader_vectorized_crossovers():
+    """Test EMA crossover signals on a full price array."""
+    prices = np.concatenate([np.linspace(100, 80, 50), np.linspace(80, 120, 50)])
+    codes = swing_trader.generate_signals_vectorized({"close": prices})
+    assert codes.max() == 1
+    assert set(np.unique(codes)) <= {-1, 0, 1}
+
+@pytest.mark.asyncio
+async def test_batch_signals_match_per_symbol_defaults():
+    """Test batch signal generation agrees with the per-symbol path on defaults."""
+    symbols = ["AAPL", "MSFT", "BTC/USD"]
+    for agent in [value_investor, swing_trader, btc_eth_trader, altcoin_trader, futures_trader,
+                  options_strategist]:
+        batch = await agent.generate_signals_batch(symbols, {})
+        for symbol in symbols:
+            assert batch[symbol] == await agent.generate_signals(symbol)
+
+@pytest.mark.asyncio
+async def test_batch_signals_vectorized_frame():
+    """Test one frame drives signals for the whole universe."""
+    symbols = ["AAA", "BBB", "CCC"]
+    close = np.column_stack([np.linspace(100, 60, 40), np.linspace(100, 140, 40), np.full(40, 100.0)])
+    signals = await day_trader.generate_signals_batch(symbols, {"close": close})
+    assert [s["action"] for s in signals["AAA"]] == ["buy"]
+    assert [s["action"] for s in signals["BBB"]] == ["sell"]
+    assert signals["CCC"] == []
+    defi = await altcoin_trader.generate_signals_batch(symbols, {"tvl": np.array([1e8, 1e3, 1e8]),
+                                                                 "liquidity": np.array([1e7, 1e3, 1e3]),
+                                                                 "market_cap": np.array([1e9, 1e3, 1e3])})
+    assert [bool(defi[s]) for s in symbols] == [True, False, False]
+
+@pytest.mark.asyncio
+async def test_swing_trader_batch_falls_back_to_streaming_emas():
+    """Test batch signals without a 2-D history use the per-symbol streaming EMAs."""
+    trader = SwingTrader()
+    for price in np.linspace(100, 120, 30):
+        trader.on_tick("UP", price)
+        trader.on_tick("DOWN", 220 - price)
+    latest = np.array([120.0, 100.0, 50.0])
+    signals = await trader.generate_signals_batch(["UP", "DOWN", "NEW"], {"close": latest})
+    assert [s["action"] for s in signals["UP"]] == ["buy"] and signals["UP"][0]["target"] == 120.0 * 1.05
+    assert signals["DOWN"] == [] and signals["NEW"] == []
+    assert (await trader.generate_signals_batch(["UP"], {}))["UP"] == await trader.generate_signals("UP")
+
+def test_norm_cdf_double_precision():
+    """Test the normal CDF against math.erfc across both tails."""
+    x = np.linspace(-30, 30, 6001)
+    expected = np.array([0.5 * math.erfc(-v / math.sqrt(2)) for v in x])
+    assert np.allclose(norm_cdf(x), expected, rtol=1e-12, atol=1e-16)
+
+def test_black_scholes_chain_greeks():
+    """Test chain Greeks against put-call parity and finite differences."""
+    strikes = np.linspace(60, 140, 81)
+    args = dict(spot=100.0, strike=strikes, expiry=0.5, rate=0.03, vol=0.25, dividend=0.01)
+    call, put = black_scholes(**args), black_scholes(**args, is_call=False)
+    parity = 100.0 * np.exp(-0.01 * 0.5) - strikes * np.exp(-0.03 * 0.5)
+    assert np.allclose(call["price"] - put["price"], parity)
+    h = 1e-4
+    for greek, name in [("delta", "spot"), ("vega", "vol"), ("rho", "rate")]:
+        up = black_scholes(**{**args, name: args[name] + h})["price"]
+        down = black_scholes(**{**args, name: args[name] - h})["price"]
+        assert np.allclose((up - down) / (2 * h), call[greek], atol=1e-5)
+    later = black_scholes(**{**args, "expiry": 0.5 + h})["price"]
+    assert np.allclose((call["price"] - later) / h, call["theta"], atol=1e-3)
+
+def test_implied_volatility_round_trip():
+    """Test the solver recovers volatility across a mixed chain and rejects bad quotes."""
+    rng = np.random.default_rng(0)
+    strikes, expiry = rng.uniform(70, 130, 1000), rng.uniform(0.05, 2.0, 1000)
+    vols, is_call = rng.uniform(0.1, 0.8, 1000), rng.random(1000) < 0.5
+    quote = black_scholes(100.0, strikes, expiry, 0.02, vols, is_call)
+    solved = implied_volatility(quote["price"], 100.0, strikes, expiry, 0.02, is_call)
+    repriced = black_scholes(100.0, strikes, expiry, 0.02, solved, is_call)["price"]
+    assert np.allclose(repriced, quote["price"], rtol=1e-8, atol=1e-8)
+    sensitive = quote["vega"] > 1e-2
+    assert np.allclose(solved[sensitive], vols[sensitive], atol=1e-6)
+    assert np.isnan(implied_volatility(150.0, 100.0, 100.0, 1.0, 0.02))
+
+@pytest.mark.asyncio
+async def test_options_strategist_greeks():
+    """Test the strategist reports model Greeks and backs out IV from a quote."""
+    greeks = options_strategist._calculate_greeks(100.0, 100.0, 0.3, 30)
+    assert 0.5 < greeks["delta"] < 0.6
+    assert greeks["theta"] < 0 < greeks["gamma"]
+    quote = black_scholes(100.0, 100.0, 30 / 365.0, options_strategist.risk_free_rate, 0.27)["price"]
+    analysis = await options_strategist.analyze_market("SPY", {"spot_price": 100.0, "strike": 100.0,
+                                                               "option_price": quote, "days_to_expiry": 30})
+    assert analysis["iv"] == pytest.approx(0.27)
+
+def test_vol_surface_fits_svi_and_refits_dirty_slices():
+    """Test an SVI surface recovers its quotes and only refits changed expiries."""
+    surface = VolatilitySurface("SPX", spot=4500.0, rate=0.03)
+    strikes = np.linspace(3500, 5500, 61)
+    true = {0.1: [0.002, 0.05, -0.5, 0.02, 0.1], 0.5: [0.01, 0.1, -0.4, 0.03, 0.15]}
+    expected = {}
+    for expiry, params in true.items():
+        k = np.log(strikes / surface.forward(expiry))
+        expected[expiry] = np.sqrt(svi_total_variance(np.array(params), k) / expiry)
+        surface.update_quotes(expiry, strikes, expected[expiry])
+    assert surface.fit() == 2
+    for expiry, ivs in expected.items():
+        assert np.allclose(surface.implied_vol(strikes, expiry), ivs, atol=1e-4)
+    middle = surface.total_variance(4500.0, 0.3)
+    assert surface.total_variance(4500.0, 0.1) < middle < surface.total_variance(4500.0, 0.5)
+    surface.update_quotes(0.5, [4500.0], [0.5])
+    assert surface.dirty == {0.5}
+    assert surface.fit() == 1
+
+@pytest.mark.asyncio
+async def test_options_strategist_uses_cached_surface(monkeypatch):
+    """Test the strategist reads IV from the underlying's surface and prices structures in bulk."""
+    monkeypatch.setattr(options_strategist, "surfaces", SurfaceCache())
+    surface = options_strategist.surfaces.get("QQQ", 100.0)
+    strikes = np.linspace(80, 120, 21)
+    surface.update_quotes(30 / 365.0, strikes, 0.2 + 0.5 * np.log(strikes / 100.0) ** 2)
+    analysis = await options_strategist.analyze_market("QQQ", {"spot_price": 100.0, "strike": 110.0})
+    assert analysis["iv"] == pytest.approx(0.2 + 0.5 * np.log(1.1) ** 2, abs=1e-3)
+    centers = np.arange(90, 111, dtype=float)[:, None]
+    butterflies = options_strategist.evaluate_structures(
+        "QQQ", 100.0, centers + [-5.0, 0.0, 5.0], 30, [1, -2, 1], True)
+    assert butterflies["price"].shape == (21,)
+    assert (butterflies["price"] > 0).all()
+
+    index = options_strategist.surfaces.get("SPX", 4500.0)
+    index.update_quotes(30 / 365.0, np.linspace(3500, 5500, 21), np.full(21, 0.2))
+    before = float(index.implied_vol(4500.0, 30 / 365.0))
+    await options_strategist.generate_signals("SPX")
+    await options_strategist.analyze_market("SPX", {"spot_price": 100.0, "strike": 4500.0})
+    assert index.spot == 4500.0 and float(index.implied_vol(4500.0, 30 / 365.0)) == pytest.approx(before)
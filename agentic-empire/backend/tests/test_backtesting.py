@@ -1,6 +1,11 @@
 """Tests for backtesting engine."""
 import pytest
-from backtesting.backtest_engine import backtest_engine
+import numpy as np
+from backtesting.backtest_engine import backtest_engine, BacktestEngine
+from backtesting.sweep import run_sweep
+from backtesting.analytics import performance_metrics
+from backtesting.portfolio import PortfolioBacktest
+from consensus.validation_pipeline import ValidationPipeline
 from agents.equity.day_trader import day_trader
 
 @pytest.mark.asyncio
@@ -28,3 +33,106 @@ def test_report_generation():
     report = backtest_engine.generate_report()
     assert isinstance(report, str)
     assert "Backtest Results" in report
+
+class ScriptedStrategy:
+    """Replays a fixed signal script through both backtest paths."""
+
+    def __init__(self, codes):
+        self.codes, self.bar = codes, 0
+
+    async def generate_signals(self, symbol):
+        code, self.bar = self.codes[self.bar], self.bar + 1
+        return [{"action": "buy" if code > 0 else "sell", "symbol": symbol}] if code else []
+
+    def generate_signals_vectorized(self, columns):
+        return np.asarray(self.codes)
+
+@pytest.mark.asyncio
+async def test_vectorized_matches_per_bar_reference():
+    """Test vectorized mode reproduces the per-bar reference path."""
+    codes = [1, 0, 1, -1, 0, -1, 1]
+    historical_data = [{"symbol": "AAPL", "price": 100.0 + i, "volume": 1000} for i in range(len(codes))]
+    engine = BacktestEngine()
+    reference = await engine.run_backtest(ScriptedStrategy(codes), historical_data)
+    fast = await engine.run_backtest(ScriptedStrategy(codes), historical_data, vectorized=True)
+    assert fast["total_trades"] == reference["total_trades"] == 5
+    assert fast["total_return"] == pytest.approx(reference["total_return"])
+
+def test_vectorized_columns_input():
+    """Test vectorized mode on pre-built NumPy columns."""
+    close = np.linspace(100.0, 110.0, 1000)
+    codes = np.zeros(1000)
+    codes[0] = 1
+    metrics = BacktestEngine().run_vectorized(ScriptedStrategy(codes), {"close": close})
+    assert metrics["total_trades"] == 1
+    assert metrics["total_return"] == pytest.approx(10 * 10.0 / 100000.0)
+
+class CrossoverStrategy:
+    """Long when price is above its trailing mean, flat otherwise."""
+
+    def __init__(self, lookback):
+        self.lookback = lookback
+
+    def generate_signals_vectorized(self, columns):
+        close = columns["close"]
+        mean = np.convolve(close, np.ones(self.lookback) / self.lookback, "full")[:len(close)]
+        target = (close > mean).astype(float)
+        return np.diff(target, prepend=0.0)
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_walk_forward_sweep(max_workers):
+    """Test parameter sweep ranks every grid point across windows."""
+    close = 100.0 + np.cumsum(np.random.default_rng(7).normal(0, 1, 2000))
+    timestamps = np.arange(2000, dtype=np.int64)
+    table = run_sweep(CrossoverStrategy, {"lookback": [5, 20, 50]},
+                      {"timestamp": timestamps, "close": close},
+                      train_size=500, test_size=250, start=100, end=1900, max_workers=max_workers)
+    assert [row["windows"] for row in table] == [5, 5, 5]
+    scores = [row["test_total_return"] for row in table]
+    assert scores == sorted(scores, reverse=True)
+
+def test_drawdown_and_win_rate_analytics():
+    """Test drawdown depth/duration and holding-period win rate."""
+    prices = np.array([100.0, 110.0, 99.0, 105.0, 121.0, 120.0])
+    fills = np.array([10.0, 0.0, 0.0, -10.0, 10.0, -10.0])
+    position = np.cumsum(fills)
+    equity = 1000.0 - np.cumsum(fills * prices) + position * prices
+    metrics = performance_metrics(prices, fills, position, equity)
+    assert metrics["max_drawdown"] == pytest.approx(990.0 / 1100.0 - 1)
+    assert metrics["max_drawdown_duration"] == 4
+    assert metrics["win_rate"] == pytest.approx(0.5)
+    assert metrics["total_trades"] == 4
+
+@pytest.mark.asyncio
+async def test_metrics_agree_across_paths():
+    """Test both backtest paths report the same risk metrics."""
+    codes = [1, 0, 0, -1, 1, 0, 0, 0, -1, 0]
+    historical_data = [{"symbol": "AAPL", "price": p, "volume": 1000}
+                       for p in [100.0, 103.0, 101.0, 104.0, 102.0, 99.0, 98.0, 101.0, 97.0, 99.0]]
+    reference = await BacktestEngine().run_backtest(ScriptedStrategy(codes), historical_data)
+    fast = BacktestEngine().run_vectorized(ScriptedStrategy(codes), historical_data)
+    for key in ("sharpe_ratio", "sortino_ratio", "max_drawdown", "win_rate", "turnover", "exposure"):
+        assert fast[key] == pytest.approx(reference[key])
+    assert reference["win_rate"] == pytest.approx(0.5)
+
+class MomentumVoter:
+    """Votes buy after an up bar and sell after a down bar, per symbol."""
+
+    def generate_signals_vectorized(self, frame):
+        return np.sign(np.diff(frame["close"], axis=0, prepend=frame["close"][:1]))
+
+class ContrarianVoter(MomentumVoter):
+    """Always votes against the momentum voters."""
+
+    def generate_signals_vectorized(self, frame):
+        return -super().generate_signals_vectorized(frame)
+
+def test_portfolio_backtest_through_consensus():
+    """Test multi-symbol replay through consensus with sizing and costs."""
+    close = 100.0 + np.cumsum(np.random.default_rng(1).normal(0, 1, (300, 4)), axis=0)
+    pipeline = ValidationPipeline([MomentumVoter(), MomentumVoter(), ContrarianVoter()])
+    costly = PortfolioBacktest(pipeline).run(["A", "B", "C", "D"], {"close": close})
+    free = PortfolioBacktest(pipeline, commission=0.0, slippage=0.0).run(["A", "B", "C", "D"], {"close": close})
+    assert costly["total_trades"] == free["total_trades"] > 0
+    assert costly["total_costs"] > 0 and free["total_costs"] == 0
+    assert costly["equity_curve"][-1] < free["equity_curve"][-1]
@@ -1,7 +1,11 @@
 """Tests for compliance checking system."""
+import threading
+import numpy as np
 import pytest
-from compliance.compliance_officer import compliance_officer
-from datetime import datetime
+from compliance.compliance_officer import ComplianceOfficer, compliance_officer
+from compliance.audit_store import AuditStore
+from compliance.rule_engine import RuleEngine
+from datetime import datetime, timedelta
 
 def test_pattern_day_trader_detection():
     """Test PDT rule enforcement."""
@@ -34,3 +38,106 @@ def test_trade_recording():
     trade = {"symbol": "AAPL", "quantity": 100, "side": "buy"}
     compliance_officer.record_trade(trade)
     assert len(compliance_officer.trade_history) > 0
+    assert compliance_officer.audit_trail("AAPL") == []
+
+def test_rolling_day_trades_and_wash_sales():
+    """Test PDT counting over business days, wash-sale flags and eviction."""
+    officer = ComplianceOfficer()
+    monday = datetime(2024, 3, 4, 10)
+    for day in range(4):
+        when = monday + timedelta(days=day)
+        assert "day_trade" not in officer.record_trade({"symbol": "AAPL", "side": "buy"}, when)
+        assert officer.record_trade({"symbol": "AAPL", "side": "sell"}, when + timedelta(hours=2))["day_trade"]
+    officer.record_trade({"symbol": "MSFT", "side": "sell"}, monday + timedelta(days=4))
+    index = officer.trade_history
+    assert index.day_trades((monday + timedelta(days=4)).timestamp()) == 4
+    # The following Monday is five business days after the first day trade.
+    assert index.day_trades((monday + timedelta(days=7)).timestamp()) == 3
+
+    loss = officer.record_trade({"symbol": "AAPL", "side": "sell", "pnl": -50.0}, monday + timedelta(days=20))
+    assert loss["wash_sale"] is True
+    assert officer.has_wash_sale("MSFT", monday) is False
+    later = monday + timedelta(days=60)
+    officer.record_trade({"symbol": "TSLA", "side": "buy"}, later)
+    assert len(officer.trade_history) == 1
+    assert officer.has_wash_sale("AAPL", later) is False
+    assert officer.record_trade({"symbol": "AAPL", "side": "sell", "pnl": -5.0}, later).get("wash_sale") is None
+
+def test_buy_after_loss_sale_is_wash_sale_and_day_trades_are_trimmed():
+    """Test buys within 30 days after a loss sale are flagged and PDT state stays bounded."""
+    officer = ComplianceOfficer()
+    sale = officer.record_trade({"symbol": "X", "side": "sell", "pnl": -20.0}, datetime(2024, 5, 1, 10))
+    assert "wash_sale" not in sale
+    assert officer.record_trade({"symbol": "X", "side": "buy"}, datetime(2024, 5, 6, 10))["wash_sale"] is True
+    assert "wash_sale" not in officer.record_trade({"symbol": "X", "side": "buy"}, datetime(2024, 6, 5, 10))
+
+    officer = ComplianceOfficer()
+    start = datetime(2023, 1, 2, 10)
+    for day in range(300):
+        when = start + timedelta(days=day)
+        officer.record_trade({"symbol": "AAPL", "side": "buy"}, when)
+        officer.record_trade({"symbol": "AAPL", "side": "sell"}, when + timedelta(hours=1))
+    assert len(officer.trade_history.day_trade_days) <= 5
+
+def test_rule_engine_checks_and_atomic_reload():
+    """Test compiled rules, live locks, the batch path and reloads."""
+    engine = RuleEngine({"restricted_symbols": ["GME"], "symbol_limits": {"AAPL": {"max_quantity": 500}},
+                         "account_limits": {"default": {"max_notional": 100000}}})
+    assert engine.allows("AAPL", 100, "buy", 150.0)
+    assert not engine.allows("GME", 1, "buy")
+    assert engine.check("AAPL", 600, "buy", 150.0)["violations"] == ["Quantity limit exceeded"]
+    assert engine.check("MSFT", 400, "hold", 300.0)["violations"] == ["Invalid side",
+                                                                      "Account notional limit exceeded"]
+    officer = ComplianceOfficer(engine)
+    officer.record_trade({"symbol": "TSLA", "side": "sell", "pnl": -10.0})
+    assert officer.validate_trade("TSLA", 1, "buy")["violations"] == ["Wash sale lock"]
+    assert officer.validate_trade("TSLA", 1, "sell")["approved"] is True
+
+    symbols = ["AAPL", "GME", "TSLA", "TSLA", "MSFT", "AAPL"]
+    quantities = [100, 1, 1, 1, 400, 600]
+    sides = ["buy", "buy", "buy", "sell", "sell", "sell"]
+    prices = [150.0, 20.0, 200.0, 200.0, 300.0, float("nan")]
+    expected = [engine.allows(s, q, d, None if p != p else p)
+                for s, q, d, p in zip(symbols, quantities, sides, prices)]
+    assert engine.check_batch(symbols, quantities, sides, prices).tolist() == expected == [
+        True, False, False, True, False, False]
+
+    before = engine.rules
+    assert engine.load({"restricted_symbols": ["AAPL"]}) == before.version + 1
+    assert before.restricted == {"GME"} and not engine.allows("AAPL", 1, "sell")
+    assert engine.allows("GME", 1, "sell") and not engine.allows("TSLA", 1, "buy")
+
+def test_rule_engine_concurrent_locks_are_not_lost():
+    """Test concurrent wash-sale locks on different symbols all survive."""
+    engine = RuleEngine()
+    until = datetime.now().timestamp() + 3600
+    threads = [threading.Thread(target=engine.lock_wash_sale, args=(f"SYM{i}", until)) for i in range(50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(engine.rules.wash_sale_locks) == 50 and engine.rules.version == 50
+
+def test_audit_store_seals_partitions_and_prunes_queries(tmp_path):
+    """Test sealed day segments, pruned queries across tiers and reopening."""
+    store = AuditStore(str(tmp_path), hot_days=1)
+    officer = ComplianceOfficer(audit=store)
+    start = datetime(2024, 5, 1, 14)
+    for i in range(400):
+        officer.record_trade({"symbol": ("AAPL", "MSFT", "TSLA")[i % 3], "side": ("buy", "sell")[i % 2],
+                              "quantity": i, "price": 100.0 + i}, start + timedelta(minutes=15 * i))
+    assert len(store) == 400 and len(store.segments) >= 2
+    assert all(not (tmp_path / s["path"]).is_dir() for s in store.segments)
+
+    trail = officer.audit_trail("MSFT", datetime(2024, 5, 1), datetime(2024, 5, 1, 23, 59))
+    assert [t["quantity"] for t in trail] == [i for i in range(40) if i % 3 == 1]
+    store.segments_scanned = 0
+    columns = store.query("TSLA", start=(start + timedelta(days=1)).timestamp())
+    assert store.segments_scanned < len(store.segments)
+    assert set(columns["symbol"]) == {"TSLA"} and np.all(np.diff(columns["timestamp"]) >= 0)
+
+    store.seal()
+    reopened = AuditStore(str(tmp_path))
+    everything = reopened.query()
+    assert len(everything["timestamp"]) == 400
+    assert sorted(everything["quantity"].tolist()) == list(range(400))
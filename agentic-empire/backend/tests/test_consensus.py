@@ -0,0 +1,93 @@
+"""Tests for multi-agent consensus pipeline."""
+import asyncio
+import time
+import pytest
+import numpy as np
+from consensus.scanner import ConsensusScanner
+from consensus.validation_pipeline import ValidationPipeline
+
+def test_consensus_batch_matches_scalar():
+    """Test vectorized consensus agrees with the per-symbol calculation."""
+    pipeline = ValidationPipeline()
+    votes = np.random.default_rng(3).integers(-1, 2, size=(5, 200))
+    actions, confidence = pipeline.calculate_consensus_batch(votes)
+    names = {1: "buy", -1: "sell", 0: "hold"}
+    for col in range(votes.shape[1]):
+        signals = [{"action": names[v]} for v in votes[:, col] if v]
+        expected = pipeline._calculate_consensus(signals)
+        assert names[actions[col]] == expected["action"]
+        assert confidence[col] == pytest.approx(expected["confidence"])
+
+class StubAgent:
+    """Agent returning fixed signals after an optional delay."""
+
+    def __init__(self, role, action, delay=0.0, wins=0, trades=0):
+        self.role, self.action, self.delay = role, action, delay
+        self.performance = {"trades": trades, "wins": wins, "losses": trades - wins, "pnl": 0.0}
+
+    async def generate_signals(self, symbol):
+        await asyncio.sleep(self.delay)
+        return [{"action": self.action, "symbol": symbol, "confidence": 0.8}]
+
+@pytest.mark.asyncio
+async def test_concurrent_consensus_respects_deadline():
+    """Test a slow agent is cut off and reported while the rest still vote."""
+    pipeline = ValidationPipeline([StubAgent("fast-1", "buy"), StubAgent("fast-2", "buy"),
+                                   StubAgent("slow", "sell", delay=5.0)])
+    started = time.perf_counter()
+    result = await pipeline.get_consensus_concurrent("AAPL", agent_timeout=0.05, deadline=1.0)
+    assert time.perf_counter() - started < 1.0
+    assert result["action"] == "buy"
+    assert result["partial"] is True
+    assert result["agents"]["slow"]["status"] == "timeout"
+    assert result["agents"]["fast-1"]["latency"] < 0.05
+
+@pytest.mark.asyncio
+async def test_concurrent_consensus_weights_track_record():
+    """Test a proven dissenter blocks a majority of unproven agents."""
+    pipeline = ValidationPipeline([StubAgent("veteran", "sell", wins=95, trades=100),
+                                   StubAgent("new-1", "buy"), StubAgent("new-2", "buy")])
+    result = await pipeline.get_consensus_concurrent("AAPL")
+    assert result["action"] == "hold"
+    assert result["partial"] is False
+    assert (await pipeline.get_consensus("AAPL"))["action"] == "buy"
+
+class CountingAgent(StubAgent):
+    """Stub agent on a fixed timeframe that counts queries and peak concurrency."""
+
+    def __init__(self, role, action, timeframe, delay=0.0):
+        super().__init__(role, action, delay)
+        self.timeframe, self.calls, self.active, self.peak = timeframe, 0, 0, 0
+
+    async def generate_signals(self, symbol):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            return await super().generate_signals(symbol)
+        finally:
+            self.active -= 1
+
+@pytest.mark.asyncio
+async def test_scanner_bounds_concurrency_and_streams_results():
+    """Test the scanner never exceeds its limit and yields every symbol."""
+    agent = CountingAgent("day", "buy", "1m", delay=0.01)
+    scanner = ConsensusScanner(ValidationPipeline([agent]), concurrency=4)
+    symbols = [f"SYM{i}" for i in range(20)]
+    results = {symbol: result async for symbol, result in scanner.scan(symbols, 0.0)}
+    assert set(results) == set(symbols)
+    assert all(result["action"] == "buy" for result in results.values())
+    assert agent.peak == 4
+
+@pytest.mark.asyncio
+async def test_scanner_caches_signals_per_agent_timeframe():
+    """Test slower agents are only re-queried once their own bar closes."""
+    fast, slow = CountingAgent("day", "buy", "1m"), CountingAgent("swing", "buy", "4h")
+    scanner = ConsensusScanner(ValidationPipeline([fast, slow]))
+    for minute in range(3):
+        [_ async for _ in scanner.scan(["AAPL", "MSFT"], 14400.0 + 60 * minute)]
+    assert fast.calls == 6
+    assert slow.calls == 2
+    [_ async for _ in scanner.scan(["AAPL", "MSFT"], 28800.0)]
+    assert slow.calls == 4
+    assert scanner.cache.hits == 4
@@ -0,0 +1,56 @@
+"""Tests for DLP scanning."""
+from concurrent.futures import ThreadPoolExecutor
+import io
+from services.dlp import PII_PATTERN, DLPScanner
+from services.dlp_stream import StreamingDLPScanner
+
+def test_dlp_lazy_persisted_model(tmp_path):
+    """Test the model is fitted once on first scan, then loaded from disk."""
+    path = str(tmp_path / "dlp.joblib")
+    scanner = DLPScanner(model_path=path)
+    assert scanner._model is None
+    assert scanner.scan("my ssn is 123-45-6789") is False
+    assert scanner._model is None  # Regex hits never need the model
+    verdict = scanner.scan("quarterly revenue summary")
+    assert (tmp_path / "dlp.joblib").exists()
+    assert DLPScanner(model_path=path).scan("quarterly revenue summary") == verdict
+
+def test_dlp_concurrent_first_fits_share_model_path(tmp_path):
+    """Test workers fitting at once each publish a whole model without temp-file clashes."""
+    path = str(tmp_path / "dlp.joblib")
+    scanners = [DLPScanner(model_path=path) for _ in range(4)]
+    with ThreadPoolExecutor(4) as pool:
+        verdicts = list(pool.map(lambda scanner: scanner.scan("quarterly revenue summary"), scanners))
+    assert len(set(verdicts)) == 1
+    assert [p.name for p in tmp_path.iterdir()] == ["dlp.joblib"]
+    assert DLPScanner(model_path=path).scan("quarterly revenue summary") == verdicts[0]
+
+def test_dlp_scan_batch_and_cache(tmp_path):
+    """Test batch results match single scans and repeats hit the cache."""
+    scanner = DLPScanner(model_path=str(tmp_path / "dlp.joblib"))
+    texts = ["contact bob@example.com", "no pii here", "health record: diabetes", "no pii here"]
+    batch = scanner.scan_batch(texts)
+    assert batch[0] is False and batch[1] == batch[3]
+    assert scanner.misses == 2
+    assert [scanner.scan(text) for text in texts] == batch
+    assert scanner.hits == 3
+
+def test_streaming_scan_matches_whole_text_across_boundaries():
+    """Test chunked findings equal a single regex pass however chunks split the text."""
+    words = ["alpha", "123-45-6789", "bob.smith@example.com", "a123-45-6789", "foo@bar.io", "é"]
+    text = " ".join(words[(i * 7) % len(words)] for i in range(3000))
+    expected = [(m.lastgroup, m.start(), m.end()) for m in PII_PATTERN.finditer(text)]
+    for chunk_size in (64, 97, 4096):
+        scanner = StreamingDLPScanner(chunk_size=chunk_size, overlap=32)
+        for stream in (io.StringIO(text), io.BytesIO(text.encode())):
+            found = [(f["type"], f["start"], f["end"]) for f in scanner.iter_findings(stream)]
+            assert found == expected
+
+def test_streaming_scan_stops_on_first_hit(tmp_path):
+    """Test early exit reports only the first finding and clean files pass."""
+    path = tmp_path / "contract.txt"
+    path.write_text("clause " * 50000 + "reach me at jane@corp.com or 987-65-4321")
+    result = StreamingDLPScanner(chunk_size=4096, overlap=64).scan_file(str(path))
+    assert result["clean"] is False
+    assert result["findings"] == [{"type": "email", "start": 350012, "end": 350025}]
+    assert StreamingDLPScanner().scan(io.StringIO("clause " * 1000))["clean"] is True
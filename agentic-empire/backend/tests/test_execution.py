@@ -1,6 +1,15 @@
 """Tests for order execution and management."""
+import asyncio
+import time
 import pytest
-from execution.order_manager import order_manager, OrderType
+from execution.order_manager import order_manager, OrderManager, OrderType
+from compliance.compliance_officer import compliance_officer
+from compliance.rule_engine import RuleEngine
+from execution.journal import Journal, HEADER
+from execution.matching_engine import MatchingEngine
+from brokers.universal_adapter import BrokerType, create_broker_adapter
+from brokers.fake_broker import FakeBrokerAdapter
+from brokers.gateway import OrderGateway
 
 @pytest.mark.asyncio
 async def test_submit_market_order():
@@ -32,3 +41,260 @@ def test_order_tracking():
     """Test order status tracking."""
     assert hasattr(order_manager, "orders")
     assert isinstance(order_manager.orders, dict)
+
+@pytest.mark.asyncio
+async def test_bulk_submit_and_indexed_queries():
+    """Test bulk submission feeds the symbol, status and tag indexes."""
+    manager = OrderManager()
+    ids = await manager.submit_orders(
+        [{"symbol": "AAPL" if i % 2 else "MSFT", "quantity": 10, "order_type": "limit", "price": 100.0 + i,
+          "tag": "grid" if i < 6 else None} for i in range(10)])
+    assert len(ids) == 10 and len(set(ids)) == 10
+    assert len(manager.get_open_orders("AAPL")) == 5
+    assert len(manager.get_open_orders(tag="grid")) == 6
+    await manager.cancel_order(ids[1])
+    assert len(manager.orders.select(symbol="AAPL", status="cancelled")) == 1
+    assert await manager.cancel_order(ids[1]) is False
+
+@pytest.mark.asyncio
+async def test_cancel_all_by_symbol_and_tag():
+    """Test cancel-all only touches open orders matching the filter."""
+    manager = OrderManager()
+    for symbol in ["AAPL", "AAPL", "TSLA"]:
+        await manager.submit_order(symbol, 1, OrderType.MARKET, tag="hedge")
+    keep = await manager.submit_order("TSLA", 1, OrderType.MARKET)
+    assert len(await manager.cancel_all(symbol="AAPL")) == 2
+    assert manager.get_open_orders("AAPL") == []
+    assert len(await manager.cancel_all(tag="hedge")) == 1
+    assert [o["id"] for o in manager.get_open_orders()] == [keep]
+
+def test_matching_engine_price_time_priority():
+    """Test better prices fill first, then earlier orders at the same price."""
+    fills = []
+    engine = MatchingEngine(on_fill=fills.append)
+    for order_id, price in [("A", 101.0), ("B", 100.0), ("C", 100.0)]:
+        engine.submit("AAPL", "sell", 10, "limit", price, order_id)
+    result = engine.submit("AAPL", "buy", 25, "limit", 101.0, "T")
+    assert result == {"order_id": "T", "status": "filled", "filled": 25}
+    makers = [(f["order_id"], f["quantity"], f["price"]) for f in fills if f["liquidity"] == "maker"]
+    assert makers == [("B", 10, 100.0), ("C", 10, 100.0), ("A", 5, 101.0)]
+    assert engine.book("AAPL").depth("sell") == [(101.0, 5)]
+
+def test_matching_engine_market_and_stop_orders():
+    """Test market remainders are dropped and stops trigger on the last trade."""
+    engine = MatchingEngine()
+    engine.submit("AAPL", "buy", 5, "limit", 99.0)
+    engine.submit("AAPL", "buy", 5, "limit", 98.0)
+    stop = engine.submit("AAPL", "sell", 5, "stop", 98.5)
+    assert stop["status"] == "pending"
+    assert engine.submit("AAPL", "sell", 5, "market")["status"] == "filled"
+    assert "ME3" in engine.stops
+    assert engine.submit("AAPL", "sell", 1, "market")["status"] == "filled"
+    assert engine.stops == {}
+    assert engine.book("AAPL").best_bid() is None
+    assert engine.submit("AAPL", "sell", 1, "market") == {"order_id": "ME6", "status": "cancelled", "filled": 0}
+    resting = engine.submit("AAPL", "buy", 5, "limit", 97.0)
+    assert engine.cancel(resting["order_id"]) is True
+    assert engine.book("AAPL").best_bid() is None
+    for side, order_type in [("buy", "stop"), ("sell", "stop"), ("buy", "limit")]:
+        with pytest.raises(ValueError):
+            engine.submit("AAPL", side, 1, order_type)
+    assert engine.stops == {} and not engine.book("AAPL").buy_stops
+
+@pytest.mark.asyncio
+async def test_order_manager_paper_fills():
+    """Test an attached engine fills orders and records partial fills."""
+    manager = OrderManager(engine=MatchingEngine())
+    resting = await manager.submit_order("AAPL", 10, OrderType.LIMIT, price=100.0, side="sell")
+    taker = await manager.submit_order("AAPL", 4, OrderType.MARKET, side="buy")
+    assert manager.get_order_status(taker)["status"] == "filled"
+    assert manager.get_order_status(resting)["status"] == "partially_filled"
+    assert manager.get_order_status(resting)["filled"] == 4
+    assert len(manager.fills) == 2
+    assert await manager.cancel_all(symbol="AAPL") == [resting]
+    unfilled = await manager.submit_order("AAPL", 3, OrderType.MARKET, side="buy")
+    assert manager.get_order_status(unfilled)["status"] == "cancelled"
+
+@pytest.mark.asyncio
+async def test_paper_broker_adapter():
+    """Test the paper broker fills crossing orders and tracks positions."""
+    broker = create_broker_adapter("paper", {})
+    broker.engine.submit("BTC/USD", "sell", 2, "limit", 30000.0)  # Outside liquidity
+    order = await broker.place_order("BTC/USD", 1, "market", side="buy")
+    assert order["status"] == "filled"
+    assert [f["price"] for f in broker.fills] == [30000.0]
+    assert await broker.get_positions() == [{"symbol": "BTC/USD", "quantity": 1.0}]
+    assert broker.balance == 100000.0 - 30000.0
+    assert await broker.cancel_order(order["order_id"]) is False
+    for args in [("BTC/USD", 1, "iceberg", 1.0), ("BTC/USD", 0, "market"), ("BTC/USD", -1, "limit", 1.0)]:
+        with pytest.raises(ValueError):
+            await broker.place_order(*args)
+
+@pytest.mark.asyncio
+async def test_gateway_pools_connections_and_coalesces_batches():
+    """Test queued submits and cancels share persistent connections and batch calls."""
+    adapters = []
+    def factory(broker_type):
+        adapters.append(FakeBrokerAdapter(broker_type, latency=0.01))
+        return adapters[-1]
+    gateway = OrderGateway(factory=factory, limits={BrokerType.PAPER: {
+        "rate": 1000.0, "burst": 1000, "max_batch": 50, "pool_size": 2, "max_in_flight": 500}})
+    acks = await asyncio.gather(*(gateway.place_order(BrokerType.PAPER, "AAPL", 1, "limit", 100.0)
+                                  for _ in range(200)))
+    assert len({ack["order_id"] for ack in acks}) == 200
+    assert await asyncio.gather(*(gateway.cancel_order(BrokerType.PAPER, ack["order_id"]) for ack in acks))
+    stats = gateway.stats()["paper"]
+    assert len(adapters) == 2 and all(a.connects == 1 for a in adapters)
+    assert stats["requests"] == 400 and stats["calls"] < 40
+    assert stats["queue_depth"] == 0 and stats["latency_ms"]["p50"] >= 10
+    await gateway.close()
+
+@pytest.mark.asyncio
+async def test_gateway_paper_orders_share_one_book():
+    """Test paper orders through the default gateway cross and cancel on a single book."""
+    gateway = OrderGateway()
+    resting = await asyncio.gather(*(gateway.place_order(BrokerType.PAPER, "AAPL", 1, "limit", 100.0 + i,
+                                                         side="sell") for i in range(8)))
+    assert len({ack["order_id"] for ack in resting}) == 8
+    taker = await gateway.place_order(BrokerType.PAPER, "AAPL", 4, "market", side="buy")
+    assert taker["status"] == "filled"
+    assert await gateway.cancel_order(BrokerType.PAPER, resting[-1]["order_id"]) is True
+    assert gateway.stats()["paper"]["connections"] == 1
+    await gateway.close()
+
+@pytest.mark.asyncio
+async def test_gateway_adapts_payloads_and_fails_cleanly():
+    """Test kwargs follow each adapter's signature, short batches fail and failed connects retry."""
+    gateway = OrderGateway()
+    ack = await gateway.place_order(BrokerType.ALPACA, "AAPL", 1, "market", side="sell")
+    assert ack["status"] == "submitted"
+
+    class ShortBatchBroker(FakeBrokerAdapter):
+        async def place_orders(self, orders):
+            return (await super().place_orders(orders))[:1]
+
+    attempts = []
+    def factory(broker_type):
+        attempts.append(broker_type)
+        if len(attempts) == 1:
+            raise ConnectionError("broker down")
+        return ShortBatchBroker(broker_type, latency=0.01)
+    gateway = OrderGateway(factory=factory, limits={BrokerType.PAPER: {
+        "rate": 1000.0, "burst": 1000, "max_batch": 10, "pool_size": 1, "max_in_flight": 10}})
+    with pytest.raises(ConnectionError):
+        await gateway.place_order(BrokerType.PAPER, "AAPL", 1, "limit", 100.0)
+    results = await asyncio.wait_for(asyncio.gather(
+        *(gateway.place_order(BrokerType.PAPER, "AAPL", 1, "limit", 100.0) for _ in range(4)),
+        return_exceptions=True), timeout=1.0)
+    assert len(attempts) == 2
+    assert any(isinstance(r, RuntimeError) for r in results) and any(isinstance(r, dict) for r in results)
+    await gateway.close()
+
+@pytest.mark.asyncio
+async def test_gateway_token_bucket_limits_request_rate():
+    """Test a broker without batch support is held to its request rate."""
+    gateway = OrderGateway(factory=lambda bt: FakeBrokerAdapter(bt, latency=0.0), limits={BrokerType.ALPACA: {
+        "rate": 50.0, "burst": 1, "max_batch": 1, "pool_size": 1, "max_in_flight": 10}})
+    started = time.perf_counter()
+    await asyncio.gather(*(gateway.place_order(BrokerType.ALPACA, "AAPL", 1, "market") for _ in range(11)))
+    assert time.perf_counter() - started >= 0.18
+    assert gateway.stats()["alpaca"]["calls"] == 11
+    await gateway.close()
+
+def _state(manager):
+    return ([(r.id, r.symbol, r.quantity, r.price, r.status, r.tag, r.side, r.filled)
+             for r in manager.orders.values()], manager.fills, manager.order_id_counter)
+
+@pytest.mark.asyncio
+async def test_journal_recovers_orders_fills_and_cancels(tmp_path):
+    """Test replaying the journal rebuilds the order manager exactly."""
+    journal = Journal(str(tmp_path))
+    manager = OrderManager(engine=MatchingEngine(), journal=journal)
+    await manager.submit_order("AAPL", 10, OrderType.LIMIT, 100.0, side="sell", tag="mm")
+    await manager.submit_order("AAPL", 4, OrderType.LIMIT, 101.0, side="buy")
+    resting = await manager.submit_order("AAPL", 5, OrderType.LIMIT, 99.0, side="buy")
+    await manager.cancel_order(resting)
+    journal.close()
+
+    recovered = OrderManager(journal=Journal(str(tmp_path)))
+    assert _state(recovered) == _state(manager)
+    assert recovered.orders.open_orders("AAPL")[0].filled == 4
+    assert recovered.get_order_status(resting)["status"] == "cancelled"
+    recovered.journal.close()
+
+@pytest.mark.asyncio
+async def test_journal_snapshot_and_torn_tail(tmp_path):
+    """Test recovery from a snapshot plus tail, ignoring a half-written last record."""
+    journal = Journal(str(tmp_path), snapshot_interval=4)
+    manager = OrderManager(engine=MatchingEngine(), journal=journal)
+    for i in range(5):
+        await manager.submit_order("MSFT", 1, OrderType.LIMIT, 300.0 + i, side="sell")
+    assert journal.snapshot_sequence == 4 and (tmp_path / "snapshot.bin").exists()
+    expected = _state(manager)
+    await manager.submit_order("MSFT", 1, OrderType.LIMIT, 299.0, side="sell")
+    journal.close()
+
+    segment = sorted(tmp_path.glob("*.wal"))[-1]
+    data = segment.read_bytes()
+    segment.write_bytes(data[:-(HEADER.size // 2)])
+    recovered = OrderManager(journal=Journal(str(tmp_path)))
+    assert _state(recovered) == expected
+    await recovered.submit_order("MSFT", 1, OrderType.MARKET)
+    recovered.journal.close()
+    again = OrderManager(journal=Journal(str(tmp_path)))
+    assert _state(again) == _state(recovered)
+    again.journal.close()
+
+@pytest.mark.asyncio
+async def test_journal_stops_at_corrupt_record_and_rebuilds_engine(tmp_path):
+    """Test replay ends at the first corrupt record and open orders return to the engine."""
+    manager = OrderManager(engine=MatchingEngine(), journal=Journal(str(tmp_path)))
+    await manager.submit_order("AAPL", 10, OrderType.LIMIT, 100.0, side="sell")
+    await manager.submit_order("AAPL", 5, OrderType.LIMIT, 101.0, side="sell")
+    expected = _state(manager)
+    await manager.submit_order("AAPL", 1, OrderType.LIMIT, 102.0, side="sell")
+    manager.journal.close()
+    manager = OrderManager(engine=MatchingEngine(), journal=Journal(str(tmp_path)))
+    await manager.submit_order("AAPL", 1, OrderType.LIMIT, 103.0, side="sell")
+    manager.journal.close()
+    first, second = sorted(tmp_path.glob("*.wal"))
+    data = bytearray(first.read_bytes())
+    data[-1] ^= 0xFF
+    first.write_bytes(bytes(data))
+
+    engine = MatchingEngine()
+    recovered = OrderManager(engine=engine, journal=Journal(str(tmp_path)))
+    assert _state(recovered) == expected and not second.exists()
+    assert engine.book("AAPL").best_ask() == 100.0
+    taker = await recovered.submit_order("AAPL", 12, OrderType.MARKET, side="buy")
+    assert recovered.get_order_status(taker)["status"] == "filled"
+    assert [f["price"] for f in recovered.fills if f["order_id"] == taker] == [100.0, 101.0]
+    recovered.journal.close()
+    again = OrderManager(journal=Journal(str(tmp_path)))
+    assert _state(again) == _state(recovered)
+    again.journal.close()
+
+@pytest.mark.asyncio
+async def test_order_manager_pre_trade_compliance():
+    """Test refused orders are recorded as rejected and never reach the engine."""
+    engine = MatchingEngine()
+    manager = OrderManager(engine=engine, compliance=RuleEngine({"restricted_symbols": ["GME"]}))
+    rejected = await manager.submit_order("GME", 10, OrderType.LIMIT, 20.0)
+    accepted = await manager.submit_order("AAPL", 10, OrderType.LIMIT, 100.0)
+    basket = await manager.submit_orders([{"symbol": s, "quantity": 5, "order_type": "limit", "price": 50.0}
+                                          for s in ("GME", "MSFT")])
+    assert manager.get_order_status(rejected)["status"] == "rejected"
+    assert manager.get_order_status(accepted)["status"] == "pending"
+    assert [manager.get_order_status(o)["status"] for o in basket] == ["rejected", "pending"]
+    assert engine.book("GME").best_bid() is None and engine.book("MSFT").best_bid() == 50.0
+
+@pytest.mark.asyncio
+async def test_global_order_manager_uses_compliance_rules():
+    """Test the global manager rejects symbols restricted by the global officer."""
+    rules = compliance_officer.rules.rules
+    compliance_officer.rules.load({"restricted_symbols": ["GME"]})
+    try:
+        order_id = await order_manager.submit_order("GME", 10, OrderType.MARKET)
+        assert order_manager.get_order_status(order_id)["status"] == "rejected"
+    finally:
+        compliance_officer.rules.rules = rules
@@ -0,0 +1,47 @@
+"""Tests for streaming and vectorized technical indicators."""
+import pytest
+import numpy as np
+from indicators import streaming, vectorized
+
+@pytest.fixture
+def bars():
+    rng = np.random.default_rng(11)
+    close = 100.0 + np.cumsum(rng.normal(0, 1, 6000))
+    return {"close": close, "high": close + rng.random(6000), "low": close - rng.random(6000),
+            "volume": rng.integers(1, 1000, 6000).astype(float)}
+
+def replay(indicator, *columns):
+    return np.array([indicator.update(*values) for values in zip(*columns)])
+
+def test_ema_and_rsi_forms_agree(bars):
+    """Test incremental EMA/RSI match the vectorized arrays."""
+    assert np.allclose(replay(streaming.EMA(26), bars["close"]), vectorized.ema(bars["close"], 26))
+    assert np.allclose(replay(streaming.RSI(14), bars["close"]), vectorized.rsi(bars["close"], 14))
+
+def test_macd_atr_bollinger_vwap_forms_agree(bars):
+    """Test the remaining incremental indicators match the vectorized arrays."""
+    close, high, low, volume = bars["close"], bars["high"], bars["low"], bars["volume"]
+    macd = [m["histogram"] for m in replay(streaming.MACD(), close)]
+    assert np.allclose(macd, vectorized.macd(close)["histogram"])
+    assert np.allclose(replay(streaming.ATR(), high, low, close), vectorized.atr(high, low, close))
+    bands = [b["upper"] for b in replay(streaming.Bollinger(), close)]
+    assert np.allclose(bands, vectorized.bollinger(close)["upper"])
+    assert np.allclose(replay(streaming.VWAP(), close, volume, high, low),
+                       vectorized.vwap(close, volume, high, low))
+
+def test_vectorized_universe_matches_single_symbol(bars):
+    """Test (bars, symbols) arrays compute each column independently."""
+    universe = np.stack([bars["close"], bars["close"][::-1]], axis=1)
+    assert np.allclose(vectorized.rsi(universe)[:, 1], vectorized.rsi(bars["close"][::-1]))
+    assert np.allclose(vectorized.bollinger(universe)["lower"][:, 0],
+                       vectorized.bollinger(bars["close"])["lower"])
+
+def test_streaming_bollinger_stays_exact_over_long_runs():
+    """Test the incremental window statistics do not drift over many ticks."""
+    prices = 10000.0 + np.cumsum(np.random.default_rng(7).normal(0, 1, 100_000))
+    bands = streaming.Bollinger(period=50)
+    for price in prices:
+        bands.update(price)
+    window = prices[-50:]
+    assert bands.value["middle"] == pytest.approx(window.mean(), rel=1e-12)
+    assert bands.value["upper"] - bands.value["middle"] == pytest.approx(2 * window.std(), rel=1e-8)
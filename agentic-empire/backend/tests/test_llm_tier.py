@@ -1,16 +1,82 @@
 import pytest
+from core import llm_cache, llm_tier
+from core.llm_cache import ResponseCache
 from core.llm_tier import tiered_generate
 
 @pytest.mark.asyncio
-async def test_tiered_generate_small_prompt():
+async def test_tiered_generate_small_prompt(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_tier, "llm_cache", ResponseCache(str(tmp_path / "cache.sqlite3")))
     prompt = "Hello"
     response = await tiered_generate(prompt)
     assert isinstance(response, str)
     # Check that small model is used (mock needed for full test)
 
 @pytest.mark.asyncio
-async def test_tiered_generate_large_prompt():
+async def test_tiered_generate_large_prompt(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_tier, "llm_cache", ResponseCache(str(tmp_path / "cache.sqlite3")))
     prompt = "A" * 2000  # Large prompt
     response = await tiered_generate(prompt)
     assert isinstance(response, str)
-    # Check that large model and GPU priority are used
\ No newline at end of file
+    # Check that large model and GPU priority are used
+
+@pytest.mark.asyncio
+async def test_tiered_generate_caches_responses(tmp_path, monkeypatch):
+    calls = []
+
+    async def generate(prompt, model="llama2", gpu_priority=False):
+        calls.append((prompt, model))
+        return f"answer {len(calls)}"
+
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttls={"Dashboard": 300, "HealthProbe": 0})
+    monkeypatch.setattr(llm_tier, "llm_cache", cache)
+    monkeypatch.setattr(llm_tier.ollama_svc, "generate", generate)
+    assert await tiered_generate("Status  report\n", caller="Dashboard") == "answer 1"
+    assert await tiered_generate("Status report", caller="Dashboard") == "answer 1"
+    assert await tiered_generate("A" * 4000, caller="Dashboard") == "answer 2"
+    assert calls[1][1] == llm_tier.LARGE_LLM_MODEL
+    assert await tiered_generate("Status report", caller="HealthProbe") == "answer 3"
+    assert await tiered_generate("Status report") == "answer 4"  # Uncached unless opted in
+    assert cache.stats()["memory_hits"] == 1
+
+    reopened = ResponseCache(str(tmp_path / "cache.sqlite3"), ttls={"Dashboard": 300})
+    assert reopened.get("Status report", llm_tier.SMALL_LLM_MODEL, caller="Dashboard") == "answer 1"
+    assert reopened.stats()["disk_hits"] == 1
+
+def test_response_cache_ttl_and_eviction(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), max_entries=2, max_disk_entries=3,
+                          ttls={"report": 3600, "chart": 5})
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    for i in range(4):
+        cache.put(f"prompt {i}", f"r{i}", "m", caller="report")
+        now[0] += 1
+    # A disk hit on the oldest row is flushed with the next put and protects it from eviction.
+    cache.memory.clear()
+    assert cache.get("prompt 1", "m", caller="report") == "r1"
+    cache.put("chart", "c", "m", caller="chart")
+    assert len(cache.memory) == 2 and cache.stats()["disk_entries"] == 3
+    assert cache.get("prompt 2", "m", caller="report") is None
+    assert cache.get("prompt 1", "m", caller="report") == "r1"
+    assert cache.get("chart", "m", {"temperature": 0.2}, caller="chart") is None
+    now[0] += 10
+    assert cache.get("chart", "m", caller="chart") is None
+    assert llm_cache.parse_ttls("Dashboard=300, HealthProbe=0") == {"Dashboard": 300.0, "HealthProbe": 0.0}
+
+@pytest.mark.asyncio
+async def test_agents_and_named_callers_use_shipped_ttls(tmp_path, monkeypatch):
+    from agents.it import ITAgent
+    calls = []
+
+    async def generate(prompt, model="llama2", gpu_priority=False):
+        calls.append(prompt)
+        return "ok"
+
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    assert cache.ttl_for("Dashboard") > 0 and cache.ttl_for("HealthProbe") > 0
+    assert cache.ttl_for("chat") == 0 and cache.ttl_for(None) == 0
+    monkeypatch.setattr(llm_tier, "llm_cache", cache)
+    monkeypatch.setattr(llm_tier.ollama_svc, "generate", generate)
+    agent = ITAgent()
+    await agent.perform_task("restart the build server")
+    await agent.perform_task("restart the build server")
+    assert len(calls) == 1
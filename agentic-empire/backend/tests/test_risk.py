@@ -1,12 +1,19 @@
 """Tests for risk management system."""
+import time
+import numpy as np
 import pytest
-from risk.risk_manager import risk_manager
+from risk.risk_manager import RiskManager, risk_manager
+from risk.mark_to_market import MarkToMarket
+from risk.var_engine import VaREngine
 
 def test_position_size_calculation():
     """Test position sizing logic."""
     size = risk_manager.calculate_position_size("AAPL", 150.0)
     assert size > 0
     assert size <= risk_manager.portfolio_value / 150.0
+    assert type(size) is float
+    sizes = risk_manager.calculate_position_size("", np.array([150.0, 300.0]))
+    assert isinstance(sizes, np.ndarray) and sizes.shape == (2,)
 
 def test_risk_limits_check():
     """Test risk limit validation."""
@@ -30,3 +37,105 @@ def test_max_position_size():
     large_quantity = 10000
     result = risk_manager.check_risk_limits("TSLA", large_quantity, 200.0)
     assert result is False
+
+def test_incremental_exposure_and_batch_checks():
+    """Test running exposure totals and that batch checks match single checks."""
+    manager = RiskManager(max_sector_exposure=0.15)
+    manager.update_position("AAPL", 50, 150.0, sector="tech")
+    manager.update_position("MSFT", 20, 300.0, sector="tech")
+    manager.update_position("XOM", -40, 100.0, sector="energy")
+    manager.update_position("AAPL", 40, 160.0)
+    assert manager.gross_exposure == 6400 + 6000 + 4000
+    assert manager.net_exposure == 6400 + 6000 - 4000
+    assert manager.sector_exposure == {"tech": 12400, "energy": 4000}
+
+    rng = np.random.default_rng(3)
+    symbols = list(rng.choice(["AAPL", "MSFT", "XOM", "TSLA", "NVDA"], 2000))
+    manager.update_position("NVDA", 0, 400.0, sector="tech")
+    quantities = rng.integers(-120, 120, 2000).astype(float)
+    prices = rng.uniform(50, 400, 2000)
+    batch = manager.check_risk_limits_batch(symbols, quantities, prices)
+    single = [manager.check_risk_limits(s, q, p) for s, q, p in zip(symbols, quantities, prices)]
+    assert batch.tolist() == single
+    assert 0 < batch.sum() < len(batch)
+    assert manager.check_risk_limits("MSFT", 10, 300.0) is False
+    assert manager.check_risk_limits("TSLA", 10, 300.0) is True
+
+def test_risk_reducing_orders_pass_at_the_exposure_cap():
+    """Test sells that shrink a position are allowed when gross exposure sits at its cap."""
+    manager = RiskManager()
+    for symbol in "ABCDEFGH":
+        manager.update_position(symbol, 100, 100.0, sector=symbol)
+    assert manager.gross_exposure == manager.portfolio_value * manager.max_gross_exposure
+    assert manager.check_risk_limits("A", -10, 100.0) is True
+    assert manager.check_risk_limits("A", 10, 100.0) is False
+    assert manager.check_risk_limits("Z", -10, 100.0) is False
+    assert manager.check_risk_limits_batch(["A", "A", "Z"], [-10, 10, -10], [100.0] * 3).tolist() == [
+        True, False, False]
+
+def test_var_engine_incremental_covariance():
+    """Test rolling Cholesky updates track the sample covariance of the window."""
+    rng = np.random.default_rng(5)
+    returns = rng.normal(0.0005, 0.01, (120, 4)) @ rng.normal(size=(4, 4))
+    engine = VaREngine(["A", "B", "C", "D"], window=40)
+    engine.fit(returns[:40])
+    for bar in returns[40:]:
+        engine.add_bar(bar)
+    expected = np.cov(returns[-40:], rowvar=False)
+    assert np.allclose(engine.covariance, expected, rtol=1e-8, atol=1e-12)
+    assert np.allclose(engine.mean, returns[-40:].mean(axis=0))
+
+def test_monte_carlo_var_matches_normal_quantile():
+    """Test Monte Carlo VaR/CVaR against the closed form and the portfolio check."""
+    rng = np.random.default_rng(6)
+    engine = VaREngine(["A", "B"], window=500, seed=7)
+    engine.fit(rng.multivariate_normal([0, 0], [[1e-4, 5e-5], [5e-5, 4e-4]], 500))
+    exposures = engine.exposures({"A": 50000.0, "B": -20000.0})
+    sigma = np.sqrt(exposures @ engine.covariance @ exposures)
+    result = engine.monte_carlo(exposures, simulations=200000)
+    expected = 2.326348 * sigma - engine.mean @ exposures
+    assert abs(result["var"] - expected) / expected < 0.03
+    assert result["cvar"] > result["var"]
+    assert engine.historical(exposures)["var"] > 0
+
+    manager = RiskManager(var_engine=engine)
+    manager.update_position("A", 500, 100.0)
+    manager.update_position("B", -200, 100.0)
+    assert manager.portfolio_var(simulations=20000)["var"] > 0
+    assert manager.check_portfolio_risk() is True
+    manager.max_portfolio_risk = 0.001
+    assert manager.check_portfolio_risk() is False
+    with pytest.raises(ValueError):
+        RiskManager().portfolio_var()
+
+def test_mark_to_market_streams_pnl_and_greeks():
+    """Test ticks re-mark positions incrementally to the same totals as a full revaluation."""
+    from agents.options.pricing import black_scholes
+    mtm = MarkToMarket(cash=100000.0, rate=0.0)
+    manager = RiskManager(mark_to_market=mtm)
+    manager.on_fill("AAPL", 100, 150.0)
+    manager.on_fill("MSFT", -20, 300.0)
+    mtm.add_option("AAPL-C160", "AAPL", 2, 160.0, time.time() + 0.25 * 365 * 24 * 3600, 0.3, True, price=4.0)
+    for price in (151.0, 149.5, 155.0):
+        mtm.on_tick("AAPL", price)
+    manager.on_tick("MSFT", 290.0)
+    manager.on_fill("AAPL", -40, 155.0)
+    mtm.on_tick("NVDA", 500.0)
+
+    call = black_scholes(155.0, 160.0, 0.25, 0.0, 0.3)
+    assert mtm.market_value == pytest.approx(60 * 155.0 + 200 * call["price"] - 20 * 290.0)
+    assert mtm.realized_pnl == pytest.approx(40 * 5.0)
+    assert mtm.unrealized_pnl == pytest.approx(60 * 5.0 + 200 * (call["price"] - 4.0) + 20 * 10.0)
+    assert mtm.dollar_delta == pytest.approx((60 + 200 * call["delta"]) * 155.0 - 20 * 290.0)
+    assert mtm.vega == pytest.approx(200 * call["vega"])
+    assert manager.portfolio_value == pytest.approx(100000.0 + 500.0 + 200.0 + 200 * call["price"] - 800.0)
+    assert manager.positions["MSFT"]["value"] == -5800.0
+    assert manager.gross_exposure == pytest.approx(60 * 155.0 + 5800.0)
+
+def test_on_fill_without_mark_to_market():
+    """Test fills update positions directly when no mark-to-market book is attached."""
+    manager = RiskManager()
+    manager.on_fill("AAPL", 100, 150.0)
+    manager.on_fill("AAPL", -40, 155.0)
+    assert manager.positions["AAPL"] == {"quantity": 60, "price": 155.0, "value": 60 * 155.0}
+    assert manager.gross_exposure == pytest.approx(60 * 155.0)
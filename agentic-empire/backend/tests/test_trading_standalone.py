@@ -6,7 +6,8 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from data.market_data import market_data
+import numpy as np
+from data.market_data import MarketDataStore
 from execution.order_manager import order_manager, OrderType
 from risk.risk_manager import risk_manager
 from compliance.compliance_officer import compliance_officer
@@ -15,19 +16,50 @@ from backtesting.backtest_engine import backtest_engine
 from brokers.universal_adapter import create_broker_adapter
 
 # Market Data Tests
+@pytest.fixture
+def market_data(tmp_path):
+    """Bar store holding 10,000 minute bars of AAPL."""
+    store = MarketDataStore(str(tmp_path))
+    close = 100.0 + np.arange(10000) * 0.01
+    store.write_bars("AAPL", {"timestamp": np.datetime64("2024-01-02T14:30") + np.arange(10000),
+                              "close": close, "volume": np.full(10000, 1000.0)}, timeframe="1m")
+    return store
+
 @pytest.mark.asyncio
-async def test_market_data_get_price():
+async def test_market_data_get_price(market_data):
     """Test real-time price fetching."""
     price = await market_data.get_price("AAPL")
     assert isinstance(price, float)
     assert price > 0
 
 @pytest.mark.asyncio
-async def test_market_data_historical():
+async def test_market_data_historical(market_data):
     """Test historical data retrieval."""
-    data = await market_data.get_historical("AAPL")
-    assert isinstance(data, list)
-    assert len(data) > 0
+    data = await market_data.get_historical("AAPL", timeframe="1m")
+    assert isinstance(data["close"], np.memmap)
+    assert len(data["close"]) > 0
+
+@pytest.mark.asyncio
+async def test_market_data_range_query(market_data):
+    """Test time-indexed range queries return the requested bars only."""
+    data = await market_data.get_historical("AAPL", "2024-01-03T14:30", "2024-01-03T15:30", timeframe="1m")
+    assert len(data["close"]) == 60
+    assert data["timestamp"][0] == np.datetime64("2024-01-03T14:30")
+
+def test_market_data_rejects_out_of_order_append(market_data):
+    """Test appends must extend the stored time range."""
+    with pytest.raises(ValueError):
+        market_data.write_bars("AAPL", {"timestamp": [np.datetime64("2024-01-02T14:30")],
+                                        "close": [1.0]}, timeframe="1m")
+
+def test_market_data_realigns_columns_after_torn_append(market_data, tmp_path):
+    """Test a half-written column from a failed append is dropped before the next one."""
+    with open(tmp_path / "AAPL" / "1m" / "close.bin", "ab") as f:
+        f.write(np.array([999.0, 999.0]).tobytes())
+    market_data.write_bars("AAPL", {"timestamp": [np.datetime64("2024-01-10T00:00")], "close": [42.0]},
+                           timeframe="1m")
+    data = market_data.bars("AAPL", "2024-01-10", timeframe="1m")
+    assert data["close"].tolist() == [42.0] and len(market_data.bars("AAPL", timeframe="1m")["close"]) == 10001
 
 # Order Manager Tests
 @pytest.mark.asyncio
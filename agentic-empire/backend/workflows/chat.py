@@ -1,5 +1,5 @@
 from core.llm_tier import tiered_generate
 
 async def chat_workflow(prompt: str, dept: str):
-    result = await tiered_generate(f"{dept}: {prompt}")
+    result = await tiered_generate(f"{dept}: {prompt}", caller="chat")  # Interactive, never cached
     return result
\ No newline at end of file